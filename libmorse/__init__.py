@@ -1,28 +1,64 @@
 """Main package classes, functions and utilities."""
 
 
+from .audio import (
+    ToneDetector,
+    ToneRenderer,
+    is_audio,
+    wave_to_signed,
+    write_wave,
+)
 from .converter import (
     MEDIUM_GAP,
     AlphabetConverter,
     MorseConverter,
 )
 from .exceptions import (
+    ConverterMorseError,
     MorseError,
     ProcessMorseError,
+    ServerMorseError,
     TranslatorMorseError,
 )
+from .pipeline import (
+    AlphabetStage,
+    MorseStage,
+    Pipeline,
+    iter_handoff,
+)
+from .recording import (
+    EXTENSION as RECORDING_EXTENSION,
+    RecordingReader,
+    RecordingWriter,
+    is_recording,
+    mor_to_recording,
+    recording_to_mor,
+)
+from .runlength import RunLengthEncoder, from_samples
 from .settings import PROJECT, UNIT
+from .stats import REGISTRY as STATS_REGISTRY, Registry, Stats
 from .translator import (
     AlphabetTranslator,
     MorseTranslator,
+    Stamp,
+    get_ending,
     get_translator_results,
+    put_ending,
+    stream_morse,
     translate_morse,
+    translate_signed,
 )
 from .utils import (
+    from_signed,
     get_logger,
+    get_mor_arrays,
     get_mor_code,
     get_return_code,
     humanize_mor_code,
+    iter_mor_arrays,
+    iter_mor_code,
+    parse_mor_code,
+    to_signed,
 )
 
 
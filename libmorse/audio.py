@@ -0,0 +1,364 @@
+"""Audio front-end turning keyed tones (CW) into timed signals and back.
+
+PCM samples are processed in chunks: a tone envelope is computed over short
+windows (single frequency Goertzel-like correlation or broadband RMS),
+thresholded with hysteresis and turned into run-lengths, as signed durations
+in milliseconds (positive for signals and negative for silences).
+
+The other way around, signed durations are rendered as keyed tones with
+raised-cosine edges.
+"""
+
+
+import wave
+
+try:
+    from math import gcd
+except ImportError:    # Python 2
+    from fractions import gcd
+
+import six
+
+from libmorse import exceptions, runlength, settings, utils
+
+
+np = utils.LazyModule("numpy")
+
+
+# Usual audio file extension.
+EXTENSION = ".wav"
+# How many frames are read at once out of audio files.
+WAVE_CHUNK = 65536
+# How many signed durations are rendered at once.
+RENDER_CHUNK = 4096
+# Percentile of the levels in a chunk estimating the noise floor (keyed tones
+# always leave some silence between them).
+FLOOR_PERCENTILE = 20
+# Most envelope levels held back while waiting for the noise floor (a minute
+# of the default windows), decided without any floor beyond that.
+MAX_HELD = 12000
+# Samples type for every sample width in bytes (8 bits ones are unsigned).
+SAMPLE_TYPES = {1: "u1", 2: "<i2", 4: "<i4"}
+
+
+def is_audio(name):
+    """Returns True if the file `name` looks like an audio file."""
+    return bool(name) and name.lower().endswith(EXTENSION)
+
+
+def from_buffer(data, sample_width=2, channels=1):
+    """Convert raw PCM `data` into normalized (-1..1) mono samples."""
+    dtype = SAMPLE_TYPES.get(sample_width)
+    if not dtype:
+        raise exceptions.ProcessMorseError(
+            "unsupported sample width {}".format(sample_width))
+    samples = np.frombuffer(data, dtype=dtype).astype(np.float32)
+    if sample_width == 1:
+        samples -= 128
+    samples /= 2 ** (8 * sample_width - 1)
+    if channels > 1:
+        samples = samples[:samples.size // channels * channels]
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def to_buffer(samples, sample_width=2):
+    """Convert normalized (-1..1) samples into raw PCM data."""
+    dtype = SAMPLE_TYPES.get(sample_width)
+    if not dtype:
+        raise exceptions.ProcessMorseError(
+            "unsupported sample width {}".format(sample_width))
+    scale = 2 ** (8 * sample_width - 1)
+    samples = np.clip(np.asarray(samples) * scale, -scale, scale - 1)
+    if sample_width == 1:
+        samples += 128
+    return np.round(samples).astype(dtype).tobytes()
+
+
+def iter_wave(path, chunk=WAVE_CHUNK):
+    """Yield the sample rate followed by chunks of normalized mono samples
+    out of the WAV file found at `path`.
+    """
+    stream = wave.open(path, "rb")
+    try:
+        yield stream.getframerate()
+        width, channels = stream.getsampwidth(), stream.getnchannels()
+        while True:
+            data = stream.readframes(chunk)
+            if not data:
+                break
+            yield from_buffer(data, sample_width=width, channels=channels)
+    finally:
+        stream.close()
+
+
+class ToneDetector(object):
+
+    """Detect a keyed tone in chunks of samples and return run-lengths.
+
+    Samples left out of a complete window, the still open run and the
+    levels waiting for the noise floor (until a first silence) are carried
+    over to the next chunk, so the chunk boundaries don't matter.
+    """
+
+    def __init__(self, sample_rate, frequency=settings.TONE_FREQUENCY,
+                 window=settings.TONE_WINDOW,
+                 thresholds=settings.TONE_THRESHOLDS,
+                 min_level=settings.TONE_MIN_LEVEL, snr=settings.TONE_SNR):
+        """Create a new detector.
+
+        :param int sample_rate: samples per second
+        :param float frequency: tone frequency in Hz (None for a broadband
+            RMS envelope)
+        :param float window: envelope window length in milliseconds
+        :param tuple thresholds: levels of turning on and off the signal,
+            as fractions of the peak level
+        :param float min_level: minimum envelope level considered a tone
+        :param float snr: how many times a tone is above the noise floor
+        """
+        self.sample_rate = sample_rate
+        self.frequency = frequency
+        self.size = max(int(round(sample_rate * window / 1000.0)), 1)
+        # Real window length, as a whole number of samples.
+        self.window = self.size * 1000.0 / sample_rate
+        self.high, self.low = thresholds
+        self.min_level = min_level
+        self.snr = snr
+
+        self._kernel = None
+        if frequency:
+            # Windowed complex correlation at the tone frequency, scaled so
+            # a full scale tone has the level 1.
+            taper = np.hanning(self.size)
+            phase = 2 * np.pi * frequency / sample_rate * np.arange(self.size)
+            self._kernel = (taper * np.exp(-1j * phase) * 2 / taper.sum())
+
+        self._peak = 0.0
+        self._floor = None    # noise floor, the lowest one of all chunks
+        self._rest = np.empty(0, dtype=np.float32)    # incomplete window
+        self._held = np.empty(0)    # levels waiting for the noise floor
+        # Every window decides one state.
+        self._encoder = runlength.RunLengthEncoder(1000.0 / self.window)
+
+    def envelope(self, samples):
+        """Returns the tone level of every complete window in `samples`."""
+        blocks = samples.reshape(-1, self.size)
+        if self._kernel is None:
+            # RMS of a full scale sine is 1/sqrt(2).
+            return np.sqrt(2 * np.mean(np.square(blocks), axis=1))
+        return np.abs(blocks.dot(self._kernel))
+
+    def _update_floor(self, levels):
+        # Returns the levels ready to be decided. The noise floor is known
+        # only once a silence shows up among the levels: tone alone (like the
+        # beginning of a transmission starting with a signal) would be taken
+        # for noise, so the levels are held back until then (up to
+        # `MAX_HELD`). Below the minimum level (like a digital silence)
+        # nothing is a tone, so nothing is held.
+        self._peak = max(self._peak, float(levels.max()))
+        if self._floor is None:
+            levels = np.concatenate((self._held, levels))
+        floor = float(np.percentile(levels, FLOOR_PERCENTILE))
+        self._held = np.empty(0)
+        if (self._floor is None and self._peak >= self.min_level and
+                floor >= self.low * self._peak):
+            if levels.size <= MAX_HELD:
+                self._held = levels
+                return levels[:0]
+            return levels
+        if self._floor is None or floor < self._floor:
+            self._floor = floor
+        return levels
+
+    def _get_states(self, levels, floor):
+        # Hysteresis: above the high threshold turns on, below the low one
+        # turns off, while anything in between keeps the previous state.
+        # Until a strong enough tone shows up, the noise never turns on.
+        high = max(self.high * self._peak, self.snr * floor, self.min_level)
+        low = max(self.low * self._peak, self.min_level)
+        marks = np.full(levels.size, -1, dtype=np.int8)
+        marks[levels >= high] = 1
+        marks[levels < low] = 0
+        decided = np.where(marks >= 0, np.arange(levels.size), -1)
+        decided = np.maximum.accumulate(decided)
+        states = marks[np.maximum(decided, 0)].astype(bool)
+        states[decided < 0] = self._encoder.state
+        return states
+
+    def feed(self, samples):
+        """Process a new chunk of normalized `samples` and return the
+        completed runs as signed durations in milliseconds.
+        """
+        samples = np.concatenate((self._rest, samples))
+        usable = samples.size // self.size * self.size
+        self._rest = samples[usable:]
+        if not usable:
+            return np.empty(0)
+
+        levels = self._update_floor(self.envelope(samples[:usable]))
+        if not levels.size:
+            return np.empty(0)
+        return self._encoder.feed(self._get_states(levels,
+                                                   self._floor or 0.0))
+
+    def flush(self):
+        """Return the open run (if any) as signed durations and reset."""
+        self._rest = np.empty(0, dtype=np.float32)
+        values = np.empty(0)
+        if self._held.size:
+            # No silence ever showed up, so there's no noise floor to judge
+            # the held levels by.
+            values = self._encoder.feed(self._get_states(self._held, 0.0))
+            self._held = np.empty(0)
+        return np.concatenate((values, self._encoder.flush()))
+
+
+def iter_signed(chunks, sample_rate, **kwargs):
+    """Yield arrays of signed durations out of the `chunks` of samples.
+
+    Any other keyword argument is passed to the `ToneDetector`.
+    """
+    detector = ToneDetector(sample_rate, **kwargs)
+    for samples in chunks:
+        values = detector.feed(samples)
+        if values.size:
+            yield values
+    values = detector.flush()
+    if values.size:
+        yield values
+
+
+def wave_to_signed(path, **kwargs):
+    """Returns the signed durations of the tones found in the WAV file
+    `path`.
+    """
+    chunks = iter_wave(path)
+    sample_rate = next(chunks)
+    arrays = list(iter_signed(chunks, sample_rate, **kwargs))
+    return np.concatenate(arrays) if arrays else np.empty(0)
+
+
+def put_wave(translator, path, **kwargs):
+    """Feed `translator` with the tones of the WAV file `path`, chunk by
+    chunk, and return the count of signed durations put.
+    """
+    chunks = iter_wave(path)
+    sample_rate = next(chunks)
+    count = 0
+    for values in iter_signed(chunks, sample_rate, **kwargs):
+        translator.put_signed(values)
+        count += values.size
+    return count
+
+
+class ToneRenderer(object):
+
+    """Render signed durations as a keyed tone, chunk after chunk.
+
+    Every signal starts and ends with a raised-cosine ramp, avoiding the
+    clicks of an abrupt keying. The tone phase and the rounding of the
+    durations into samples continue over the chunks.
+
+    When the tone repeats itself after a whole number of samples (integer
+    frequency and sample rate), one period is computed once and tiled,
+    instead of evaluating the sine for every sample.
+    """
+
+    def __init__(self, sample_rate=settings.SAMPLE_RATE,
+                 frequency=settings.TONE_FREQUENCY,
+                 amplitude=settings.TONE_AMPLITUDE, ramp=settings.TONE_RAMP):
+        """Create a new renderer.
+
+        :param int sample_rate: samples per second
+        :param float frequency: tone frequency in Hz
+        :param float amplitude: tone amplitude (full scale is 1)
+        :param float ramp: length in milliseconds of the keying edges
+        """
+        self.sample_rate = sample_rate
+        self.frequency = frequency
+        self.amplitude = amplitude
+        self.ramp = int(round(ramp * sample_rate / 1000.0))
+        self._time = 0.0    # milliseconds rendered so far
+        self._offset = 0    # samples rendered so far
+
+        self._step = 2 * np.pi * frequency / sample_rate    # phase per sample
+        self._period = None
+        if float(frequency).is_integer() and float(sample_rate).is_integer():
+            self._period = int(sample_rate) // gcd(int(sample_rate),
+                                                   int(frequency))
+            self._table = self._get_tone(0, self._period)
+
+    def _get_tone(self, start, end):
+        # Tone phase follows the absolute sample index.
+        if self._period is None or end - start <= self._period:
+            phase = np.arange(start, end) * self._step
+            return (self.amplitude * np.sin(phase)).astype(np.float32)
+        table = np.roll(self._table, -(start % self._period))
+        return np.resize(table, end - start)
+
+    def _get_ramps(self, lengths):
+        # Returns the sizes of the ramps (no longer than half of their
+        # signal) along with the offsets and values of all their samples.
+        sizes = np.minimum(self.ramp, lengths // 2)
+        offsets = np.arange(sizes.sum())
+        bounds = np.repeat(np.cumsum(sizes) - sizes, sizes)
+        offsets -= bounds
+        totals = np.repeat(sizes, sizes)
+        values = 0.5 - 0.5 * np.cos(np.pi * (offsets + 0.5) / totals)
+        return sizes, offsets, values
+
+    def render(self, values):
+        """Returns the samples of the next signed durations `values`."""
+        values = np.asarray(values, dtype=float)
+        # Sample positions of the edges, rounded out of the total time, so
+        # the rounding errors don't add up.
+        times = self._time + np.cumsum(np.abs(values))
+        edges = np.round(times * self.sample_rate / 1000.0).astype(int)
+        edges = np.concatenate(([self._offset], edges))
+        lengths = np.diff(edges)
+        signals = values > 0
+
+        envelope = np.repeat(signals.astype(np.float32), lengths)
+        sizes, offsets, ramps = self._get_ramps(lengths[signals])
+        if ramps.size:
+            # Every signal rises along its ramp and falls along the same one
+            # reversed.
+            starts = np.repeat(edges[:-1][signals] - self._offset, sizes)
+            ends = np.repeat(edges[1:][signals] - self._offset, sizes)
+            envelope[starts + offsets] = ramps
+            envelope[ends - 1 - offsets] = ramps
+
+        envelope *= self._get_tone(edges[0], edges[-1])
+        if values.size:
+            self._time = times[-1]
+            self._offset = edges[-1]
+        return envelope
+
+    def iter_render(self, values, chunk=RENDER_CHUNK):
+        """Yield the samples of `values`, rendering `chunk` of them at
+        once.
+        """
+        for start in six.moves.range(0, len(values), chunk):
+            yield self.render(values[start:start + chunk])
+
+
+def write_wave(values, target, sample_width=2, **kwargs):
+    """Render the signed durations `values` as a keyed tone into the WAV
+    `target` (file path or stream) and return the count of frames written.
+
+    Any other keyword argument is passed to the `ToneRenderer`.
+    """
+    values = np.asarray(values, dtype=float)
+    renderer = ToneRenderer(**kwargs)
+    stream = wave.open(target, "wb")
+    try:
+        stream.setnchannels(1)
+        stream.setsampwidth(sample_width)
+        stream.setframerate(renderer.sample_rate)
+        frames = 0
+        for samples in renderer.iter_render(values):
+            stream.writeframes(to_buffer(samples, sample_width=sample_width))
+            frames += samples.size
+    finally:
+        stream.close()
+    return frames
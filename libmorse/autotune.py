@@ -0,0 +1,227 @@
+"""Search the translator parameters for the best speed/accuracy trade-off.
+
+Every candidate set of parameters decodes a labelled corpus, measuring the
+throughput (items per second), the time-to-first-character (keying time in
+milliseconds until the first character comes out) and the character error
+rate. The candidates not beaten on all of them at once by any other make the
+Pareto front, saved as a reusable profile.
+"""
+
+
+import collections
+import itertools
+import json
+import multiprocessing
+import platform
+
+import six
+
+from libmorse import exceptions, translator, utils
+from libmorse.bench import core
+
+
+np = utils.LazyModule("numpy")
+
+
+# Version of the saved profiles format.
+PROFILE_VERSION = 1
+# Candidate values of the searched parameters (the defaults among them).
+SPACE = collections.OrderedDict([
+    ("sig_range", [(5, 24), (7, 36), (9, 48)]),
+    ("sil_range", [(8, 40), (12, 64), (16, 96)]),
+    ("mean_min_diff", [0.9, 1.1, 1.3]),
+    ("mean_max_diff", [9.9, 11.9, 13.9]),
+    ("noise_ratio", [0.05, 0.1, 0.2]),
+    ("cluster_iter", [3, 10]),
+])
+# Metrics optimized along with their direction (1 for bigger is better).
+OBJECTIVES = (
+    ("items_per_sec", 1),
+    ("first_char_ms", -1),
+    ("cer", -1),
+)
+# Seconds after which a stuck decoding is given up.
+TIMEOUT = 60.0
+# How many signed durations are decoded between the checks of the timeout.
+DECODE_CHUNK = 256
+
+
+def edit_distance(text, label):
+    """Returns the Levenshtein distance between `text` and `label`.
+
+    The distances table is computed row after row, each one vectorized.
+    """
+    target = np.array([ord(char) for char in label], dtype=int)
+    steps = np.arange(target.size + 1)
+    row = steps
+    for char in text:
+        # Substitutions (or matches) and deletions.
+        best = np.minimum(row[:-1] + (target != ord(char)), row[1:] + 1)
+        row = np.concatenate(([row[0] + 1], best))
+        # Insertions chain along the row: d[j] = min(d[j], d[j - 1] + 1).
+        row = np.minimum.accumulate(row - steps) + steps
+    return int(row[-1])
+
+
+def get_corpus(scale=1, seed=0):
+    """Returns the labelled corpus: the MOR code resources (labelled by
+    their headers) along with `scale` * 10 synthetic words.
+    """
+    corpus = core.get_corpus()
+    if scale:
+        corpus.extend(core.get_synthetic(scale=scale, seed=seed))
+    return corpus
+
+
+def get_candidates(space=SPACE, samples=32, seed=0):
+    """Returns up to `samples` distinct parameter sets randomly picked out of
+    the `space` grid, the defaults first.
+    """
+    keys = list(space)
+    defaults = tuple(translator.PARAMS[key] for key in keys)
+    grid = [combi for combi in itertools.product(*space.values())
+            if combi != defaults]
+    order = np.random.RandomState(seed).permutation(len(grid))
+    picks = [defaults] + [grid[index] for index in order[:samples - 1]]
+    return [collections.OrderedDict(zip(keys, combi)) for combi in picks]
+
+
+def _decode(params, values, timeout):
+    # Returns the decoding time and the stamped results (None if stuck). The
+    # translator is unthreaded, so a stuck one leaves no worker behind
+    # skewing the timings of the next candidates.
+    trans = translator.MorseTranslator(use_logging=False, threaded=False,
+                                       provenance=True, **params)
+    start = utils.timer()
+    stamps = []
+    try:
+        for index in six.moves.range(0, values.size, DECODE_CHUNK):
+            stamps.extend(trans.process_signed(
+                values[index:index + DECODE_CHUNK]))
+            if utils.timer() - start > timeout:
+                return utils.timer() - start, None
+        stamps.extend(trans.process(translator.get_ending(trans)))
+        return utils.timer() - start, stamps
+    finally:
+        trans.close()
+
+
+def evaluate(params, corpus, timeout=TIMEOUT):
+    """Decode every labelled entry of the `corpus` with the translator
+    `params` and return the measured metrics.
+    """
+    items = distance = chars = failed = 0
+    seconds = 0.0
+    first_chars = []
+    for entry in corpus:
+        values = entry["values"]
+        elapsed, stamps = _decode(params, values, timeout)
+        seconds += elapsed
+        items += values.size
+        text = ""
+        if stamps is None:
+            failed += 1
+        else:
+            text = "".join(stamp.result for stamp in stamps)
+        label = entry["text"]
+        distance += edit_distance(text.strip(), label)
+        chars += len(label)
+        # Keying time until the first character, all of it if none.
+        last = stamps[0].last if stamps else values.size - 1
+        first_chars.append(float(np.abs(values[:last + 1]).sum()))
+
+    return {
+        "params": params,
+        "items_per_sec": items / seconds if seconds else 0.0,
+        "first_char_ms": float(np.mean(first_chars)),
+        "cer": distance / float(max(chars, 1)),
+        "failed": failed,
+    }
+
+
+def pareto_front(results):
+    """Returns the `results` not dominated by any other one, the most
+    accurate first.
+    """
+    if not results:
+        return []
+    scores = np.array([[sign * result[key] for key, sign in OBJECTIVES]
+                       for result in results])
+    # dominates[i, j]: i is at least as good as j everywhere and better
+    # somewhere.
+    not_worse = (scores[:, None, :] >= scores[None, :, :]).all(axis=2)
+    better = (scores[:, None, :] > scores[None, :, :]).any(axis=2)
+    dominated = (not_worse & better).any(axis=0)
+    front = [result for result, flag in zip(results, dominated) if not flag]
+    return sorted(front, key=lambda result: (
+        result["cer"], result["first_char_ms"], -result["items_per_sec"]))
+
+
+# Evaluation context of the pool workers.
+_worker = {}
+
+
+def _init_worker(corpus, timeout):
+    _worker.update(corpus=corpus, timeout=timeout)
+
+
+def _evaluate_worker(params):
+    return evaluate(params, _worker["corpus"], timeout=_worker["timeout"])
+
+
+def autotune(corpus=None, samples=32, processes=None, seed=0, scale=1,
+             space=SPACE, timeout=TIMEOUT):
+    """Search the translator parameters and return the tuning profile,
+    with the Pareto front of the evaluated candidates.
+
+    :param list corpus: labelled entries (the default corpus if None)
+    :param int samples: how many parameter sets to evaluate
+    :param int processes: pool size (CPU count if None, 1 for no pool)
+    :param int seed: random seed picking the candidates
+    :param int scale: synthetic words (x10) added to the default corpus
+    :param dict space: candidate values of every searched parameter
+    :param float timeout: seconds after which a decoding is given up
+    """
+    corpus = corpus or get_corpus(scale=scale, seed=seed)
+    candidates = get_candidates(space=space, samples=samples, seed=seed)
+    if processes == 1:
+        results = [evaluate(params, corpus, timeout=timeout)
+                   for params in candidates]
+    else:
+        pool = multiprocessing.Pool(processes, initializer=_init_worker,
+                                    initargs=(corpus, timeout))
+        try:
+            results = pool.map(_evaluate_worker, candidates)
+        finally:
+            pool.close()
+            pool.join()
+
+    front = pareto_front(results)
+    return {
+        "version": PROFILE_VERSION,
+        "python": platform.python_version(),
+        "corpus": [entry["name"] for entry in corpus],
+        "candidates": len(results),
+        "params": front[0]["params"],
+        "front": front,
+    }
+
+
+def save_profile(profile, stream):
+    """Write the tuning `profile` as JSON into `stream`."""
+    json.dump(profile, stream, indent=2, sort_keys=True)
+    stream.write("\n")
+
+
+def load_params(stream, index=None):
+    """Returns the translator parameters of the profile read from `stream`:
+    the selected ones, or the `index`-th of the Pareto front.
+    """
+    profile = json.load(stream)
+    if profile.get("version") != PROFILE_VERSION:
+        raise exceptions.ProcessMorseError(
+            "unsupported profile version {!r}".format(profile.get("version")))
+    params = (profile["params"] if index is None
+              else profile["front"][index]["params"])
+    # JSON keys are unicode, while they're used as keyword arguments.
+    return {str(key): value for key, value in params.items()}
@@ -0,0 +1,58 @@
+"""Performance measurements of the various processing stages."""
+
+
+import platform
+
+from libmorse import exceptions
+from libmorse.bench import core
+from libmorse.bench.concurrency import MODES, run_scaling
+from libmorse.bench.regression import (
+    THRESHOLDS,
+    compare_baselines,
+    load_baseline,
+    run_baseline,
+    save_baseline,
+)
+from libmorse.bench.stages import STAGES
+
+
+def get_inputs(scale=10):
+    """Returns the named benchmark inputs: the resources corpus and the
+    synthetic one scaled by `scale`.
+    """
+    return [
+        ("corpus", core.get_corpus()),
+        ("synthetic", core.get_synthetic(scale=scale)),
+    ]
+
+
+def run_benchmarks(stages=None, scale=10, isolate=True):
+    """Run the stages benchmarks and return the machine-readable results.
+
+    :param list stages: names of the stages to run (all by default)
+    :param int scale: how many times the corpus is used for synthetic input
+    :param bool isolate: run each benchmark in its own process, in order
+        to measure its peak memory too
+    """
+    stages = stages or list(STAGES)
+    for stage in stages:
+        if stage not in STAGES:
+            raise exceptions.ProcessMorseError(
+                "unknown benchmark stage {!r}".format(stage))
+    results = []
+    for input_name, inputs in get_inputs(scale=scale):
+        for stage in stages:
+            func = STAGES[stage]
+            if isolate:
+                stats = core.run_isolated(func, inputs)
+            else:
+                stats = func(inputs)
+            stats.update(stage=stage, input=input_name)
+            results.append(stats)
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scale": scale,
+        "results": results,
+    }
@@ -0,0 +1,692 @@
+"""Comparisons between alternative implementations of the same stage."""
+
+
+import array
+import itertools
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+
+import six
+
+from libmorse import converter, exceptions, settings, translator, utils
+from libmorse.bench.core import measure
+
+
+np = utils.LazyModule("numpy")
+
+
+def get_morse_message(text="MORSE CODE", times=1000):
+    """Build a long morse code message out of the repeated `text`."""
+    alpha_conv = converter.AlphabetConverter()
+    symbols = alpha_conv.add(list(" ".join([text] * times)))
+    return "".join(symbols)
+
+
+def bench_decode_text(times=1000, repeat=3):
+    """Compare the whole-message decoder against the streaming one."""
+    message = get_morse_message(times=times)
+    morse_conv = converter.MorseConverter()
+
+    def add():
+        symbols = []
+        for word in message.split(converter.MEDIUM_GAP):
+            symbols.extend(list(word) + [converter.MEDIUM_GAP])
+        morse_conv.add(symbols)
+
+    def decode_text():
+        morse_conv.decode_text(message)
+
+    add_time, decode_time = [measure(func, repeat=repeat)
+                             for func in (add, decode_text)]
+    return {
+        "symbols": len(message),
+        "add": add_time,
+        "decode_text": decode_time,
+        "speedup": add_time / decode_time,
+    }
+
+
+def get_mor_data(name="basic.mor", times=10000):
+    """Build a large MOR code text out of the repeated resource `name`."""
+    return utils.get_resource(name) * times
+
+
+def bench_parse_mor(times=10000, repeat=3):
+    """Measure the MOR code parsing throughput in lines per second."""
+    data = get_mor_data(times=times)
+    lines = data.count("\n")
+    parse_time = measure(lambda: utils.parse_mor_code(data), repeat=repeat)
+    return {
+        "lines": lines,
+        "parse": parse_time,
+        "lines_per_sec": lines / parse_time,
+    }
+
+
+def get_items_size(items):
+    """Approximate the memory in bytes held by a list of items."""
+    size = sys.getsizeof(items)
+    for item in items:
+        size += sys.getsizeof(item)
+        if isinstance(item, tuple):
+            # Booleans are singletons, only the durations are new objects.
+            size += sys.getsizeof(item[1])
+    return size
+
+
+def bench_item_memory(count=1000000):
+    """Compare the memory per million buffered items of the different
+    representations of timed signals.
+    """
+    states, durations = utils.get_mor_arrays("basic.mor")
+    times = count // len(states) + 1
+    states = np.tile(states, times)[:count]
+    durations = np.tile(durations, times)[:count]
+    values = utils.to_signed(states, durations)
+
+    sizes = {
+        "tuples": get_items_size(
+            list(zip(states.tolist(), durations.tolist()))),
+        "floats": get_items_size(values.tolist()),
+        "array": sys.getsizeof(array.array("d", values.tolist())),
+        "numpy": values.nbytes,
+    }
+    million = 1000000.0 / count
+    return {name: size * million for name, size in sizes.items()}
+
+
+def bench_item_cpu(times=20, repeat=3):
+    """Compare the per item processing time of `MorseTranslator` when fed
+    with tuples versus signed durations.
+    """
+    states, durations = utils.get_mor_arrays("basic.mor")
+    states, durations = np.tile(states, times), np.tile(durations, times)
+    feeds = {
+        "tuples": list(zip(states.tolist(), durations.tolist())),
+        "signed": utils.to_signed(states, durations).tolist(),
+    }
+
+    stats = {"items": len(states)}
+    for name, items in feeds.items():
+        def process():
+            trans = translator.MorseTranslator(use_logging=False)
+            for item in items:
+                trans._process(item)
+            trans.close()
+
+        stats[name] = measure(process, repeat=repeat) / len(items)
+    return stats
+
+
+# Maximum accepted slowdown (percentage) due to the always-on statistics.
+STATS_MAX_OVERHEAD = 5.0
+
+
+class _NullStats(object):
+
+    """Statistics discarding everything, used as reference."""
+
+    def count(self, key, value=1):
+        pass
+
+    def maximum(self, key, value):
+        pass
+
+    def add_time(self, key, start):
+        pass
+
+    def retire(self):
+        pass
+
+
+def bench_stats_overhead(times=20, repeat=5):
+    """Measure the decoding slowdown of `MorseTranslator` caused by its
+    counters and timers, compared with a translator having them disabled.
+    """
+    states, durations = utils.get_mor_arrays("basic.mor")
+    values = utils.to_signed(np.tile(states, times),
+                             np.tile(durations, times)).tolist()
+
+    def get_process(enabled):
+        def process():
+            # Same k-means initialization for both the runs.
+            np.random.seed(0)
+            trans = translator.MorseTranslator(use_logging=False)
+            if not enabled:
+                trans._stats = trans._converter._stats = _NullStats()
+            for value in values:
+                trans._process_item(value)
+            trans.close()
+        return process
+
+    # Interleave the runs, so the machine load affects both equally.
+    timings = {False: [], True: []}
+    for _ in range(repeat):
+        for enabled in timings:
+            timings[enabled].append(measure(get_process(enabled), repeat=1))
+    disabled_time, enabled_time = min(timings[False]), min(timings[True])
+    overhead = (enabled_time / disabled_time - 1) * 100
+    return {
+        "items": len(values),
+        "disabled": disabled_time,
+        "enabled": enabled_time,
+        "overhead_percent": overhead,
+        "within_budget": overhead < STATS_MAX_OVERHEAD,
+    }
+
+
+def get_fd_count():
+    """Returns how many file descriptors the process has opened (or None
+    where not supported).
+    """
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def bench_sessions(count=100000, samples=10):
+    """Soak test creating and closing `count` translators one after the
+    other, sampling the opened file descriptors and the per session
+    latency.
+    """
+    every = max(count // samples, 1)
+    fds, latencies, session_times = [], [], []
+    for index in six.moves.range(count):
+        start = utils.timer()
+        trans = translator.MorseTranslator()
+        trans.close()
+        session_times.append(utils.timer() - start)
+        if (index + 1) % every == 0:
+            fds.append(get_fd_count())
+            latencies.append(sum(session_times) / len(session_times))
+            session_times = []
+    return {
+        "sessions": count,
+        "fds": fds,
+        "latencies": latencies,
+    }
+
+
+# Dependencies which shouldn't be loaded by just importing the package.
+HEAVY_MODULES = ("numpy", "scipy", "anytree")
+_IMPORT_CODE = """
+import json, sys
+from timeit import default_timer as timer
+start = timer()
+import {module}
+elapsed = timer() - start
+heavy = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps({{"time": elapsed, "heavy": heavy}}))
+"""
+
+
+def bench_import_time(module="libmorse", repeat=5):
+    """Measure the cold import time of `module` within fresh interpreters
+    and report the heavy dependencies it loads eagerly.
+    """
+    code = _IMPORT_CODE.format(module=module, heavy=HEAVY_MODULES)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [settings.PROJECT, env.get("PYTHONPATH")]))
+    times, heavy = [], []
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-c", code],
+                                         env=env)
+        report = json.loads(output.decode(settings.ENCODING))
+        times.append(report["time"])
+        heavy = report["heavy"]
+    return {
+        "module": module,
+        "import": min(times),
+        "heavy_modules": heavy,
+    }
+
+
+def bench_server(requests=100, spawns=5, name="basic.mor"):
+    """Compare decoding `name` (signals and morse code) through a warm
+    server against spawning the CLI for every request.
+    """
+    from libmorse import server
+    from libmorse.bench.core import get_stats
+
+    values = utils.to_signed(*utils.get_mor_arrays(name)).tolist()
+    morse = get_morse_message(times=1)
+    tmpdir = tempfile.mkdtemp()
+    address = (os.path.join(tmpdir, "bench.sock") if server.UnixServer
+               else "localhost:0")
+    daemon = server.create_server(address, use_logging=False)
+    if not server.UnixServer:
+        address = "{}:{}".format(*daemon.server_address)
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.setDaemon(True)
+    thread.start()
+
+    requests_kwargs = {
+        "server_signals": {"signals": values},
+        "server_morse": {"morse": morse},
+    }
+    stats = {}
+    try:
+        with server.Client(address) as client:
+            for kind, kwargs in requests_kwargs.items():
+                latencies = []
+                for _ in six.moves.range(requests):
+                    start = utils.timer()
+                    client.decode(**kwargs)
+                    latencies.append(utils.timer() - start)
+                stats[kind] = get_stats(requests, latencies)
+    finally:
+        daemon.shutdown()
+        daemon.server_close()
+        shutil.rmtree(tmpdir)
+
+    command = [sys.executable, os.path.join(settings.PROJECT, "bin",
+                                            "libmorse"),
+               "receive", os.path.join(settings.RESOURCE, name)]
+    with open(os.devnull, "w") as devnull:
+        spawn_latencies = []
+        for _ in six.moves.range(spawns):
+            start = utils.timer()
+            subprocess.check_call(command, stdout=devnull)
+            spawn_latencies.append(utils.timer() - start)
+
+    stats["spawn"] = get_stats(spawns, spawn_latencies)
+    return stats
+
+
+def _render_tone(values, sample_rate, frequency=600.0, noise=0.05, seed=0):
+    # Keyed sine tone with white noise, out of signed durations.
+    lengths = np.round(np.abs(values) * sample_rate / 1000.0).astype(int)
+    gate = np.repeat(values > 0, lengths)
+    times = np.arange(gate.size) / float(sample_rate)
+    samples = 0.5 * np.sin(2 * np.pi * frequency * times) * gate
+    samples += noise * np.random.RandomState(seed).randn(gate.size)
+    return samples.astype(np.float32)
+
+
+def bench_audio(rates=(8000, 16000, 44100, 48000), times=2, chunk=4096,
+                repeat=3):
+    """Measure how many times faster than real time the audio front-end
+    turns keyed tones into signed durations, for every sample rate.
+    """
+    from libmorse import audio
+
+    states, durations = utils.get_mor_arrays("basic.mor")
+    values = utils.to_signed(np.tile(states, times), np.tile(durations, times))
+    stats = {}
+    for rate in rates:
+        samples = _render_tone(values, rate)
+
+        def detect():
+            detector = audio.ToneDetector(rate)
+            for start in six.moves.range(0, samples.size, chunk):
+                detector.feed(samples[start:start + chunk])
+            detector.flush()
+
+        seconds = measure(detect, repeat=repeat)
+        stats[rate] = {
+            "samples": samples.size,
+            "seconds": seconds,
+            "samples_per_sec": samples.size / seconds,
+            "realtime_factor": samples.size / float(rate) / seconds,
+        }
+    return stats
+
+
+def _render_loop(values, sample_rate, frequency=600.0, ramp=40):
+    # Signal after signal rendering, used as reference.
+    chunks = []
+    offset = 0
+    edge = 0.5 - 0.5 * np.cos(np.pi * (np.arange(ramp) + 0.5) / ramp)
+    for value in values:
+        length = int(round(abs(value) * sample_rate / 1000.0))
+        if value > 0:
+            times = np.arange(offset, offset + length) / float(sample_rate)
+            samples = 0.5 * np.sin(2 * np.pi * frequency * times)
+            samples[:ramp] *= edge
+            samples[-ramp:] *= edge[::-1]
+        else:
+            samples = np.zeros(length)
+        chunks.append(samples.astype(np.float32))
+        offset += length
+    return np.concatenate(chunks)
+
+
+def bench_render(rates=(8000, 48000), times=20, repeat=3):
+    """Measure the keyed tone rendering throughput (samples per second) of
+    the vectorized renderer against rendering one signal at a time.
+    """
+    from libmorse import audio
+
+    states, durations = utils.get_mor_arrays("basic.mor")
+    values = utils.to_signed(np.tile(states, times), np.tile(durations, times))
+    stats = {}
+    for rate in rates:
+        size = audio.ToneRenderer(rate).render(values).size
+        funcs = {
+            "vectorized": lambda: list(
+                audio.ToneRenderer(rate).iter_render(values)),
+            "python": lambda: _render_loop(values, rate,
+                                           ramp=int(rate * 0.005)),
+        }
+        stats[rate] = {"samples": size}
+        for name, func in funcs.items():
+            stats[rate][name] = size / measure(func, repeat=repeat)
+    return stats
+
+
+def _encode_loop(bits, period):
+    # Plain per sample Python loop, used as reference.
+    values = []
+    state, count = False, 0
+    for bit in bits:
+        if bit == state:
+            count += 1
+            continue
+        if count:
+            values.append(period * count if state else -period * count)
+        state, count = bit, 1
+    if count:
+        values.append(period * count if state else -period * count)
+    return values
+
+
+def bench_samples(sample_rate=1000, times=20, chunk=65536, repeat=3):
+    """Measure the run-length encoding throughput (samples per second) of
+    sampled key-line states, as bool arrays and as packed bits, against a
+    plain Python loop.
+    """
+    from libmorse import runlength
+
+    states, durations = utils.get_mor_arrays("basic.mor")
+    lengths = np.round(np.tile(durations, times) * sample_rate / 1000.0)
+    bits = np.repeat(np.tile(states, times), lengths.astype(int))
+    packed = np.packbits(bits)
+
+    def encode(data, packed_data, step):
+        def run():
+            encoder = runlength.RunLengthEncoder(sample_rate,
+                                                 packed=packed_data)
+            for start in six.moves.range(0, data.size, step):
+                encoder.feed(data[start:start + step])
+            encoder.flush()
+        return run
+
+    bit_list = bits.tolist()
+    funcs = {
+        "bool": encode(bits, False, chunk),
+        "packed": encode(packed, True, chunk // 8),
+        "python": lambda: _encode_loop(bit_list, 1000.0 / sample_rate),
+    }
+    stats = {"samples": bits.size}
+    for name, func in funcs.items():
+        stats[name] = bits.size / measure(func, repeat=repeat)
+    return stats
+
+
+def _edges_loop(states, timestamps, wrap, scale):
+    # Per edge durations and (state, duration) items, used as reference.
+    items = []
+    last_state, last_time = states[0], timestamps[0]
+    for state, timestamp in zip(states, timestamps):
+        duration = (timestamp - last_time) % wrap
+        if duration:
+            items.append((last_state, duration * scale))
+        last_state, last_time = state, timestamp
+    return items
+
+
+def bench_edges(times=200, wrap=2 ** 32, repeat=3):
+    """Measure how many key-line edges per second (wrapping microseconds
+    timestamps) are turned into durations, in bulk by the translator
+    against one by one in Python.
+    """
+    states, durations = utils.get_mor_arrays("basic.mor")
+    states = np.tile(states, times)
+    starts = np.cumsum(np.tile(durations, times) * 1000).astype(np.int64)
+    timestamps = (starts % wrap).astype(np.uint32)
+
+    def bulk():
+        morse_translator = translator.MorseTranslator(
+            use_logging=False, clock_wrap=wrap, clock_scale=0.001)
+        morse_translator._get_runs(states, timestamps)
+        morse_translator.close()
+
+    state_list, timestamp_list = states.tolist(), timestamps.tolist()
+    funcs = {
+        "vectorized": bulk,
+        "python": lambda: _edges_loop(state_list, timestamp_list, wrap,
+                                      0.001),
+    }
+    stats = {"edges": states.size}
+    for name, func in funcs.items():
+        stats[name] = states.size / measure(func, repeat=repeat)
+    return stats
+
+
+def _queued_roundtrip(text):
+    # Threaded translators glued by polling their results, used as
+    # reference.
+    alpha_trans = translator.AlphabetTranslator(use_logging=False,
+                                                compact=True)
+    morse_trans = translator.MorseTranslator(use_logging=False)
+    for char in text:
+        alpha_trans.put(char)
+        alpha_trans.wait()
+        _, values = translator.get_translator_results(alpha_trans)
+        if values:
+            morse_trans.put_batch(values)
+    translator.put_ending(morse_trans)
+    _, results = translator.get_translator_results(morse_trans,
+                                                   force_wait=True)
+    alpha_trans.close()
+    morse_trans.close()
+    return "".join(results)
+
+
+def bench_pipeline(words=50, chunk=8, repeat=3):
+    """Measure the end-to-end throughput (characters per second) of a text
+    to signals and back round-trip, with queued translators against the
+    queue-free pipeline, fed at once or in chunks over a single handoff.
+    """
+    from libmorse import generator, pipeline
+
+    text = generator.random_text(words, seed=0)
+
+    def run_pipeline(handoff=False):
+        stages = (pipeline.AlphabetStage(use_logging=False),
+                  pipeline.MorseStage(use_logging=False))
+        with pipeline.Pipeline(*stages) as chain:
+            if not handoff:
+                return "".join(chain.translate(text))
+            batches = (text[start:start + chunk]
+                       for start in six.moves.range(0, len(text), chunk))
+            return "".join("".join(results) for results in
+                           pipeline.iter_handoff(chain, batches))
+
+    funcs = {
+        "queued": lambda: _queued_roundtrip(text),
+        "pipeline": run_pipeline,
+        "handoff": lambda: run_pipeline(handoff=True),
+    }
+    expected = funcs["queued"]()
+    stats = {"chars": len(text)}
+    for name, func in funcs.items():
+        if func() != expected:
+            raise exceptions.ProcessMorseError(
+                "{} round-trip differs".format(name))
+        stats[name] = len(text) / measure(func, repeat=repeat)
+
+    # The encoding hop alone, where the queues overhead isn't hidden by the
+    # decoding cost.
+    def encode_queued():
+        alpha_trans = translator.AlphabetTranslator(use_logging=False,
+                                                    compact=True)
+        for char in text:
+            alpha_trans.put(char)
+            alpha_trans.wait()
+            translator.get_translator_results(alpha_trans)
+        alpha_trans.close()
+
+    def encode_pipeline():
+        with pipeline.Pipeline(pipeline.AlphabetStage(use_logging=False)) \
+                as chain:
+            for char in text:
+                chain.feed(char)
+
+    stats["encode"] = {
+        "queued": len(text) / measure(encode_queued, repeat=repeat),
+        "pipeline": len(text) / measure(encode_pipeline, repeat=repeat),
+    }
+    return stats
+
+
+def _classify_loop(means, distribution, offset, ratios, bounds):
+    # Per mean, per ratio and per label Python loops, used as reference.
+    unit = min(means)
+    for first, second in itertools.combinations(means, 2):
+        if not bounds[0] * unit < abs(first - second) < bounds[1] * unit:
+            return None
+    ratios_items = list(ratios.items())
+    classes = []
+    for mean in means:
+        ratio = mean / unit
+        best_class = None
+        min_delta = abs(ratios_items[0][1] - ratio) + 1
+        for entity, entity_ratio in ratios_items:
+            delta = abs(ratio - entity_ratio)
+            if delta < min_delta:
+                min_delta = delta
+                best_class = entity
+        classes.append(best_class)
+    return [classes[index] for index in distribution[offset:]]
+
+
+def _classify_numpy(means, distribution, offset, ratios, bounds):
+    # Array operations all the way (sorting, midpoint thresholds searched
+    # with `np.searchsorted` and labels mapped through a lookup array).
+    sorted_means = np.sort(means)
+    unit = sorted_means[0]
+    gaps = sorted_means[1:] - sorted_means[:-1]
+    if not (gaps.min() > bounds[0] * unit and
+            sorted_means[-1] - unit < bounds[1] * unit):
+        return None
+    symbols = sorted(ratios, key=ratios.get)
+    values = np.array([ratios[symbol] for symbol in symbols])
+    thresholds = (values[:-1] + values[1:]) / 2
+    classes = np.array(symbols, dtype=object)[
+        np.searchsorted(thresholds, means / unit)]
+    return classes[distribution[offset:]].tolist()
+
+
+def _classify_sorted(means, distribution, offset, ratios, bounds):
+    # Same steps as `MorseTranslator._analyse`.
+    means = means.tolist()
+    sorted_means = sorted(means)
+    unit = sorted_means[0]
+    gap = min(high - low for low, high in zip(sorted_means,
+                                              sorted_means[1:]))
+    if not (gap > bounds[0] * unit and
+            sorted_means[-1] - unit < bounds[1] * unit):
+        return None
+    classes = translator.MorseTranslator._get_signal_classes(
+        [mean / unit for mean in means], ratios)
+    return [classes[index] for index in distribution[offset:].tolist()]
+
+
+def bench_analyse(repeat=1000):
+    """Measure the classification of the clustered means and the labels
+    mapping in microseconds per analysis call, at the maximum signals and
+    silences windows: per ratio Python loops, numpy arrays and the sorted
+    thresholds of the translator. The whole `_analyse` call (k-means
+    included) is measured as well.
+    """
+    trans = translator.MorseTranslator(use_logging=False)
+    values = utils.to_signed(*utils.get_mor_arrays("basic.mor"))
+    stats = {}
+    try:
+        for kind, size in (("signals", trans.SIG_MAXLEN),
+                           ("silences", trans.SIL_MAXLEN)):
+            lengths = np.abs(values[(values > 0) == (kind == "signals")])
+            container = np.resize(lengths, size)
+            container *= np.random.RandomState(0).uniform(0.9, 1.1, size)
+            config = trans.config[kind]
+            means, distribution = trans._stable_kmeans(container,
+                                                       config["means"])
+            ratios = trans._calc_ratios(config["ratios"])
+            bounds = (config["mean_min_diff"], config["mean_max_diff"])
+            args = (means, distribution, 0, ratios, bounds)
+            expected = _classify_loop(*args)
+            if not (expected == _classify_numpy(*args) ==
+                    _classify_sorted(*args)):
+                raise exceptions.ProcessMorseError(
+                    "{} classification differs".format(kind))
+
+            def analyse():
+                kind_config = translator.make_config(trans.params)[kind]
+                trans._analyse(container, kind_config)
+
+            stats[kind] = {"window": size}
+            for name, func in (("python", _classify_loop),
+                               ("numpy", _classify_numpy),
+                               ("sorted", _classify_sorted)):
+                seconds = measure(lambda: func(*args), number=repeat)
+                stats[kind][name] = seconds / repeat * 1e6
+            seconds = measure(analyse, number=repeat // 10)
+            stats[kind]["analyse"] = seconds / (repeat // 10) * 1e6
+    finally:
+        trans.close()
+    return stats
+
+
+def _interleave_pop(signals, silences_batches):
+    # Cycled lists and `list.pop(0)` for every symbol, used as reference.
+    silences = []
+    pick = itertools.cycle([signals, silences])
+    for batch in silences_batches:
+        silences.extend(batch)
+        code = []
+        while True:
+            selected = next(pick)
+            if not selected:
+                next(pick)
+                break
+            code.append(selected.pop(0))
+
+
+def bench_interleave(backlogs=(1000, 10000, 100000), repeat=3):
+    """Measure the cost in nanoseconds per symbol of interleaving a backlog
+    of decoded signals with the silences coming one by one, with the
+    translator deques against cycled lists popped from the front.
+    """
+    trans = translator.MorseTranslator(use_logging=False, threaded=False)
+    stats = {}
+    try:
+        for backlog in backlogs:
+            signals = [converter.DOT] * backlog
+            batches = [[converter.INTRA_GAP]] * backlog
+
+            def deques():
+                trans._morse_signals.extend(signals)
+                for batch in batches:
+                    trans._morse_silences.extend(batch)
+                    trans._combine_morse()
+                    del trans._morse_code[:]
+
+            funcs = {
+                "deque": deques,
+                "pop": lambda: _interleave_pop(list(signals), batches),
+            }
+            stats[backlog] = {
+                name: measure(func, repeat=repeat) / (2 * backlog) * 1e9
+                for name, func in funcs.items()
+            }
+    finally:
+        trans.close()
+    return stats
@@ -0,0 +1,127 @@
+"""Scaling benchmark of many simultaneous translators."""
+
+
+import collections
+import threading
+
+from libmorse import generator, translator, utils
+from libmorse.bench import core
+
+
+np = utils.LazyModule("numpy")
+
+
+class _TimedMorseTranslator(translator.MorseTranslator):
+
+    """Morse translator recording the latency of every processed item."""
+
+    def __init__(self, *args, **kwargs):
+        self._put_times = collections.deque()
+        self.latencies = []
+        super(_TimedMorseTranslator, self).__init__(*args, **kwargs)
+
+    def put(self, item, **kwargs):
+        self._put_times.append(core.timer())
+        super(_TimedMorseTranslator, self).put(item, **kwargs)
+
+    def _process_item(self, item, **kwargs):
+        super(_TimedMorseTranslator, self)._process_item(item, **kwargs)
+        # Items are processed in the very same order they were put.
+        self.latencies.append(core.timer() - self._put_times.popleft())
+
+
+class ThreadedMode(object):
+
+    """Each translator with its own worker thread (the default)."""
+
+    name = "threaded"
+
+    def open(self):
+        """Returns a new translation session."""
+        return _TimedMorseTranslator(use_logging=False)
+
+    def put(self, session, value):
+        """Feed a new signed duration into the `session`."""
+        session.put(value)
+
+    def close(self, session):
+        """Finish the `session` and return its items latencies."""
+        session.wait()
+        translator.get_translator_results(session)
+        session.close()
+        return session.latencies
+
+
+# Available ways of running translators; new modes just need to follow the
+# same `open`, `put` and `close` interface.
+MODES = collections.OrderedDict([
+    (ThreadedMode.name, ThreadedMode),
+])
+
+
+def get_values(items, seed=0):
+    """Generate `items` synthetic signed durations ending with a silence."""
+    values = np.empty(0)
+    words = max(1, items // 20)
+    while values.size < items:
+        text = generator.random_text(words, seed=seed)
+        values = generator.SignalGenerator(
+            jitter=0.05, seed=seed).generate(text)
+        words *= 2
+    ending = [utils.signed(item) for item in utils.humanize_mor_code([])]
+    return values[:items - len(ending)].tolist() + ending
+
+
+def run_concurrency(translators=1, producers=1, items=200,
+                    mode=ThreadedMode.name, seed=0):
+    """Feed `translators` sessions of the given `mode` from `producers`
+    threads, each session with `items` synthetic signals and silences.
+    """
+    runner = MODES[mode]()
+    values = get_values(items, seed=seed)
+    sessions = [runner.open() for _ in range(translators)]
+    threads = threading.active_count()
+    # Every producer feeds its own share of sessions, interleaved.
+    shares = [sessions[idx::producers] for idx in range(producers)]
+
+    def produce(share):
+        for value in values:
+            for session in share:
+                runner.put(session, value)
+
+    workers = [threading.Thread(target=produce, args=(share,))
+               for share in shares if share]
+    start = core.timer()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    latencies = []
+    for session in sessions:
+        latencies.extend(runner.close(session))
+    seconds = core.timer() - start
+
+    latencies = np.array(latencies)
+    p50, p90, p99 = np.percentile(latencies, [50, 90, 99]).tolist()
+    total = translators * len(values)
+    return {
+        "mode": mode,
+        "translators": translators,
+        "producers": producers,
+        "items": total,
+        "seconds": seconds,
+        "items_per_sec": total / seconds,
+        "latency_p50": p50,
+        "latency_p90": p90,
+        "latency_p99": p99,
+        "threads": threads,
+        "rss_kb": core.get_rss(),
+    }
+
+
+def run_scaling(counts=(1, 10, 100, 1000), producers=1, items=200,
+                mode=ThreadedMode.name, seed=0):
+    """Run the concurrency benchmark for each number of translators."""
+    return [run_concurrency(translators=count, producers=producers,
+                            items=items, mode=mode, seed=seed)
+            for count in counts]
@@ -0,0 +1,131 @@
+"""Common measuring utilities used by the benchmarks."""
+
+
+import glob
+import multiprocessing
+import os
+import timeit
+
+import six
+
+from libmorse import converter, generator, settings, utils
+
+try:
+    import resource
+except ImportError:    # not available on Windows
+    resource = None
+
+
+np = utils.LazyModule("numpy")
+timer = utils.timer
+
+
+def measure(func, repeat=3, number=1):
+    """Return the best time in seconds out of `repeat` runs of `func`."""
+    return min(timeit.repeat(func, repeat=repeat, number=number))
+
+
+def get_peak_memory():
+    """Returns the peak resident memory of the current process in KB."""
+    if not resource:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def get_rss():
+    """Returns the current resident memory of the process in KB."""
+    try:
+        with open("/proc/self/statm") as stream:
+            pages = int(stream.read().split()[1])
+    except (IOError, OSError):
+        # Fallback to the peak memory where not available.
+        return get_peak_memory()
+    return pages * os.sysconf("SC_PAGE_SIZE") // 1024
+
+
+def get_stats(items, latencies):
+    """Summarize per call `latencies` (in seconds) of processing `items`."""
+    latencies = np.asarray(latencies, dtype=float)
+    seconds = float(latencies.sum())
+    if not latencies.size:
+        latencies = np.zeros(1)
+    p50, p99 = np.percentile(latencies, [50, 99]).tolist()
+    return {
+        "items": items,
+        "seconds": seconds,
+        "items_per_sec": items / seconds if seconds else None,
+        "latency_p50": p50,
+        "latency_p99": p99,
+    }
+
+
+def _run_child(func, args, conn):
+    try:
+        start_memory = get_peak_memory()
+        result = func(*args)
+        if start_memory is not None:
+            result["peak_memory_kb"] = get_peak_memory() - start_memory
+        conn.send(result)
+    except Exception as exc:
+        conn.send(exc)
+    finally:
+        conn.close()
+
+
+def run_isolated(func, *args):
+    """Run `func` in a separate process, so its peak memory is its own.
+
+    The function should return a dictionary of results, which gets the
+    "peak_memory_kb" increase added.
+    """
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_run_child, args=(func, args, child_conn))
+    process.start()
+    child_conn.close()
+    result = parent_conn.recv()
+    process.join()
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+
+def get_corpus():
+    """Returns the MOR code resources along with the text and morse code
+    found in their headers, as a list of dictionaries.
+    """
+    corpus = []
+    for path in sorted(glob.glob(os.path.join(settings.RESOURCE, "*.mor"))):
+        name = os.path.basename(path)
+        data = utils.get_resource(name)
+        header = [line.lstrip("# ").strip()
+                  for line in data.splitlines()[:2]]
+        states, durations = utils.parse_mor_code(data)
+        corpus.append({
+            "name": name,
+            "data": data,
+            "text": header[0],
+            "morse": header[1],
+            "values": utils.to_signed(states, durations),
+        })
+    return corpus
+
+
+def get_synthetic(scale=10, seed=0, **kwargs):
+    """Generate a synthetic input of `scale` * 10 random words, keyed with
+    slight human imperfections (customizable through `kwargs`).
+    """
+    params = {"jitter": 0.05, "noise": 0.01, "seed": seed}
+    params.update(kwargs)
+    text = generator.random_text(scale * 10, seed=seed)
+    values = generator.SignalGenerator(**params).generate(text)
+    stream = six.StringIO()
+    utils.write_mor_code(stream, *utils.from_signed(values))
+    alpha_conv = converter.AlphabetConverter(use_logging=False)
+    return [{
+        "name": "synthetic-x{}".format(scale),
+        "data": stream.getvalue(),
+        "text": text,
+        "morse": "".join(alpha_conv.add(list(text))),
+        "values": values,
+    }]
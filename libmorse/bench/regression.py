@@ -0,0 +1,272 @@
+"""Performance and accuracy regression baselines.
+
+A fixed matrix of inputs (the resources corpus along with synthetic streams
+keyed at several speeds and noise levels) goes through the decoding and the
+encoding paths, measuring the character error rate of every input, along
+with the throughput and the per item latency percentiles of each path over
+the whole matrix (the single inputs are too short to time steadily). The
+results are saved as a versioned JSON baseline, which the runs of later
+revisions are compared against, flagging the metrics worsened beyond the
+tolerated thresholds.
+"""
+
+
+import collections
+import json
+import platform
+
+import six
+
+from libmorse import exceptions, translator, utils
+from libmorse.bench import core
+
+
+# The autotuning imports the benchmarks in turn.
+autotune = utils.LazyModule("libmorse.autotune")
+
+
+# Version of the saved baselines format.
+BASELINE_VERSION = 2
+# Speeds (words per minute) and noise spike probabilities of the synthetic
+# streams.
+WPMS = (12, 20, 30)
+NOISES = (0.0, 0.02)
+# Compared metrics, with their direction (1 for bigger is better) and if
+# their change is relative to the baseline value or absolute.
+METRICS = (
+    ("items_per_sec", 1, True),
+    ("latency_p50", -1, True),
+    ("latency_p99", -1, True),
+    ("cer", -1, False),
+)
+# Tolerated worsening of every metric: fraction of the baseline value for the
+# timings and absolute difference for the error rate. The timings are meant
+# to be measured on a quiet host, otherwise loosen them.
+THRESHOLDS = {
+    "items_per_sec": 0.05,
+    "latency_p50": 0.1,
+    "latency_p99": 0.1,
+    "cer": 0.01,
+}
+# Latency differences (seconds) within the timer and scheduling noise, never
+# flagged whatever their relative change.
+NOISE_FLOORS = {
+    "latency_p50": 5e-6,
+    "latency_p99": 50e-6,
+}
+# Name of the case holding the timings of a path over the whole matrix.
+ALL_CASE = "all"
+# Least timed work (seconds) of every run of a path, going over the matrix
+# again as many times as needed.
+MIN_SECONDS = 1.0
+
+
+def get_matrix(wpms=WPMS, noises=NOISES, scale=2, seed=0, corpus=True):
+    """Returns the named labelled inputs: the resources corpus (if
+    `corpus`) and `scale` * 10 synthetic words for every speed and noise
+    level.
+    """
+    inputs = collections.OrderedDict(
+        (entry["name"], entry) for entry in
+        (core.get_corpus() if corpus else []))
+    for wpm in wpms:
+        for noise in noises:
+            entry, = core.get_synthetic(scale=scale, seed=seed, wpm=wpm,
+                                        noise=noise)
+            inputs["synthetic-{}wpm-{}noise".format(wpm, noise)] = entry
+    return inputs
+
+
+def _decode(values):
+    # Returns the per item latencies and the decoded text.
+    trans = translator.MorseTranslator(use_logging=False, threaded=False)
+    latencies, results = [], []
+    for value in values:
+        start = core.timer()
+        results.extend(trans.process([value]))
+        latencies.append(core.timer() - start)
+    results.extend(trans.process(translator.get_ending(trans)))
+    trans.close()
+    return latencies, "".join(results)
+
+
+def decode_path(entry):
+    """Decode the timed signals of `entry`, item by item."""
+    return _decode(entry["values"].tolist())
+
+
+def encode_path(entry):
+    """Encode the text of `entry`, character by character."""
+    trans = translator.AlphabetTranslator(use_logging=False, threaded=False,
+                                          compact=True)
+    latencies, values = [], []
+    for char in entry["text"].upper():
+        start = core.timer()
+        values.extend(trans.process([char]))
+        latencies.append(core.timer() - start)
+    trans.close()
+    return latencies, values
+
+
+def get_encoded_text(values):
+    """Decode back the output of the encoding path, for checking."""
+    return _decode(values)[1]
+
+
+# Measured paths, along with the function turning their output into text (if
+# not text already).
+PATHS = collections.OrderedDict([
+    ("decode", (decode_path, None)),
+    ("encode", (encode_path, get_encoded_text)),
+])
+
+
+def _get_errors(text, label):
+    # Returns the edit distance to the label and the label length.
+    return autotune.edit_distance(text.strip(), label), max(len(label), 1)
+
+
+def run_path(path, matrix, repeat=5, get_text=None):
+    """Run every input of the `matrix` through the `path` function, `repeat`
+    times, and return the cases: the error rate of every input and the
+    metrics of the whole matrix, out of its least disturbed runs.
+
+    Every run goes over the matrix until `MIN_SECONDS` of timed work, while
+    the error rates come from the `get_text` (if given) of the first outputs.
+    """
+    cases = collections.OrderedDict()
+    runs = []
+    for _ in six.moves.range(repeat):
+        latencies, seconds = [], 0.0
+        while True:
+            for name, entry in matrix.items():
+                entry_latencies, output = path(entry)
+                latencies.extend(entry_latencies)
+                seconds += sum(entry_latencies)
+                # The processing is deterministic, so any run tells the
+                # error rate.
+                if name not in cases:
+                    text = get_text(output) if get_text else output
+                    cases[name] = {
+                        "items": len(entry_latencies),
+                        "errors": _get_errors(text, entry["text"]),
+                    }
+            if seconds >= MIN_SECONDS or not latencies:
+                break
+        runs.append(core.get_stats(len(latencies), latencies))
+
+    distance, length = 0, 0
+    for case in cases.values():
+        case_distance, case_length = case.pop("errors")
+        case["cer"] = case_distance / float(case_length)
+        distance += case_distance
+        length += case_length
+    stats = max(runs, key=lambda run: run["items_per_sec"] or 0)
+    for key in ("latency_p50", "latency_p99"):
+        stats[key] = min(run[key] for run in runs)
+    stats["cer"] = distance / float(max(length, 1))
+    cases[ALL_CASE] = stats
+    return cases
+
+
+def run_baseline(wpms=WPMS, noises=NOISES, scale=2, seed=0, corpus=True,
+                 repeat=5, label=None):
+    """Measure every path over the whole inputs matrix and return the
+    results, as a baseline.
+
+    :param list wpms: speeds of the synthetic streams
+    :param list noises: noise spike probabilities of the synthetic streams
+    :param int scale: synthetic words (x10) of each stream
+    :param int seed: random seed of the synthetic streams
+    :param bool corpus: include the resources corpus
+    :param int repeat: runs of each path, keeping the fastest
+    :param str label: revision the results belong to
+    """
+    matrix = get_matrix(wpms=wpms, noises=noises, scale=scale, seed=seed,
+                        corpus=corpus)
+    cases = collections.OrderedDict()
+    for path_name, (path, get_text) in PATHS.items():
+        path_cases = run_path(path, matrix, repeat=repeat, get_text=get_text)
+        for name, case in path_cases.items():
+            cases["{}/{}".format(path_name, name)] = case
+
+    return {
+        "version": BASELINE_VERSION,
+        "label": label,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "matrix": {
+            "wpms": list(wpms),
+            "noises": list(noises),
+            "scale": scale,
+            "seed": seed,
+            "corpus": corpus,
+        },
+        "repeat": repeat,
+        "cases": cases,
+    }
+
+
+def get_change(metric, old, new):
+    """Returns how much the `metric` worsened from the `old` value to the
+    `new` one (negative if improved, None if not comparable).
+    """
+    sign, relative = {name: (sign, relative)
+                      for name, sign, relative in METRICS}[metric]
+    if old is None or new is None:
+        return None
+    change = sign * (old - new)
+    if relative:
+        return change / float(old) if old else None
+    return change
+
+
+def compare_baselines(baseline, current, thresholds=None):
+    """Returns the regressions of the `current` results against the
+    `baseline` ones: the cases missing from either side and the metrics of
+    the common ones worsened beyond the `thresholds` (updating the default
+    ones) and the noise floors.
+    """
+    limits = dict(THRESHOLDS)
+    limits.update(thresholds or {})
+    regressions = []
+    old_names, new_names = set(baseline["cases"]), set(current["cases"])
+    for name in sorted(old_names ^ new_names):
+        regressions.append({
+            "case": name,
+            "missing": "current" if name in old_names else "baseline",
+        })
+    for name in sorted(old_names & new_names):
+        old, new = baseline["cases"][name], current["cases"][name]
+        for metric, _, _ in METRICS:
+            change = get_change(metric, old.get(metric), new.get(metric))
+            if change is None or change <= limits[metric]:
+                continue
+            if abs(new[metric] - old[metric]) > NOISE_FLOORS.get(metric, 0):
+                regressions.append({
+                    "case": name,
+                    "metric": metric,
+                    "baseline": old[metric],
+                    "current": new[metric],
+                    "change": change,
+                })
+    return regressions
+
+
+def save_baseline(baseline, stream):
+    """Write the `baseline` results as JSON into `stream`."""
+    json.dump(baseline, stream, indent=2, sort_keys=True)
+    stream.write("\n")
+
+
+def load_baseline(stream):
+    """Returns the baseline results read from `stream`."""
+    baseline = json.load(stream)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise exceptions.ProcessMorseError(
+            "unsupported baseline version {!r}".format(
+                baseline.get("version")))
+    # JSON keys are unicode, while the matrix is used as keyword arguments.
+    baseline["matrix"] = {str(key): value
+                          for key, value in baseline["matrix"].items()}
+    return baseline
@@ -0,0 +1,113 @@
+"""Per item benchmarks of every processing stage."""
+
+
+import collections
+
+import six
+
+from libmorse import converter, exceptions, translator, utils
+from libmorse.bench import core
+
+
+def _time_calls(func, args_list):
+    latencies = []
+    for args in args_list:
+        start = core.timer()
+        func(*args)
+        latencies.append(core.timer() - start)
+    return latencies
+
+
+def bench_morse_converter(inputs):
+    """`MorseConverter.add` fed one morse symbol at a time."""
+    morse_conv = converter.MorseConverter(use_logging=False)
+    symbols = []
+    for entry in inputs:
+        for word in entry["morse"].split(converter.MEDIUM_GAP):
+            symbols.extend(list(word) + [converter.MEDIUM_GAP])
+    latencies = _time_calls(morse_conv.add, [([symbol],)
+                                             for symbol in symbols])
+    return core.get_stats(len(symbols), latencies)
+
+
+def bench_alphabet_converter(inputs):
+    """`AlphabetConverter.add` fed one character at a time."""
+    alpha_conv = converter.AlphabetConverter(use_logging=False)
+    chars = list(" ".join(entry["text"] for entry in inputs))
+    latencies = _time_calls(alpha_conv.add, [([char],) for char in chars])
+    return core.get_stats(len(chars), latencies)
+
+
+def bench_morse_translator(inputs):
+    """`MorseTranslator._process` per timed signal."""
+    latencies = []
+    for entry in inputs:
+        trans = translator.MorseTranslator(use_logging=False)
+        values = entry["values"].tolist()
+        values.extend(utils.signed(item)
+                      for item in utils.humanize_mor_code([]))
+
+        def process(value):
+            try:
+                trans._process(value)
+            except exceptions.TranslatorMorseError:
+                pass
+
+        latencies.extend(_time_calls(process, [(value,)
+                                               for value in values]))
+        trans.close()
+    return core.get_stats(len(latencies), latencies)
+
+
+def bench_stable_kmeans(inputs):
+    """`MorseTranslator._stable_kmeans` over full signals and silences
+    windows.
+    """
+    trans = translator.MorseTranslator(use_logging=False)
+    calls = []
+    for entry in inputs:
+        states, durations = utils.from_signed(entry["values"])
+        windows = [
+            (durations[states], trans.SIG_MAXLEN,
+             trans.config["signals"]["means"]),
+            (durations[~states], trans.SIL_MAXLEN,
+             trans.config["silences"]["means"]),
+        ]
+        for container, size, means in windows:
+            for start in range(0, len(container) - size + 1, size):
+                calls.append((container[start:start + size].tolist(), means))
+    items = sum(len(container) for container, _ in calls)
+    try:
+        latencies = _time_calls(trans._stable_kmeans, calls)
+    finally:
+        trans.close()
+    return core.get_stats(items, latencies)
+
+
+def bench_alphabet_translator(inputs):
+    """`AlphabetTranslator._process` (encoding) per character."""
+    trans = translator.AlphabetTranslator(use_logging=False)
+    chars = list(" ".join(entry["text"] for entry in inputs))
+    latencies = _time_calls(trans._process, [(char,) for char in chars])
+    trans.close()
+    return core.get_stats(len(chars), latencies)
+
+
+def bench_mor_parsing(inputs):
+    """`get_mor_code` parsing per MOR code text."""
+    items = sum(entry["values"].size for entry in inputs)
+    latencies = _time_calls(
+        utils.get_mor_code,
+        [(six.StringIO(entry["data"]),) for entry in inputs]
+    )
+    return core.get_stats(items, latencies)
+
+
+STAGES = collections.OrderedDict([
+    ("morse_converter", bench_morse_converter),
+    ("alphabet_converter", bench_alphabet_converter),
+    ("morse_translator", bench_morse_translator),
+    ("stable_kmeans", bench_stable_kmeans),
+    ("alphabet_translator", bench_alphabet_translator),
+    ("mor_parsing", bench_mor_parsing),
+])
@@ -3,10 +3,12 @@
 
 import abc
 
-import anytree
 import six
 
-from libmorse import exceptions, utils
+from libmorse import exceptions, stats, utils
+
+
+anytree = utils.LazyModule("anytree")
 
 
 # Signals.
@@ -24,13 +26,18 @@ class BaseConverter(utils.Logger):
 
     """Base class for morse-alphabet conversion."""
 
+    # Morse code table and its lookup tree, loaded once and shared (read-only)
+    # by all the converters.
+    MORSE_DICT = None
+    MORSE_TREE = None
+
     def __init__(self, *args, **kwargs):
         self._silence_errors = kwargs.pop("silence_errors", True)
         super(BaseConverter, self).__init__(__name__, *args, **kwargs)
 
         self._morse_dict = None
-        self._morse_tree = anytree.Node("Morse")
         self._input = []
+        self._stats = stats.Stats(type(self).__name__, stats.REGISTRY)
 
         self._load_morse_code()
 
@@ -56,14 +63,27 @@ class BaseConverter(utils.Logger):
 
     def _load_morse_code(self):
         # Obtain morse codes from resource.
-        self._morse_dict = utils.get_resource(
-            "morse.json", resource_type=utils.RES_JSON)
-        for char, code in self._morse_dict.items():
-            self._fill_tree(self._morse_tree, char, list(code))
+        if BaseConverter.MORSE_DICT is None:
+            BaseConverter.MORSE_DICT = utils.get_resource(
+                "morse.json", resource_type=utils.RES_JSON)
+        self._morse_dict = BaseConverter.MORSE_DICT
+
+    @property
+    def _morse_tree(self):
+        if BaseConverter.MORSE_TREE is None:
+            tree = anytree.Node("Morse")
+            for char, code in self._morse_dict.items():
+                self._fill_tree(tree, char, list(code))
+            BaseConverter.MORSE_TREE = tree
+        return BaseConverter.MORSE_TREE
 
     def free(self):
-        del self._morse_tree
         del self._input
+        self._stats.retire()
+
+    def stats(self):
+        """Returns a snapshot of the conversion counters and timers."""
+        return self._stats.snapshot()
 
     @abc.abstractmethod
     def _process(self):
@@ -71,11 +91,15 @@ class BaseConverter(utils.Logger):
 
     def add(self, symbols):
         """Add new items and return results."""
+        start = utils.timer()
         # Add the newly received items.
         self._input.extend(symbols)
+        self._stats.count("symbols", len(symbols))
         # Try to process the current state of the list of unprocessed
         # items.
-        return self._process()
+        results = self._process()
+        self._stats.add_time("add", start)
+        return results
 
 
 class AlphabetConverter(BaseConverter):
@@ -98,6 +122,7 @@ class AlphabetConverter(BaseConverter):
             else:
                 letter = self._morse_dict.get(char)
                 if not letter:
+                    self._stats.count("not_found")
                     msg = "latin character {!r} not found".format(char)
                     if self._silence_errors:
                         self._log_error(msg)
@@ -120,18 +145,30 @@ class MorseConverter(BaseConverter):
 
     """Simple morse code to alphabet converter."""
 
-    def _get_tree_char(self, node, code, letter):
-        def raise_not_found():
-            msg = "morse letter {!r} not found".format(letter)
-            if self._silence_errors:
-                self._log_error(msg)
-            else:
-                raise exceptions.ConverterMorseError(msg)
+    def __init__(self, *args, **kwargs):
+        self._morse_chars = None
+        super(MorseConverter, self).__init__(*args, **kwargs)
 
+    def _load_morse_code(self):
+        super(MorseConverter, self)._load_morse_code()
+        # Reversed lookup table used when decoding entire messages.
+        self._morse_chars = {
+            code: char for char, code in self._morse_dict.items()
+        }
+
+    def _log_not_found(self, letter):
+        self._stats.count("not_found")
+        msg = "morse letter {!r} not found".format(letter)
+        if self._silence_errors:
+            self._log_error(msg)
+        else:
+            raise exceptions.ConverterMorseError(msg)
+
+    def _get_tree_char(self, node, code, letter):
         if not code:
             if hasattr(node, "char") and node.char:
                 return node.char
-            raise_not_found()
+            self._log_not_found(letter)
             return None    # nothing found and no error raised
 
         # Take the first one from the remaining symbols.
@@ -141,7 +178,7 @@ class MorseConverter(BaseConverter):
         if target:
             return self._get_tree_char(target[0], code, letter)
         else:
-            raise_not_found()
+            self._log_not_found(letter)
             return None    # nothing found and no error raised
 
     def _get_char(self, letter):
@@ -197,3 +234,24 @@ class MorseConverter(BaseConverter):
                 chars_list.append(chars)
 
         return " ".join(chars_list) or None
+
+    def decode_text(self, morse_string):
+        """Convert an entire morse code message into alphabet at once.
+
+        Unlike `add`, no letter is held back as possibly incomplete, because
+        the whole message is already known.
+        """
+        start = utils.timer()
+        get_char = self._morse_chars.get
+        words = []
+        for word in morse_string.strip().split(MEDIUM_GAP):
+            letters = [letter for letter in word.split(SHORT_GAP) if letter]
+            chars = [get_char(letter) for letter in letters]
+            if None in chars:
+                for letter, char in zip(letters, chars):
+                    if char is None:
+                        self._log_not_found(letter)
+                chars = [char for char in chars if char is not None]
+            words.append("".join(chars))
+        self._stats.add_time("decode_text", start)
+        return " ".join(words)
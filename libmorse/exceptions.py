@@ -27,3 +27,10 @@ class ConverterMorseError(ProcessMorseError):
     """Exception raised by the converters."""
 
     CODE = 112
+
+
+class ServerMorseError(ProcessMorseError):
+
+    """Exception raised by the server or its clients."""
+
+    CODE = 113
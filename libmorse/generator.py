@@ -0,0 +1,145 @@
+"""Synthetic keyed signals generator, for load and scaling tests."""
+
+
+from libmorse import converter, settings, translator, utils
+
+
+np = utils.LazyModule("numpy")
+
+
+# Characters used for generating random text.
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+
+def wpm_to_unit(wpm):
+    """Returns the unit length in ms for a given words per minute speed
+    (based on the standard "PARIS" word of 50 units).
+    """
+    return 1200.0 / wpm
+
+
+def random_text(words, seed=None, word_len=(1, 7)):
+    """Generate random text made of `words` words."""
+    rand = np.random.RandomState(seed)
+    lengths = rand.randint(word_len[0], word_len[1] + 1, size=words)
+    chars = np.array(list(ALPHABET))[
+        rand.randint(len(ALPHABET), size=lengths.sum())]
+    ends = np.cumsum(lengths)
+    return " ".join("".join(chars[end - length:end])
+                    for end, length in zip(ends, lengths))
+
+
+class SignalGenerator(object):
+
+    """Generate timed signals out of text, using the very same timings as
+    the `AlphabetTranslator`, then alter them like a human would.
+    """
+
+    def __init__(self, wpm=None, unit=settings.UNIT, jitter=0.0, drift=0.0,
+                 noise=0.0, fractions=0.0, pauses=0.0, seed=None):
+        """Create a new generator.
+
+        :param float wpm: speed in words per minute (overrides `unit`)
+        :param float unit: unit length in ms
+        :param float jitter: standard deviation of the Gaussian jitter, as
+            fraction of each duration
+        :param float drift: how much the unit changes (as fraction of it)
+            from the beginning until the end of the generated signals
+        :param float noise: probability of a noise spike within an item
+        :param float fractions: probability of an item being split into
+            same state fractions
+        :param float pauses: probability of a word gap being a long pause
+        :param int seed: random seed for reproducible output
+        """
+        self.unit = wpm_to_unit(wpm) if wpm else unit
+        self.jitter = jitter
+        self.drift = drift
+        self.noise = noise
+        self.fractions = fractions
+        self.pauses = pauses
+        self._random = np.random.RandomState(seed)
+
+        self._ratios = {}
+        for ent in ("signals", "silences"):
+            ratios = translator.AlphabetTranslator.CONFIG[ent]["ratios"]
+            self._ratios.update(translator.BaseTranslator._calc_ratios(ratios))
+        self._letters = {}    # cached timings of each morse letter
+
+    def _get_ratios(self, text):
+        """Returns the signed ratios of every item and the long pauses
+        candidates mask.
+        """
+        # Encoding is stateful (gaps between characters), so every text
+        # gets a new converter.
+        alpha_conv = converter.AlphabetConverter(use_logging=False)
+        letters = alpha_conv.add(list(text.upper()))
+        parts = []
+        for letter in letters:
+            timings = self._letters.get(letter)
+            if timings is None:
+                timings = np.array(translator.AlphabetTranslator.get_timings(
+                    [letter], self._ratios, 1.0))
+                self._letters[letter] = timings
+            parts.append(timings)
+        if not parts:
+            return np.empty(0), np.empty(0, dtype=bool)
+
+        ratios = np.concatenate(parts)
+        gaps = ratios == -self._ratios[converter.MEDIUM_GAP]
+        return ratios, gaps
+
+    def _split(self, values, mask, spike=None):
+        """Split the selected items in two, optionally with a spike of the
+        opposite state in between.
+        """
+        indexes = np.flatnonzero(mask)
+        if not indexes.size:
+            return values
+        values = values.copy()
+        parts = self._random.uniform(0.2, 0.8, size=indexes.size)
+        rests = values[indexes] * (1 - parts)
+        values[indexes] *= parts
+        if spike is None:
+            return np.insert(values, indexes + 1, rests)
+
+        spikes = -np.sign(rests) * spike[indexes]
+        inserts = np.column_stack((spikes, rests)).ravel()
+        return np.insert(values, np.repeat(indexes + 1, 2), inserts)
+
+    def generate(self, text):
+        """Returns the timed signals of `text` as signed durations."""
+        values, gaps = self._get_ratios(text)
+        size = values.size
+        if not size:
+            return values
+
+        # Unit changing linearly in time.
+        units = self.unit * (1 + self.drift * np.linspace(0, 1, size))
+        values = values * units
+        if self.jitter:
+            factors = self._random.normal(1, self.jitter, size=size)
+            values *= np.clip(factors, 0.1, None)
+        if self.pauses:
+            pauses = gaps & (self._random.uniform(size=size) < self.pauses)
+            values[pauses] *= self._random.uniform(2, 4, size=pauses.sum())
+        if self.fractions:
+            mask = self._random.uniform(size=values.size) < self.fractions
+            units = np.insert(units, np.flatnonzero(mask) + 1,
+                              units[mask])
+            values = self._split(values, mask)
+        if self.noise:
+            mask = self._random.uniform(size=values.size) < self.noise
+            # Spikes shorter than the accepted noise ratio.
+            spike = units * self._random.uniform(
+                0.1, 0.9, size=values.size) * settings.NOISE_RATIO
+            values = self._split(values, mask, spike=spike)
+        return values
+
+    def generate_arrays(self, text):
+        """Returns the timed signals of `text` as states and durations."""
+        return utils.from_signed(self.generate(text))
+
+    def write_mor(self, text, stream):
+        """Write the timed signals of `text` as MOR code into `stream`."""
+        states, durations = self.generate_arrays(text)
+        utils.write_mor_code(stream, states, durations)
@@ -0,0 +1,259 @@
+"""Composition of translators, converters and filters, without queues.
+
+Every stage takes a batch of items and returns the batch of its results,
+given right away to the next stage, in the same thread (no worker threads or
+queues in between). A pipeline can be fed from another thread as well, over
+a single handoff queue.
+
+For example, a loopback (text into timed signals and back) or a re-timer
+(normalizing the timed signals of a sloppy operator):
+
+    >>> Pipeline(AlphabetStage(), MorseStage()).translate("SOS")
+    >>> Pipeline(MorseStage(), AlphabetStage()).translate(values)
+"""
+
+
+import threading
+
+from six.moves import queue
+
+from libmorse import prefilter, settings, stats, translator, utils
+
+
+np = utils.LazyModule("numpy")
+
+
+# Seconds between the checks for a stopped consumer, while the handoff queue
+# is full.
+HANDOFF_POLL = 0.05
+
+
+class Stage(object):
+
+    """Base stage, passing the items along as they are."""
+
+    def feed(self, items):
+        """Process a batch of `items` and return the batch of results."""
+        return list(items)
+
+    def flush(self):
+        """Return the results still held back, at the end of the input."""
+        return []
+
+    def close(self):
+        """Free the used resources."""
+
+
+class MorseStage(Stage):
+
+    """Decode signed durations (or `(state, duration)` items) into text,
+    with an unthreaded `MorseTranslator`.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs["threaded"] = False
+        self.translator = translator.MorseTranslator(**kwargs)
+
+    def feed(self, items):
+        if isinstance(items, np.ndarray):
+            return self.translator.process_signed(items)
+        return self.translator.process(items)
+
+    def flush(self):
+        # The final silence lets the last letter out.
+        return self.translator.process(translator.get_ending(self.translator))
+
+    def close(self):
+        self.translator.close()
+
+
+class AlphabetStage(Stage):
+
+    """Encode text characters into signed durations, with an unthreaded
+    `AlphabetTranslator`.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.update(threaded=False, compact=True)
+        self.translator = translator.AlphabetTranslator(**kwargs)
+
+    def feed(self, items):
+        return self.translator.process([item.upper() for item in items])
+
+    def close(self):
+        self.translator.close()
+
+
+class ConverterStage(Stage):
+
+    """Convert morse symbols or characters with a (stateful) converter."""
+
+    def __init__(self, converter):
+        self.converter = converter
+
+    def feed(self, items):
+        return list(self.converter.add(list(items)) or [])
+
+    def close(self):
+        self.converter.free()
+
+
+class PreFilterStage(Stage):
+
+    """Remove noise out of signed durations and merge the same state
+    runs.
+    """
+
+    def __init__(self, unit=None, noise_ratio=settings.NOISE_RATIO,
+                 keep_last=True):
+        """Create a new pre-filtering stage.
+
+        :param unit: unit length in ms thresholding the noise, or a callable
+            returning it (like the current one of a `MorseStage`)
+        """
+        self.unit = unit
+        self.prefilter = prefilter.PreFilter(noise_ratio=noise_ratio,
+                                             keep_last=keep_last)
+
+    def feed(self, items):
+        unit = self.unit() if callable(self.unit) else self.unit
+        return self.prefilter.feed(items, unit=unit)
+
+    def flush(self):
+        return self.prefilter.flush()
+
+
+class TapStage(Stage):
+
+    """Instrumentation stage counting the items passing through it (into
+    the default statistics registry) and showing them to an optional
+    `callback`.
+    """
+
+    def __init__(self, name="TapStage", callback=None):
+        self.callback = callback
+        self._stats = stats.Stats(name, stats.REGISTRY)
+
+    def feed(self, items):
+        self._stats.count("batches")
+        self._stats.count("items", len(items))
+        self._stats.maximum("batch_size", len(items))
+        if self.callback:
+            self.callback(items)
+        return items
+
+    def stats(self):
+        return self._stats.snapshot()
+
+    def close(self):
+        self._stats.retire()
+
+
+class Pipeline(object):
+
+    """Chain of stages, each one fed with the results of the previous
+    one.
+    """
+
+    def __init__(self, *stages):
+        self.stages = list(stages)
+
+    def _run(self, items, first=0):
+        for stage in self.stages[first:]:
+            if not len(items):
+                return []
+            items = stage.feed(items)
+        return items
+
+    def feed(self, items):
+        """Pass a batch of `items` through all the stages and return the
+        results of the last one.
+        """
+        return self._run(items)
+
+    def flush(self):
+        """Flush the stages in order, every one of them through the rest of
+        the pipeline, and return the last results.
+        """
+        results = []
+        for index, stage in enumerate(self.stages):
+            results.extend(self._run(stage.flush(), first=index + 1))
+        return results
+
+    def close(self):
+        for stage in self.stages:
+            stage.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def run(self, batches):
+        """Yield the results of every batch out of `batches`, followed by
+        the flushed ones.
+        """
+        for items in batches:
+            results = self.feed(items)
+            if len(results):
+                yield results
+        results = self.flush()
+        if results:
+            yield results
+
+    def translate(self, items):
+        """Returns all the results of `items` (entire input) at once."""
+        results = list(self.feed(items))
+        results.extend(self.flush())
+        return results
+
+
+def iter_handoff(pipeline, batches, maxsize=64):
+    """Run the `pipeline` over `batches` produced by another thread (like a
+    capture) and yield the results, with a single queue in between.
+    """
+    handoff = queue.Queue(maxsize=maxsize)
+    done = object()
+    # Set once the consumer stops (finished, failed or closed early), so the
+    # producer doesn't block forever on a full queue.
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                handoff.put(item, timeout=HANDOFF_POLL)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def produce():
+        try:
+            for items in batches:
+                if not put(items):
+                    return
+        except Exception as exc:
+            put(exc)
+        else:
+            put(done)
+
+    producer = threading.Thread(target=produce)
+    producer.setDaemon(True)
+    producer.start()
+
+    def consume():
+        while True:
+            items = handoff.get()
+            if items is done:
+                break
+            if isinstance(items, Exception):
+                raise items
+            yield items
+
+    try:
+        for results in pipeline.run(consume()):
+            yield results
+    finally:
+        stop.set()
+        producer.join()
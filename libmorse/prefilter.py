@@ -0,0 +1,81 @@
+"""Vectorized pre-filtering of signed durations before translation."""
+
+
+from libmorse import settings, utils
+
+
+np = utils.LazyModule("numpy")
+
+
+class PreFilter(object):
+
+    """Remove noise and merge consecutive items of the same state.
+
+    Works on whole arrays of signed durations (positive for signals and
+    negative for silences), while the still open run of the last array is
+    carried over to the next one.
+    """
+
+    def __init__(self, noise_ratio=settings.NOISE_RATIO, keep_last=False):
+        """Create a new pre-filter.
+
+        :param float noise_ratio: less than this from unit is noise
+        :param bool keep_last: keep the last item of every merged run
+            apart, so the one fed with the result still sees when the run
+            ends (the translator decides then if the run is a long one)
+        """
+        self.noise_ratio = noise_ratio
+        self.keep_last = keep_last
+        self._pending = np.empty(0)    # open run from the previous chunk
+        # How many items were dropped as noise and merged into runs so far.
+        self.dropped = 0
+        self.merged = 0
+
+    def _merge(self, values):
+        # Merge the runs of the same state; the same sign is kept by the sum.
+        states = np.signbit(values)
+        starts = np.flatnonzero(states[1:] != states[:-1]) + 1
+        starts = np.concatenate(([0], starts))
+        runs = np.add.reduceat(values, starts)
+        if not self.keep_last:
+            return runs, runs[-1:]
+
+        # Split every run of more than one item into its merged head and its
+        # original last item.
+        lengths = np.diff(np.append(starts, values.size))
+        multi = lengths > 1
+        lasts = values[starts + lengths - 1]
+        positions = np.arange(runs.size) + np.cumsum(multi)
+        merged = np.empty(runs.size + np.count_nonzero(multi))
+        merged[positions] = np.where(multi, lasts, runs)
+        merged[positions[multi] - 1] = runs[multi] - lasts[multi]
+        pending = 2 if multi[-1] else 1
+        return merged, merged[-pending:]
+
+    def feed(self, values, unit=None, final=False):
+        """Filter a new chunk of `values` and return the completed runs.
+
+        :param float unit: current unit, used for thresholding the noise
+        :param bool final: return the open run too, instead of keeping it
+        """
+        values = np.asarray(values, dtype=float)
+        # Remove noise.
+        if unit and values.size:
+            size = values.size
+            values = values[np.abs(values) >= self.noise_ratio * unit]
+            self.dropped += size - values.size
+        values = np.concatenate((self._pending, values))
+        if not values.size:
+            return values
+
+        merged, pending = self._merge(values)
+        self.merged += values.size - merged.size
+        if final:
+            self._pending = np.empty(0)
+            return merged
+        self._pending = pending
+        return merged[:-pending.size]
+
+    def flush(self):
+        """Return the open run, if any."""
+        return self.feed([], final=True)
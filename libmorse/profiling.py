@@ -0,0 +1,152 @@
+"""CPU and memory profiling of the caller and of the translator threads."""
+
+
+import collections
+import contextlib
+import cProfile
+import gc
+import pstats
+import sys
+import threading
+
+try:
+    import tracemalloc
+except ImportError:    # available with Python 3 only
+    tracemalloc = None
+
+
+# How many allocation sites (or object types) are reported.
+TOP_ALLOCATIONS = 25
+# Frames stored by `tracemalloc` for each allocation.
+TRACEBACK_LIMIT = 10
+
+
+def _count_objects():
+    return collections.Counter(type(obj).__name__
+                               for obj in gc.get_objects())
+
+
+class Profiler(object):
+
+    """Profile the current thread and every thread started meanwhile (like
+    the translator's worker), merging their statistics.
+
+    With `trace_malloc`, the top allocation sites are recorded as well. When
+    `tracemalloc` isn't available, the growth of the garbage collected
+    objects is reported by type instead.
+    """
+
+    def __init__(self, profile=True, trace_malloc=False,
+                 limit=TOP_ALLOCATIONS):
+        self.profile = profile
+        self.trace_malloc = trace_malloc
+        self.limit = limit
+        self._profilers = []
+        self._lock = threading.Lock()
+        self._objects = None    # objects count by type when started
+        self._allocations = []
+
+    def _new_profiler(self):
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._profilers.append(profiler)
+        profiler.enable()
+
+    def _thread_hook(self, frame, event, arg):
+        # Called once by any new thread; the profiler replaces this hook.
+        sys.setprofile(None)
+        self._new_profiler()
+
+    def start(self):
+        if self.trace_malloc:
+            if tracemalloc:
+                tracemalloc.start(TRACEBACK_LIMIT)
+            else:
+                self._objects = _count_objects()
+        if self.profile:
+            threading.setprofile(self._thread_hook)
+            self._new_profiler()
+
+    def stop(self):
+        if self.profile:
+            threading.setprofile(None)
+            # Only the current thread's profiler is stopped, the others
+            # stopped along with their threads.
+            self._profilers[0].disable()
+        if self.trace_malloc:
+            self._allocations = self._get_allocations()
+
+    def _get_allocations(self):
+        if tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            top = snapshot.statistics("lineno")[:self.limit]
+            return [str(stat) for stat in top]
+
+        growth = _count_objects()
+        growth.subtract(self._objects)
+        # Don't count the objects created by the counting itself.
+        growth["Counter"] -= 1
+        return ["{}: +{} objects".format(name, count)
+                for name, count in growth.most_common(self.limit)
+                if count > 0]
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def get_stats(self):
+        """Returns the merged `pstats.Stats` of all the profiled threads."""
+        with self._lock:
+            profilers = list(self._profilers)
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+        return stats
+
+    @property
+    def threads(self):
+        """How many threads were profiled."""
+        return len(self._profilers)
+
+    @property
+    def allocations(self):
+        """The top allocation sites (or objects growth by type) as text
+        lines.
+        """
+        return list(self._allocations)
+
+    def dump_stats(self, path):
+        """Save the merged statistics, ready to be loaded with `pstats`."""
+        self.get_stats().dump_stats(path)
+
+    def dump_allocations(self, stream):
+        """Write the top allocation sites into `stream`."""
+        if tracemalloc:
+            stream.write("Top {} allocation sites:\n".format(self.limit))
+        else:
+            stream.write("Top {} objects growth (no tracemalloc):\n".format(
+                self.limit))
+        for line in self._allocations:
+            stream.write(line + "\n")
+
+
+@contextlib.contextmanager
+def profile(path=None, malloc_stream=None, limit=TOP_ALLOCATIONS):
+    """Profile the enclosed code along with the threads it starts.
+
+    :param str path: where to save the merged CPU statistics (if any)
+    :param malloc_stream: where to write the top allocation sites (if any)
+    :param int limit: how many allocation sites to report
+    """
+    profiler = Profiler(profile=bool(path),
+                        trace_malloc=bool(malloc_stream), limit=limit)
+    with profiler:
+        yield profiler
+    if path:
+        profiler.dump_stats(path)
+    if malloc_stream:
+        profiler.dump_allocations(malloc_stream)
@@ -0,0 +1,170 @@
+"""Compact binary recordings of timed signals.
+
+A recording starts with a small header (magic, version, unit hint and items
+count) followed by packed little-endian float32 records, each one being a
+signed duration: positive for signals and negative for silences.
+"""
+
+
+import mmap
+import os
+import struct
+
+from libmorse import exceptions, utils
+
+
+np = utils.LazyModule("numpy")
+
+
+MAGIC = b"MORB"
+VERSION = 1
+# Magic, version, flags, unit hint and records count.
+HEADER = struct.Struct("<4sHHfQ")
+# Record type (as numpy dtype) and its size.
+RECORD = "<f4"
+RECORD_SIZE = struct.calcsize("<f")
+# Usual recording file extension.
+EXTENSION = ".morb"
+
+
+def is_recording(name):
+    """Returns True if the file `name` looks like a binary recording."""
+    return bool(name) and name.lower().endswith(EXTENSION)
+
+
+def _unpack_header(data):
+    if len(data) < HEADER.size:
+        raise exceptions.ProcessMorseError("truncated recording header")
+    magic, version, _, unit, count = HEADER.unpack(data[:HEADER.size])
+    if magic != MAGIC:
+        raise exceptions.ProcessMorseError("not a morse recording")
+    if version != VERSION:
+        raise exceptions.ProcessMorseError(
+            "unsupported recording version {}".format(version))
+    return unit, count
+
+
+class RecordingReader(object):
+
+    """Memory-mapped reader of binary recordings."""
+
+    def __init__(self, path):
+        self._stream = open(path, "rb")
+        try:
+            # Empty files can't be mapped at all.
+            if os.fstat(self._stream.fileno()).st_size < HEADER.size:
+                raise exceptions.ProcessMorseError(
+                    "truncated recording header")
+            self._mmap = mmap.mmap(self._stream.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+        except Exception:
+            self._stream.close()
+            raise
+        try:
+            unit, count = _unpack_header(self._mmap[:HEADER.size])
+        except exceptions.ProcessMorseError:
+            self.close()
+            raise
+        self.unit = unit or None    # missing hint
+        # The writer may still be appending records, so trust only the
+        # complete ones.
+        available = (len(self._mmap) - HEADER.size) // RECORD_SIZE
+        self.count = min(count, available)
+
+    @property
+    def values(self):
+        """Zero-copy view over the signed durations of the recording."""
+        return np.frombuffer(self._mmap, dtype=RECORD, count=self.count,
+                             offset=HEADER.size)
+
+    def get_arrays(self):
+        """Returns the arrays of states and durations."""
+        return utils.from_signed(self.values)
+
+    def close(self):
+        self._mmap.close()
+        self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RecordingWriter(object):
+
+    """Streaming appender of binary recordings."""
+
+    def __init__(self, path, unit=None, append=False):
+        self.count = 0
+        if append and os.path.isfile(path):
+            self._stream = open(path, "r+b")
+            try:
+                header_unit, self.count = _unpack_header(
+                    self._stream.read(HEADER.size))
+            except Exception:
+                self._stream.close()
+                raise
+            self.unit = unit or header_unit or None
+            # Drop any incomplete record left behind.
+            self._stream.seek(HEADER.size + self.count * RECORD_SIZE)
+            self._stream.truncate()
+        else:
+            self._stream = open(path, "wb")
+            self.unit = unit
+        self._write_header()
+
+    def _write_header(self):
+        position = self._stream.tell()
+        self._stream.seek(0)
+        self._stream.write(
+            HEADER.pack(MAGIC, VERSION, 0, self.unit or 0.0, self.count))
+        self._stream.seek(max(position, HEADER.size))
+
+    def write_signed(self, values):
+        """Append signed durations to the recording."""
+        values = np.asarray(values, dtype=RECORD)
+        self._stream.write(values.tobytes())
+        self.count += values.size
+
+    def write_arrays(self, states, durations):
+        """Append arrays of states and durations to the recording."""
+        self.write_signed(utils.to_signed(states, durations))
+
+    def write(self, item):
+        """Append a single (state, duration) item to the recording."""
+        self.write_arrays([item[0]], [item[1]])
+
+    def flush(self):
+        """Make the written records visible to the readers."""
+        self._write_header()
+        self._stream.flush()
+
+    def close(self):
+        self.flush()
+        self._stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def mor_to_recording(stream, path, unit=None):
+    """Convert a MOR code `stream` into the binary recording `path`."""
+    with RecordingWriter(path, unit=unit) as writer:
+        for states, durations in utils.iter_mor_arrays(stream):
+            writer.write_arrays(states, durations)
+        return writer.count
+
+
+def recording_to_mor(path, stream):
+    """Convert the binary recording `path` into MOR code `stream`."""
+    with RecordingReader(path) as reader:
+        states, durations = reader.get_arrays()
+        # Shortest float32 representation of each duration.
+        for state, duration in zip(states.tolist(), durations):
+            stream.write("{} {}\n".format(int(state), duration))
+        return reader.count
@@ -0,0 +1,117 @@
+"""Real-time replay of timed signals, measuring the decoding latency."""
+
+
+from libmorse import exceptions, translator, utils
+
+
+np = utils.LazyModule("numpy")
+
+
+def _get_due_times(values, speed):
+    """Returns the moments (relative to the beginning) when each quantum
+    ends, therefore when it can be fed.
+    """
+    if not speed:
+        return np.zeros(len(values))
+    return np.cumsum(np.abs(values)) / 1000.0 / speed
+
+
+def _summarize(chars, bins):
+    delays = np.array([delay for _, _, _, delay, _ in chars])
+    report = {
+        "text": "".join(char for char, _, _, _, _ in chars),
+        "chars": [
+            {"char": char, "first": first, "last": last, "delay": delay,
+             "time": moment}
+            for char, first, last, delay, moment in chars
+        ],
+        "time_to_first_char": chars[0][4] if chars else None,
+        "first_char_delay": chars[0][3] if chars else None,
+    }
+    if delays.size:
+        counts, edges = np.histogram(delays, bins=bins)
+        p50, p90, p99 = np.percentile(delays, [50, 90, 99]).tolist()
+        report["latency"] = {
+            "histogram": {"counts": counts.tolist(),
+                          "edges": edges.tolist()},
+            "p50": p50,
+            "p90": p90,
+            "p99": p99,
+            "max": float(delays.max()),
+        }
+    return report
+
+
+def replay(values, speed=1.0, coroutine=False, ending=True, bins=10,
+           **kwargs):
+    """Feed timed signals into a translator at real-time (or accelerated)
+    speed and measure, for every emitted character, the delay from the
+    final quantum which completed it.
+
+    :param values: signed durations (positive for signals and negative for
+        silences) to replay
+    :param float speed: acceleration factor (1 is real-time, 0 or None
+        means as fast as possible)
+    :param bool coroutine: use the `translate_morse` coroutine instead of a
+        translator
+    :param bool ending: add the usual expected silence at the end
+    :param int bins: how many latency histogram bins to report
+    :returns: report dictionary with the decoded text, each character
+        timings, the latency histogram and the time-to-first-character
+    """
+    values = list(values)
+    if ending:
+        values.extend(utils.signed(item)
+                      for item in utils.humanize_mor_code([]))
+    due_times = _get_due_times(values, speed)
+    chars = []    # (char, first item, last item, delay, time since start)
+
+    # Every result comes stamped with the index of the item which completed
+    # it and the moment that item was fed.
+    kwargs["provenance"] = True
+    if coroutine:
+        gen = translator.translate_morse(**kwargs)
+        trans, _ = next(gen)
+    else:
+        trans = translator.MorseTranslator(**kwargs)
+
+    def add(stamp):
+        now = utils.timer()
+        chars.append((stamp.result, stamp.first, stamp.last,
+                      now - stamp.ingest, now - start))
+
+    def collect(block=False, timeout=None):
+        try:
+            add(trans.get(block=block, timeout=timeout))
+        except exceptions.TranslatorMorseError:
+            return False
+        return True
+
+    start = utils.timer()
+    for index, value in enumerate(values):
+        # Wait for the quantum to end, while collecting what's decoded.
+        while True:
+            remaining = start + due_times[index] - utils.timer()
+            if remaining <= 0:
+                break
+            collect(block=True, timeout=remaining)
+        if coroutine:
+            trans, results = gen.send(value)
+            for stamp in results:
+                add(stamp)
+        else:
+            trans.put(value)
+        while collect():
+            pass
+
+    trans.wait()
+    while collect():
+        pass
+    if coroutine:
+        try:
+            gen.send(translator.MorseTranslator.CLOSE_SENTINEL)
+        except StopIteration:
+            pass
+    else:
+        trans.close()
+    return _summarize(chars, bins)
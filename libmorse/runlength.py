@@ -0,0 +1,90 @@
+"""Vectorized run-length encoding of sampled key-line states."""
+
+
+from libmorse import utils
+
+
+np = utils.LazyModule("numpy")
+
+
+class RunLengthEncoder(object):
+
+    """Turn fixed-rate on/off samples into signed durations (positive for
+    signals and negative for silences) in milliseconds.
+
+    The still open run of every chunk is carried over to the next one.
+    """
+
+    def __init__(self, sample_rate, packed=False):
+        """Create a new encoder.
+
+        :param float sample_rate: samples per second
+        :param bool packed: samples come packed as bits into bytes (most
+            significant bit first), like `numpy.packbits` does
+        """
+        self.sample_rate = sample_rate
+        self.packed = packed
+        self.period = 1000.0 / sample_rate    # sample duration in ms
+        # State and samples count of the open run.
+        self._state = False
+        self._count = 0
+
+    @property
+    def state(self):
+        """State of the open run (False before any sample)."""
+        return self._state
+
+    def _get_states(self, bits, count):
+        if self.packed:
+            states = np.unpackbits(np.asarray(bits, dtype=np.uint8))
+            return states[:count].view(bool)
+        states = np.asarray(bits)
+        if states.dtype != bool:
+            states = states != 0
+        return states[:count]
+
+    def _to_signed(self, states, counts):
+        values = utils.to_signed(states, counts * self.period)
+        # Drop the empty leading run (nothing was open yet).
+        return values[counts > 0]
+
+    def feed(self, bits, count=None):
+        """Encode a new chunk of samples and return the completed runs.
+
+        :param bits: states (bool or 0/1 array) or packed bytes
+        :param int count: how many samples are valid (for packed bits not
+            filling the last byte)
+        """
+        states = self._get_states(bits, count)
+        if not states.size:
+            return np.empty(0)
+
+        # Transitions are where the state changes from a sample to the next.
+        starts = np.flatnonzero(np.diff(states.view(np.int8))) + 1
+        bounds = np.concatenate(([0], starts, [states.size]))
+        counts = np.diff(bounds)
+        run_states = states[bounds[:-1]]
+        if run_states[0] == self._state:
+            counts[0] += self._count
+        else:
+            # The previous open run ended right at the chunk boundary.
+            run_states = np.concatenate(([self._state], run_states))
+            counts = np.concatenate(([self._count], counts))
+        self._state, self._count = bool(run_states[-1]), int(counts[-1])
+        return self._to_signed(run_states[:-1], counts[:-1])
+
+    def flush(self):
+        """Return the open run (if any) and reset."""
+        states = np.array([self._state])
+        counts = np.array([self._count])
+        self._state, self._count = False, 0
+        return self._to_signed(states, counts)
+
+
+def from_samples(bits, sample_rate, packed=False, count=None):
+    """Returns the signed durations in milliseconds of all the runs found in
+    the sampled key-line states `bits` (the last one included).
+    """
+    encoder = RunLengthEncoder(sample_rate, packed=packed)
+    values = encoder.feed(bits, count=count)
+    return np.concatenate((values, encoder.flush()))
@@ -0,0 +1,340 @@
+"""Long-running server keeping warm translators, along with its client.
+
+Messages are JSON objects framed by their length (4 bytes, big-endian) and
+exchanged over a Unix domain socket or a TCP one. Every request carries an
+"op" and gets back a response with either a "result" or an "error":
+
+- ping: returns "pong"
+- encode: "text" into morse code (with "morse") or timed signals
+- decode: "morse" code or "signals" (signed durations) into alphabet
+- open: starts a streaming session and returns its id
+- put: feeds "signals" into the "session" and returns the new text
+- close: ends the "session" and returns the remaining text
+"""
+
+
+import itertools
+import json
+import os
+import socket
+import stat
+import struct
+
+import six
+from six.moves import socketserver
+
+from libmorse import converter, exceptions, settings, translator, utils
+
+
+HEADER = struct.Struct(">I")
+# Refuse messages bigger than this (in bytes).
+MAX_MESSAGE = 64 * 1024 * 1024
+# Accepted types of the signals durations.
+NUMBER_TYPES = six.integer_types + (float,)
+
+
+def parse_address(address):
+    """Returns the socket family and address out of an `address` string:
+    a Unix socket path or a TCP "[host:]port" one.
+    """
+    host, _, port = str(address).rpartition(":")
+    if port.isdigit():
+        return socket.AF_INET, (host or "localhost", int(port))
+    return socket.AF_UNIX, address
+
+
+def _recv_exactly(sock, size):
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            if chunks:
+                raise exceptions.ServerMorseError("truncated message")
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def send_message(sock, message):
+    """Send a `message` object through the socket `sock`."""
+    data = json.dumps(message).encode(settings.ENCODING)
+    sock.sendall(HEADER.pack(len(data)) + data)
+
+
+def _recv_data(sock):
+    # Returns the data of the next message (None if the other end closed the
+    # connection).
+    header = _recv_exactly(sock, HEADER.size)
+    if header is None:
+        return None
+    size = HEADER.unpack(header)[0]
+    if size > MAX_MESSAGE:
+        raise exceptions.ServerMorseError(
+            "message too big ({} bytes)".format(size))
+    data = _recv_exactly(sock, size)
+    if data is None:
+        raise exceptions.ServerMorseError("truncated message")
+    return data
+
+
+def recv_message(sock):
+    """Receive a message object from the socket `sock` (None if the other
+    end closed the connection).
+    """
+    data = _recv_data(sock)
+    if data is None:
+        return None
+    return json.loads(data.decode(settings.ENCODING))
+
+
+def _get_field(message, name, types, kind):
+    # Returns the `name` field of the request `message`, if of the `types`
+    # (described as `kind`).
+    value = message[name]
+    if not isinstance(value, types):
+        raise exceptions.ServerMorseError(
+            "{!r} expects {}, got {}".format(name, kind,
+                                             type(value).__name__))
+    return value
+
+
+def _get_signals(message):
+    # Returns the signed durations of the request `message`.
+    signals = _get_field(message, "signals", list, "a list")
+    for value in signals:
+        if not isinstance(value, NUMBER_TYPES):
+            raise exceptions.ServerMorseError(
+                "'signals' expects numbers, got {}".format(
+                    type(value).__name__))
+    return signals
+
+
+class Session(object):
+
+    """Streaming decoding session, returning the text incrementally."""
+
+    def __init__(self, **kwargs):
+        self._translator = translator.MorseTranslator(**kwargs)
+
+    def _get_text(self):
+        _, results = translator.get_translator_results(
+            self._translator, force_wait=True)
+        return "".join(results)
+
+    def put(self, values):
+        self._translator.put_signed(values)
+        return self._get_text()
+
+    def close(self):
+        translator.put_ending(self._translator)
+        text = self._get_text()
+        self._translator.close()
+        return text
+
+
+class MorseHandler(socketserver.BaseRequestHandler):
+
+    """Serve the requests of a connected client, until it disconnects."""
+
+    def setup(self):
+        self.sessions = {}
+        self._session_ids = itertools.count(1)
+
+    def _get_session(self, message):
+        session = self.sessions.get(message.get("session"))
+        if not session:
+            raise exceptions.ServerMorseError(
+                "unknown session {!r}".format(message.get("session")))
+        return session
+
+    def _op_ping(self, message):
+        return "pong"
+
+    def _op_encode(self, message):
+        # Encoding is stateful (gaps between characters), so a new converter
+        # is used for each request.
+        alpha_conv = converter.AlphabetConverter(
+            **self.server.converter_options)
+        text = _get_field(message, "text", six.string_types, "a string")
+        letters = alpha_conv.add(list(text.upper()))
+        if message.get("morse"):
+            return "".join(letters)
+        signals = translator.AlphabetTranslator.get_timings(
+            letters, self.server.ratios, settings.UNIT)
+        return [[int(state), duration]
+                for state, duration in map(utils.unsigned, signals)]
+
+    def _op_decode(self, message):
+        if "morse" in message:
+            morse = _get_field(message, "morse", six.string_types,
+                               "a string")
+            return self.server.morse_converter.decode_text(morse)
+        return "".join(translator.translate_signed(
+            _get_signals(message), **self.server.options))
+
+    def _op_open(self, message):
+        session_id = next(self._session_ids)
+        self.sessions[session_id] = Session(**self.server.options)
+        return session_id
+
+    def _op_put(self, message):
+        return self._get_session(message).put(_get_signals(message))
+
+    def _op_close(self, message):
+        session = self._get_session(message)
+        del self.sessions[message["session"]]
+        return session.close()
+
+    def handle_message(self, message):
+        """Returns the response of a request `message`."""
+        if not isinstance(message, dict):
+            return {"error": "expecting a JSON object, got {}".format(
+                type(message).__name__)}
+        func = getattr(self, "_op_{}".format(message.get("op")), None)
+        if not func:
+            return {"error": "unknown operation {!r}".format(
+                message.get("op"))}
+        try:
+            return {"result": func(message)}
+        except (exceptions.MorseError, KeyError, TypeError,
+                ValueError) as exc:
+            return {"error": "{}: {}".format(type(exc).__name__, exc)}
+
+    def handle(self):
+        while True:
+            try:
+                data = _recv_data(self.request)
+                if data is None:
+                    break
+                # Any JSON value, null included, gets a response.
+                message = json.loads(data.decode(settings.ENCODING))
+            except (exceptions.ServerMorseError, ValueError) as exc:
+                send_message(self.request, {"error": str(exc)})
+                break
+            send_message(self.request, self.handle_message(message))
+
+    def finish(self):
+        # Free the sessions left open by the client.
+        for session in self.sessions.values():
+            session.close()
+        self.sessions.clear()
+
+
+class _ServerMixin(socketserver.ThreadingMixIn):
+
+    daemon_threads = True
+
+    def setup_translation(self, options):
+        self.options = options
+        # Without the translators only options (like tuned parameters).
+        self.converter_options = (
+            translator.BaseTranslator._get_converter_kwargs(options))
+        self.morse_converter = converter.MorseConverter(
+            **self.converter_options)
+        self.ratios = {}
+        for ent in ("signals", "silences"):
+            self.ratios.update(translator.BaseTranslator._calc_ratios(
+                translator.BaseTranslator.CONFIG[ent]["ratios"]))
+
+
+class TCPServer(_ServerMixin, socketserver.TCPServer):
+
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, "UnixStreamServer"):
+    class UnixServer(_ServerMixin, socketserver.UnixStreamServer):
+
+        def server_close(self):
+            socketserver.UnixStreamServer.server_close(self)
+            if os.path.exists(self.server_address):
+                os.remove(self.server_address)
+else:    # not available on Windows
+    UnixServer = None
+
+
+def _remove_stale_socket(address):
+    # Removes the Unix socket left at `address` by a server gone away,
+    # refusing to touch anything else.
+    try:
+        mode = os.stat(address).st_mode
+    except OSError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise exceptions.ServerMorseError(
+            "{!r} exists and isn't a socket".format(address))
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(address)
+    except socket.error:
+        os.remove(address)
+    else:
+        raise exceptions.ServerMorseError(
+            "a server is already listening on {!r}".format(address))
+    finally:
+        sock.close()
+
+
+def create_server(address=settings.SERVER_ADDRESS, **kwargs):
+    """Create and return a server bound to `address`, ready to
+    `serve_forever`.
+
+    Any other keyword argument is passed to the translators and converters.
+    """
+    family, address = parse_address(address)
+    if family == socket.AF_INET:
+        server = TCPServer(address, MorseHandler)
+    else:
+        if not UnixServer:
+            raise exceptions.ServerMorseError(
+                "Unix sockets not supported, use a TCP port instead")
+        _remove_stale_socket(address)
+        server = UnixServer(address, MorseHandler)
+    server.setup_translation(kwargs)
+    return server
+
+
+class Client(object):
+
+    """Client talking to a running server."""
+
+    def __init__(self, address=settings.SERVER_ADDRESS):
+        family, address = parse_address(address)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            self._sock.connect(address)
+        except socket.error as exc:
+            self._sock.close()
+            raise exceptions.ServerMorseError(
+                "can't connect to server ({})".format(exc))
+
+    def request(self, op, **kwargs):
+        """Send a request and return its result."""
+        kwargs["op"] = op
+        send_message(self._sock, kwargs)
+        response = recv_message(self._sock)
+        if response is None:
+            raise exceptions.ServerMorseError("connection closed by server")
+        if "error" in response:
+            raise exceptions.ServerMorseError(response["error"])
+        return response["result"]
+
+    def encode(self, text, morse=False):
+        return self.request("encode", text=text, morse=morse)
+
+    def decode(self, morse=None, signals=None):
+        """Decode either `morse` code or `signals` (signed durations)."""
+        if morse is not None:
+            return self.request("decode", morse=morse)
+        return self.request("decode",
+                            signals=[float(value) for value in signals])
+
+    def close(self):
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -20,6 +20,11 @@ LOGGING = True
 DEBUG = False
 # Logging file.
 LOGFILE = "libmorse.log"
+# Write the log records from a background thread.
+LOGQUEUE = True
+
+# Default address of the server: Unix socket path or TCP "[host:]port".
+SERVER_ADDRESS = "localhost:8725"
 
 # Misc.
 ENCODING = "utf-8"
@@ -38,10 +43,27 @@ UNIT = 300.0    # should be float
 NOISE_RATIO = 0.1
 
 # Standard positive handicap for the preset ratios.
+def get_ratio_handicap(range_type):
+    return max(1, int(range_type[0] * (1.0 / 3)))
+
 class RATIO_HANDICAP:
-    handi_func = lambda range_type: max(1, int(range_type[0] * (1.0 / 3)))
-    SIGNALS = handi_func(SIG_RANGE)
-    SILENCES = handi_func(SIL_RANGE)
+    SIGNALS = get_ratio_handicap(SIG_RANGE)
+    SILENCES = get_ratio_handicap(SIL_RANGE)
+
+# Audio front-end: tone frequency in Hz (None for a broadband RMS envelope),
+# envelope window in milliseconds, hysteresis thresholds as fractions of the
+# peak level, the minimum level ever considered a tone (full scale is 1) and
+# how many times a tone must be above the noise floor.
+TONE_FREQUENCY = 600.0
+TONE_WINDOW = 5.0
+TONE_THRESHOLDS = (0.5, 0.25)
+TONE_MIN_LEVEL = 0.01
+TONE_SNR = 10.0
+# Audio rendering: sample rate, tone amplitude (full scale is 1) and the
+# length in milliseconds of the raised-cosine keying ramps.
+SAMPLE_RATE = 8000
+TONE_AMPLITUDE = 0.5
+TONE_RAMP = 5.0
 
 # Enable translator renewal after certain states/events.
 ENABLE_RENEWAL = False
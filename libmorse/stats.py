@@ -0,0 +1,159 @@
+"""Low-overhead counters and timers of the processing stages."""
+
+
+import collections
+import json
+import os
+import threading
+import weakref
+
+from libmorse import utils
+
+
+class Stats(object):
+
+    """Counters, maximum gauges and cumulative timers of a component.
+
+    Updates and snapshots share a lock, as a component may be updated by
+    its worker thread while the registry aggregates it from another one.
+    """
+
+    def __init__(self, name, registry=None):
+        """Create a new set of statistics, added to the `registry` (if
+        any) in order to be aggregated.
+        """
+        self.name = name
+        self.counters = collections.Counter()
+        self.gauges = {}
+        # Cumulative seconds and calls count for each timed stage.
+        self.seconds = collections.Counter()
+        self.calls = collections.Counter()
+        self._lock = threading.Lock()
+        self._registry = registry
+        if registry:
+            registry.add(self)
+
+    def count(self, key, value=1):
+        """Increase the `key` counter."""
+        with self._lock:
+            self.counters[key] += value
+
+    def maximum(self, key, value):
+        """Keep the maximum ever seen `value` for the `key` gauge."""
+        with self._lock:
+            if value > self.gauges.get(key, value - 1):
+                self.gauges[key] = value
+
+    def add_time(self, key, start):
+        """Add the time passed since `start` to the `key` timer."""
+        end = utils.timer()
+        with self._lock:
+            self.seconds[key] += end - start
+            self.calls[key] += 1
+        if self._registry and self._registry.tracing:
+            self._registry.add_event(self.name, key, start, end)
+
+    def merge(self, stats):
+        """Add up the values of other `stats`."""
+        values = stats.snapshot()
+        with self._lock:
+            self.counters.update(values["counters"])
+            for key, timer in values["timers"].items():
+                self.seconds[key] += timer["seconds"]
+                self.calls[key] += timer["calls"]
+        for key, value in values["gauges"].items():
+            self.maximum(key, value)
+
+    def snapshot(self):
+        """Returns a plain dictionary with the current values."""
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "gauges": dict(self.gauges),
+                "timers": {
+                    key: {"seconds": self.seconds[key],
+                          "calls": self.calls[key]}
+                    for key in self.seconds
+                },
+            }
+
+    def retire(self):
+        """Hand the values over to the registry totals; the component is
+        not used anymore.
+        """
+        if self._registry:
+            self._registry.retire(self)
+
+
+class Registry(object):
+
+    """Aggregate the statistics of every component, grouped by name."""
+
+    def __init__(self):
+        self._live = weakref.WeakSet()
+        self._retired = {}    # totals of the no longer used components
+        self._lock = threading.Lock()
+        self.tracing = False
+        self._events = []
+
+    def add(self, stats):
+        with self._lock:
+            self._live.add(stats)
+
+    def retire(self, stats):
+        with self._lock:
+            self._live.discard(stats)
+            self._merge(self._retired, stats)
+
+    @staticmethod
+    def _merge(totals, stats):
+        total = totals.get(stats.name)
+        if not total:
+            total = totals[stats.name] = Stats(stats.name)
+        total.merge(stats)
+
+    def snapshot(self):
+        """Returns the aggregated statistics of all the components, live
+        and retired.
+        """
+        with self._lock:
+            totals = {}
+            for stats in self._retired.values():
+                self._merge(totals, stats)
+            for stats in list(self._live):
+                self._merge(totals, stats)
+            return {name: stats.snapshot() for name, stats in totals.items()}
+
+    def reset(self):
+        with self._lock:
+            self._retired.clear()
+            del self._events[:]
+
+    def start_trace(self):
+        """Start recording a trace event for every timed stage."""
+        self.tracing = True
+
+    def stop_trace(self):
+        self.tracing = False
+
+    def add_event(self, name, key, start, end):
+        # Complete events, as understood by the Chrome trace viewer.
+        self._events.append({
+            "name": key,
+            "cat": name,
+            "ph": "X",
+            "ts": start * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": threading.current_thread().ident,
+        })
+
+    def export_trace(self, stream):
+        """Write the recorded trace events as JSON into `stream`, ready to
+        be loaded by a trace viewer (chrome://tracing or Perfetto).
+        """
+        json.dump({"traceEvents": list(self._events)}, stream)
+
+
+# Default registry used by all the components.
+REGISTRY = Registry()
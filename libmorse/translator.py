@@ -3,89 +3,180 @@
 
 import Queue
 import abc
+import bisect
 import collections
-import copy
-import functools
 import itertools
 import threading
 
 import six
-from scipy.cluster.vq import kmeans, vq, whiten
 
-from libmorse import converter, exceptions, settings
+from libmorse import (
+    converter,
+    exceptions,
+    prefilter,
+    settings,
+    stats,
+    utils,
+)
 from libmorse.utils import Logger
 
 
+np = utils.LazyModule("numpy")
+# Clustering is needed only when decoding, so SciPy is loaded on first use.
+cluster = utils.LazyModule("scipy.cluster.vq")
+
+
 # Different states into which the translator may run across.
 class STATE:
     LONG_PAUSE = "<long pause>"
 
 
-@six.add_metaclass(abc.ABCMeta)
-class BaseTranslator(Logger):
+class Batch(object):
 
-    """Base class for any kind of translator"""
+    """Several items queued at once, but processed one by one."""
 
-    CLOSE_SENTINEL = None
-    SIG_MINLEN, SIG_MAXLEN = settings.SIG_RANGE
-    SIL_MINLEN, SIL_MAXLEN = settings.SIL_RANGE
-    FACTORS = settings.RATIO_HANDICAP
+    __slots__ = ("items",)
 
-    handicapify = (lambda vec, handi_factor=None:
-                   [item * handi_factor for item in vec])
-    sig_handicap, sil_handicap = map(
-        lambda factor, func=handicapify: functools.partial(
-            func,
-            handi_factor=factor
-        ),
-        [FACTORS.SIGNALS, FACTORS.SILENCES]
-    )
-    CONFIG = {
+    def __init__(self, items):
+        self.items = items
+
+
+class Ingested(object):
+
+    """Queued item (or batch) along with the moment it was put."""
+
+    __slots__ = ("item", "time")
+
+    def __init__(self, item, time):
+        self.item = item
+        self.time = time
+
+
+# Tunable parameters of the translators, along with their defaults: active
+# ranges of signals and silences, minimal and maximal delta between means (in
+# units), noise ratio, k-means maximum iterations and the handicaps of the
+# preset signals and silences ratios (derived from the ranges when None).
+PARAMS = collections.OrderedDict([
+    ("sig_range", settings.SIG_RANGE),
+    ("sil_range", settings.SIL_RANGE),
+    ("mean_min_diff", settings.MEAN_MIN_DIFF),
+    ("mean_max_diff", settings.MEAN_MAX_DIFF),
+    ("noise_ratio", settings.NOISE_RATIO),
+    ("cluster_iter", settings.CLUSTER_ITER),
+    ("ratio_handicap", None),
+])
+
+
+def get_params(kwargs):
+    """Pop the tunable parameters out of `kwargs` and return all of them,
+    the missing ones with their defaults.
+    """
+    params = collections.OrderedDict()
+    for key, default in PARAMS.items():
+        value = kwargs.pop(key, default)
+        if isinstance(value, list):
+            # Pairs loaded from JSON.
+            value = tuple(value)
+        params[key] = value
+    if params["ratio_handicap"] is None:
+        params["ratio_handicap"] = (
+            settings.get_ratio_handicap(params["sig_range"]),
+            settings.get_ratio_handicap(params["sil_range"]),
+        )
+    return params
+
+
+def make_config(params):
+    """Returns the signals and silences analysis configuration given the
+    tunable `params`.
+    """
+    sig_handicap, sil_handicap = params["ratio_handicap"]
+    return {
         "signals": {
             "type": "signals",
             "means": 2,
-            "mean_min_diff": settings.MEAN_MIN_DIFF,
-            "mean_max_diff": settings.MEAN_MAX_DIFF,
-            "min_length": SIG_MINLEN,
-            # Tuples of (sum_of_ratios, ratios_count).
+            "mean_min_diff": params["mean_min_diff"],
+            "mean_max_diff": params["mean_max_diff"],
+            "min_length": params["sig_range"][0],
+            # Lists of [sum_of_ratios, ratios_count].
             "ratios": {
-                converter.DOT: sig_handicap([1.0, 1]),
-                converter.DASH: sig_handicap([3.0, 1]),
+                converter.DOT: [1.0 * sig_handicap, sig_handicap],
+                converter.DASH: [3.0 * sig_handicap, sig_handicap],
             },
             "offset": 0,
         },
         "silences": {
             "type": "silences",
             "means": 3,
-            "mean_min_diff": settings.MEAN_MIN_DIFF,
-            "mean_max_diff": settings.MEAN_MAX_DIFF,
-            "min_length": SIL_MINLEN,
-            # Tuples of (sum_of_ratios, ratios_count).
+            "mean_min_diff": params["mean_min_diff"],
+            "mean_max_diff": params["mean_max_diff"],
+            "min_length": params["sil_range"][0],
+            # Lists of [sum_of_ratios, ratios_count].
             "ratios": {
-                converter.INTRA_GAP: sil_handicap([1.0, 1]),
-                converter.SHORT_GAP: sil_handicap([3.0, 1]),
-                converter.MEDIUM_GAP: sil_handicap([7.0, 1]),
+                converter.INTRA_GAP: [1.0 * sil_handicap, sil_handicap],
+                converter.SHORT_GAP: [3.0 * sil_handicap, sil_handicap],
+                converter.MEDIUM_GAP: [7.0 * sil_handicap, sil_handicap],
             },
             "offset": 0,
         },
     }
 
+
+# Result with its provenance: the index range of the source items which
+# produced it, the moment the last of them was put and the moment the result
+# was made available.
+Stamp = collections.namedtuple("Stamp", "result first last ingest emit")
+
+
+@six.add_metaclass(abc.ABCMeta)
+class BaseTranslator(Logger):
+
+    """Base class for any kind of translator"""
+
+    CLOSE_SENTINEL = None
+    # Keyword arguments handled by the translators only (not passed further
+    # to the converters).
+    OPTIONS = ("provenance", "threaded") + tuple(PARAMS)
+    # Defaults only, every instance has its own tunable parameters.
+    SIG_MINLEN, SIG_MAXLEN = settings.SIG_RANGE
+    SIL_MINLEN, SIL_MAXLEN = settings.SIL_RANGE
+    FACTORS = settings.RATIO_HANDICAP
+    CONFIG = make_config(get_params({}))
+
     def __init__(self, *args, **kwargs):
+        # Stamp every result with its provenance.
+        self.provenance = kwargs.pop("provenance", False)
+        # Without a worker thread, the items are processed right away by the
+        # thread putting them.
+        self.threaded = kwargs.pop("threaded", True)
+        self.params = get_params(kwargs)
         super(BaseTranslator, self).__init__(__name__, *args, **kwargs)
 
+        self.SIG_MINLEN, self.SIG_MAXLEN = self.params["sig_range"]
+        self.SIL_MINLEN, self.SIL_MAXLEN = self.params["sil_range"]
+        self.noise_ratio = self.params["noise_ratio"]
+        self.cluster_iter = self.params["cluster_iter"]
+
+        self._item_index = -1    # index of the last processed item
+        # Source items range covered by the last stamped results.
+        self._stamped_first = self._stamped_index = -1
+
         self._input_queue = Queue.Queue()
         self._output_queue = Queue.Queue()
         self._queue_processor = None    # parallel thread handling processing
         self._closed = threading.Event()
+        # Always-on counters and timers, aggregated by the default registry.
+        self._stats = stats.Stats(type(self).__name__, stats.REGISTRY)
 
-        self.config = copy.deepcopy(self.CONFIG)
+        self.config = make_config(self.params)
         self._unit = None    # should be initialized as deque (below)
         self.unit = settings.UNIT    # average used unit length
 
         # Last set state of the last analysed signals/silences.
         self.last_state = None  # used to notify the outsides (changeable)
 
-        self._start()    # start the item processor
+        if self.threaded:
+            self._start()    # start the item processor
 
     @property
     def unit(self):
@@ -107,6 +198,11 @@ class BaseTranslator(Logger):
         if self._unit:
             self._unit.clear()
 
+    @classmethod
+    def _get_converter_kwargs(cls, kwargs):
+        return {key: value for key, value in kwargs.items()
+                if key not in cls.OPTIONS}
+
     @staticmethod
     def _calc_ratios(ratios):
         normed_ratios = {}
@@ -119,31 +215,70 @@ class BaseTranslator(Logger):
         del self._input_queue
         del self._output_queue
         del self.unit
+        self._stats.retire()
 
     @abc.abstractmethod
     def _process(self, item):
         """Returns a list of processed items as results."""
 
+    def _stamp(self, result, ingest):
+        if self._stamped_index < self._item_index:
+            # Results produced by the same item share the same source range.
+            self._stamped_first = self._stamped_index + 1
+            self._stamped_index = self._item_index
+        return Stamp(result, self._stamped_first, self._item_index, ingest,
+                     utils.timer())
+
+    def _get_results(self, item, ingest=None):
+        """Process a single `item` and return its rightful results."""
+        self._item_index += 1
+        self._stats.count("items")
+        start = utils.timer()
+        rightful = []
+        try:
+            results = self._process(item)
+        except exceptions.TranslatorMorseError as exc:
+            self._stats.count("errors")
+            self.log.error(exc)
+        else:
+            if not isinstance(results, (tuple, list, set)):
+                results = [results]
+            for result in results:
+                if result != self.CLOSE_SENTINEL:
+                    if self.provenance:
+                        result = self._stamp(result, ingest)
+                    rightful.append(result)
+            if rightful:
+                self._stats.count("results", len(rightful))
+        self._stats.add_time("process", start)
+        return rightful
+
+    def _process_item(self, item, ingest=None):
+        for result in self._get_results(item, ingest=ingest):
+            self._output_queue.put(result)
+
+    def _handle(self, item):
+        ingest = None
+        if isinstance(item, Ingested):
+            ingest, item = item.time, item.item
+        batch = [item]
+        if isinstance(item, Batch):
+            self._stats.count("batches")
+            batch = item.items
+        for entry in batch:
+            self._process_item(entry, ingest=ingest)
+
     def _run(self):
         while True:
             item = self._input_queue.get()
+            self._stats.maximum("input_queue", self._input_queue.qsize() + 1)
             if item == self.CLOSE_SENTINEL:
                 self._input_queue.task_done()
                 self._free()
                 break
 
             if not self.closed:
-                try:
-                    results = self._process(item)
-                except exceptions.TranslatorMorseError as exc:
-                    self.log.error(exc)
-                else:
-                    if not isinstance(results, (tuple, list, set)):
-                        results = [results]
-                    for result in results:
-                        if result != self.CLOSE_SENTINEL:
-                            # Add rightful results only.
-                            self._output_queue.put(result)
+                self._handle(item)
 
             self._input_queue.task_done()
 
@@ -165,11 +300,46 @@ class BaseTranslator(Logger):
             raise exceptions.TranslatorMorseError(
                 "put operation on closed translator"
             )
+        if self.provenance and item != self.CLOSE_SENTINEL:
+            item = Ingested(item, utils.timer())
+        if not self.threaded:
+            if item == self.CLOSE_SENTINEL:
+                self._closed.set()
+                self._free()
+            else:
+                self._handle(item)
+            return
         try:
             self._input_queue.put(item, **kwargs)
         except Queue.Full:
             raise exceptions.TranslatorMorseError("full queue")
 
+    def put_batch(self, items, **kwargs):
+        """Add several items at once to the processing queue.
+
+        They are processed in order, exactly like when put one by one.
+        """
+        self.put(Batch(items), **kwargs)
+
+    def process(self, items):
+        """Process the `items` right away in the calling thread and return
+        their results, without any queue.
+
+        Available to the translators created with `threaded=False` only.
+        """
+        if self.threaded:
+            raise exceptions.TranslatorMorseError(
+                "in place processing needs an unthreaded translator")
+        if self.closed:
+            raise exceptions.TranslatorMorseError(
+                "process operation on closed translator")
+        ingest = utils.timer() if self.provenance else None
+        self._stats.count("batches")
+        results = []
+        for item in items:
+            results.extend(self._get_results(item, ingest=ingest))
+        return results
+
     def get(self, **kwargs):
         """Retrieve and return from the processed items a new item."""
         if self.closed:
@@ -183,6 +353,14 @@ class BaseTranslator(Logger):
         self._output_queue.task_done()
         return result
 
+    def stats(self):
+        """Returns a snapshot of the counters, maximum gauges and cumulative
+        timers (seconds and calls) of the translator and its converter.
+        """
+        snapshot = self._stats.snapshot()
+        snapshot["converter"] = self._converter.stats()
+        return snapshot
+
     @property
     def closed(self):
         """Returns True if the translator is closed."""
@@ -192,11 +370,27 @@ class BaseTranslator(Logger):
         """Close and wait the translator to finish and free resources."""
         self.put(self.CLOSE_SENTINEL)
         self._closed.set()
-        self._queue_processor.join()
+        if self._queue_processor:
+            self._queue_processor.join()
+
+    def wait(self, timeout=None):
+        """Block until all the items in the queue are processed.
 
-    def wait(self):
-        """Block until all the items in the queue are processed."""
-        self._input_queue.join()
+        Returns False if they weren't processed within `timeout` seconds
+        (if given).
+        """
+        if timeout is None:
+            self._input_queue.join()
+            return True
+        queue = self._input_queue
+        deadline = utils.timer() + timeout
+        with queue.all_tasks_done:
+            while queue.unfinished_tasks:
+                remaining = deadline - utils.timer()
+                if remaining <= 0:
+                    return False
+                queue.all_tasks_done.wait(remaining)
+        return True
 
 
 class AlphabetTranslator(BaseTranslator):
@@ -204,9 +398,12 @@ class AlphabetTranslator(BaseTranslator):
     """Alphabet to morse translator."""
 
     def __init__(self, *args, **kwargs):
+        # Produce signed durations instead of (state, duration) items.
+        self.compact = kwargs.pop("compact", False)
         super(AlphabetTranslator, self).__init__(*args, **kwargs)
 
-        self._converter = converter.AlphabetConverter(*args, **kwargs)
+        self._converter = converter.AlphabetConverter(
+            *args, **self._get_converter_kwargs(kwargs))
         # Use predefined ratios when creating timings.
         self._ratios = {}
         self.update_ratios(self.config)
@@ -220,25 +417,24 @@ class AlphabetTranslator(BaseTranslator):
             normed_ratios = self._calc_ratios(ratios)
             self._ratios.update(normed_ratios)
 
-    def _process(self, item):
-        # Convert every new character into a morse letter.
-        letters = self._converter.add([item])
-        # Translate the obtained morse code into timed signals.
+    @staticmethod
+    def get_timings(letters, ratios, unit):
+        """Translate morse `letters` into timed signals (signed durations)
+        given the symbols `ratios` and the `unit` length.
+        """
         signals = []
-        unit = self.unit
 
         for letter in letters:
             if letter in (converter.SHORT_GAP, converter.MEDIUM_GAP):
                 # Create the silence for the gap between characters or words.
-                silence = (False, self._ratios[letter] * unit)
+                silence = -ratios[letter] * unit
                 signals.append(silence)
                 continue
 
             # We have a letter; properly add all the successive signals and
-            # silences.
-            silence = (False, self._ratios[converter.INTRA_GAP] * unit)
-            extend = [((True, self._ratios[symbol] * unit), silence)
-                      for symbol in letter]
+            # silences (as signed durations).
+            silence = -ratios[converter.INTRA_GAP] * unit
+            extend = [(ratios[symbol] * unit, silence) for symbol in letter]
             extend = [signal for pair in extend for signal in pair]
             # There is no intra-gap at the end of the letter; short gap
             # follows explicitly.
@@ -247,6 +443,16 @@ class AlphabetTranslator(BaseTranslator):
 
         return signals
 
+    def _process(self, item):
+        # Convert every new character into a morse letter.
+        letters = self._converter.add([item])
+        # Translate the obtained morse code into timed signals.
+        signals = self.get_timings(letters, self._ratios, self.unit)
+
+        if not self.compact:
+            signals = [utils.unsigned(signal) for signal in signals]
+        return signals
+
     def _free(self):
         self._converter.free()
 
@@ -257,26 +463,43 @@ class MorseTranslator(BaseTranslator):
 
     """Morse to alphabet translator."""
 
+    # How many signed durations are pre-filtered at once, and while the unit
+    # isn't learned yet (so the noise is filtered as soon as it is).
+    BATCH_CHUNK = 4096
+    LEARN_CHUNK = 64
+
     def __init__(self, *args, **kwargs):
+        # Remove noise and merge items in bulk when fed with batches.
+        use_prefilter = kwargs.pop("prefilter", False)
+        # Timestamps of the edges wrap around this value (if any) and are
+        # converted into milliseconds by the scale.
+        self.clock_wrap = kwargs.pop("clock_wrap", None)
+        self.clock_scale = kwargs.pop("clock_scale", 1.0)
         super(MorseTranslator, self).__init__(*args, **kwargs)
 
+        self._prefilter = (prefilter.PreFilter(noise_ratio=self.noise_ratio,
+                                               keep_last=True)
+                           if use_prefilter else None)
+
         # Actively analysed signals.
         self._signals = collections.deque(maxlen=self.SIG_MAXLEN)
         # Actively analysed silences; the same range may work.
         self._silences = collections.deque(maxlen=self.SIL_MAXLEN)
-        # First and last provided items.
+        # First and last provided items (as signed durations).
         self._begin = None
-        self.last_item = None
-        # Actual morse code, divided and combined.
-        self._morse_signals = []
-        self._morse_silences = []
-        self._morse_pick = itertools.cycle([
-            self._morse_signals, self._morse_silences
-        ])
-        self._morse_selected = None
+        self._last = None
+        # State and timestamp of the last edge (start of the open run).
+        self._edge = None
+        # Actual morse code, divided and combined. The divided symbols are
+        # taken in turns (signals first, unless starting with a silence).
+        self._morse_signals = collections.deque()
+        self._morse_silences = collections.deque()
+        self._morse_queues = (self._morse_signals, self._morse_silences)
+        self._morse_turn = 0
         self._morse_code = []
         # Code converter.
-        self._converter = converter.MorseConverter(*args, **kwargs)
+        self._converter = converter.MorseConverter(
+            *args, **self._get_converter_kwargs(kwargs))
         # Items saturation.
         self._skip_type = None
 
@@ -286,47 +509,45 @@ class MorseTranslator(BaseTranslator):
     def _free(self):
         self._signals.clear()
         self._silences.clear()
-        self._morse_signals = []
-        self._morse_silences = []
-        del self._morse_pick
-        self._morse_selected = None
-        self._morse_code = []
+        self._morse_signals.clear()
+        self._morse_silences.clear()
+        self._morse_turn = 0
+        del self._morse_code[:]
         self._converter.free()
 
         super(MorseTranslator, self)._free()
 
-    def _get_signal_classes(self, means, ratios):
-        """Classify the means into signal types."""
-        classes = []
-        unit = min(means)    # good unit for reference
-        ratios_items = ratios.items()
-
-        for mean in means:
-            ratio = mean / unit
-            # Find closest defined ratio.
-            best_class = None
-            min_delta = abs(ratios_items[0][1] - ratio) + 1
-            for entity, entity_ratio in ratios_items:
-                delta = abs(ratio - entity_ratio)
-                if delta < min_delta:
-                    min_delta = delta
-                    best_class = entity
-            classes.append(best_class)
-
-        return classes
+    @staticmethod
+    def _get_signal_classes(mean_ratios, ratios):
+        """Classify the means (as ratios of unit) into signal types,
+        returning the symbols indexed like the means.
+        """
+        symbols = sorted(ratios, key=ratios.get)
+        values = [ratios[symbol] for symbol in symbols]
+        # The closest defined ratio is found between the midpoints of the
+        # sorted ones.
+        thresholds = [(low + high) / 2 for low, high in zip(values,
+                                                            values[1:])]
+        return [symbols[bisect.bisect_left(thresholds, ratio)]
+                for ratio in mean_ratios]
 
     def _stable_kmeans(self, container, clusters):
+        container = np.asarray(container, dtype=float)
+        if not container.std():
+            # Same lengths only, there's nothing to cluster (nor whiten).
+            raise exceptions.TranslatorMorseError(
+                "no variation in lengths to cluster")
         # Normalize the elements to be clustered.
         factor = container[-1]
-        container = whiten(container)
+        container = cluster.whiten(container)
         factor /= container[-1]
         # Get the stable means.
-        count = settings.CLUSTER_ITER
+        count = self.cluster_iter
 
         while True:
-            means = kmeans(container, clusters)[0]
+            means = cluster.kmeans(container, clusters)[0]
             # Obtain and return the labels along with the means.
-            labels = vq(container, means)[0]
+            labels = cluster.vq(container, means)[0]
             # Check for empty clusters.
             labels_set = set(labels)
             clusters_set = set(range(clusters))
@@ -341,18 +562,19 @@ class MorseTranslator(BaseTranslator):
                         "k-means maximum number of iterations reached")
                 else:
                     count -= 1
+            self._stats.count("kmeans_retries")
 
         # Return the original means along the labels distribution.
         return means * factor, labels
 
-    def _update_ratios(self, conf_ratios, means):
+    def _update_ratios(self, conf_ratios, sorted_means):
         def sort_ratios(symbol):
             metric = conf_ratios[symbol]
             return metric[0] / metric[1]
 
         symbols = sorted(conf_ratios, key=sort_ratios)
         unit = self.unit
-        new_ratios = [mean / unit for mean in sorted(means)]
+        new_ratios = [mean / unit for mean in sorted_means]
 
         for idx, symbol in enumerate(symbols):
             symbol_ratio = conf_ratios[symbol]
@@ -364,38 +586,49 @@ class MorseTranslator(BaseTranslator):
         signals or silences.
         """
         # Get a first classification of the signals.
+        start = utils.timer()
         means, distribution = self._stable_kmeans(container, config["means"])
-        unit = min(means)
+        self._stats.add_time("kmeans", start)
+        # A few means only, plain floats are cheaper than arrays here.
+        means = means.tolist()
+        sorted_means = sorted(means)
+        unit = sorted_means[0]
+        # Every two means differ by at least the smallest gap between the
+        # sorted ones and by at most their whole span.
+        gap = min(high - low for low, high in zip(sorted_means,
+                                                  sorted_means[1:]))
         lower_bound = config["mean_min_diff"] * unit
         upper_bound = config["mean_max_diff"] * unit
-        for combi in itertools.combinations(means, 2):
-            delta = abs(combi[0] - combi[1])
-            if not lower_bound < delta < upper_bound:
-                # Insufficient or incoherent signals.
-                return None
+        if not (gap > lower_bound and
+                sorted_means[-1] - unit < upper_bound):
+            # Insufficient or incoherent signals.
+            self._stats.count("analyses_rejected")
+            return None
 
         # If we got here, it means that we have a good approved unit as the
         # minimum centroid.
         self._unit.append(unit)
         # Also converge ratios as well.
         conf_ratios = config["ratios"]
-        self._update_ratios(conf_ratios, means)
+        self._update_ratios(conf_ratios, sorted_means)
 
         # We've got a correct distribution. Take each remaining unprocessed
         # signal and normalize its classification.
         normed_ratios = self._calc_ratios(conf_ratios)
-        signal_classes = self._get_signal_classes(means, normed_ratios)
-        signals = []
-        for signal_index in distribution[config["offset"]:]:
-            signals.append(signal_classes[signal_index])
+        signal_classes = self._get_signal_classes(
+            [mean / unit for mean in means], normed_ratios)
+        signals = [signal_classes[index]
+                   for index in distribution[config["offset"]:].tolist()]
         config["offset"] = len(distribution)
 
         return signals
 
     def _parse_morse_code(self):
         """Transform obtained morse code into alphabet."""
+        self._stats.count("symbols", len(self._morse_code))
         text = self._converter.add(self._morse_code)
-        self._morse_code = []
+        # The same buffer is reused for the next symbols.
+        del self._morse_code[:]
         if text is None:
             return None
         return list(text)
@@ -411,7 +644,7 @@ class MorseTranslator(BaseTranslator):
         if not unit:
             return False
 
-        stype, slen = self.last_item
+        stype, slen = utils.unsigned(self._last)
         selected = "signals" if stype else "silences"
         config = self.config[selected]
         ratios = config["ratios"]
@@ -431,15 +664,15 @@ class MorseTranslator(BaseTranslator):
             return True
         return False
 
-    def _correct_item(self, item, save_state=True):
-        """Save some states regarding the given signal/silence,
-        while normalizing it to an adequate length.
+    def _correct_item(self, value, save_state=True):
+        """Save some states regarding the given signal/silence (signed
+        duration), while normalizing it to an adequate length.
         """
         unit = self.unit
         if not unit:
-            return item
+            return value
 
-        stype, slen = item
+        stype, slen = utils.unsigned(value)
         state = None    # nothing special
         if stype:
             # Analysing a signal.
@@ -455,58 +688,81 @@ class MorseTranslator(BaseTranslator):
         limit = conf["mean_min_diff"] * unit
         if delta > limit:
             slen = max_length
+            self._stats.count("long_items")
             if not stype:
                 state = STATE.LONG_PAUSE
 
         if state and save_state:
             self.last_state = state
-        return stype, slen
+        return slen if stype else -slen
 
     def _correct_container(self, container, stype):
         """Normalize the maximum length of each item found in `container`."""
+        sign = 1.0 if stype else -1.0
         for idx, slen in enumerate(container):
-            item = (stype, slen)
-            item = self._correct_item(item, save_state=False)
-            container[idx] = item[1]
+            value = self._correct_item(sign * slen, save_state=False)
+            container[idx] = abs(value)
+
+    @property
+    def last_item(self):
+        """The last (state, duration) item, still open for merging."""
+        if self._last is None:
+            return None
+        return utils.unsigned(self._last)
+
+    @last_item.setter
+    def last_item(self, item):
+        if item is not None and isinstance(item, (tuple, list)):
+            item = utils.signed(item)
+        self._last = item
 
     def _process(self, item):
+        # Work with signed durations only: positive for signals and negative
+        # for silences.
+        value = (utils.signed(item) if isinstance(item, (tuple, list))
+                 else item)
+        state = utils.is_signal(value)
         # Remove noise.
         unit = self.unit
-        if unit and item[1] < settings.NOISE_RATIO * unit:
+        if unit and abs(value) < self.noise_ratio * unit:
+            self._stats.count("noise_dropped")
             return self.CLOSE_SENTINEL
         # Check if skipped.
-        if self._skip_type is not None and self._skip_type == item[0]:
+        if self._skip_type is not None and self._skip_type == state:
+            self._stats.count("skipped")
             return self.CLOSE_SENTINEL
         self._skip_type = None
 
         # Decide with what kind of item we begin first (signal/silence).
-        if not self._begin:
+        if self._begin is None:
             # Used for knowing how to bounce between the signals.
-            self._begin = item
-            if not self._begin[0]:
+            self._begin = value
+            if not state:
                 # Starting with a silence first.
-                next(self._morse_pick)
+                self._morse_turn = 1
 
         # Take the last saved item and join with the new one if it's from the
         # same kind, otherwise just add the last one and mark a new last item
         # out of this new one.
         selected = None
         added_item = False
-        if self.last_item:
+        if self._last is not None:
             # We have a last item available.
             # Now check if is from the same family and if yes, then merge the
             # two of them together.
             add_last = False
+            last_state = utils.is_signal(self._last)
 
-            if item[0] == self.last_item[0]:
-                # Join durations and update the last item.
-                item = (item[0], item[1] + self.last_item[1])
-                self.last_item = item
+            if state == last_state:
+                # Join durations (same sign) and update the last item.
+                self._stats.count("merged")
+                value += self._last
+                self._last = value
                 add_last = self._check_add_last()
 
-            if item[0] != self.last_item[0] or add_last:
+            if state != last_state or add_last:
                 # Decide active container depending on the signal type.
-                if self.last_item[0]:
+                if last_state:
                     container = self._signals
                     selected = "signals"
                 else:
@@ -519,27 +775,28 @@ class MorseTranslator(BaseTranslator):
                 # queue fullness.
                 if len(container) >= container.maxlen:
                     if config["offset"] <= 0:
+                        self._stats.count("missing_variation")
                         raise exceptions.TranslatorMorseError(
                             "missing {} variation".format(selected)
                         )
                     config["offset"] -= 1
                 # Add a new corrected signal (duration only).
-                last = self._correct_item(self.last_item)
-                container.append(last[1])
+                last = self._correct_item(self._last)
+                container.append(abs(last))
                 added_item = True
-                self.last_item = item
+                self._last = value
                 if add_last:
                     # We've just added the last item instead of keeping it,
                     # therefore we don't have a last item anymore.
-                    self.last_item = None
+                    self._last = None
                     # And also, we'll not accept the same signal/silence
                     # anymore, until something different will come.
-                    self._skip_type = item[0]
+                    self._skip_type = state
 
         else:
             # There's no last item available, mark the current one as the
             # last one.
-            self.last_item = item
+            self._last = value
             # Nothing will happen, because we just have empty queues.
 
         # Re-process the new state of the active queues and try to give a
@@ -555,24 +812,167 @@ class MorseTranslator(BaseTranslator):
             if len(container) >= config["min_length"] and must_analyse:
                 stype = config["type"] == "signals"
                 self._correct_container(container, stype)
+                start = utils.timer()
                 signals = self._analyse(container, config)
+                self._stats.add_time("analyse", start)
+                self._stats.count("analyses")
                 collection.extend(signals or [])
 
-        # Combine obtained morse signals and silences.
-        news = False
-        while True:
-            self._morse_selected = next(self._morse_pick)
-            if not self._morse_selected:
-                next(self._morse_pick)
-                break
-            symbol = self._morse_selected.pop(0)
-            self._morse_code.append(symbol)
-            news = True
-
         # Parse the actual morse code and send the result for the output
         # queue if applicable.
+        news = self._combine_morse()
         return self._parse_morse_code() if news else self.CLOSE_SENTINEL
 
+    def _combine_morse(self):
+        """Move the obtained morse signals and silences, in turns, into the
+        morse code and return how many were moved.
+
+        Stops at the first empty turn, which is waited for next time.
+        """
+        queues, turn = self._morse_queues, self._morse_turn
+        code = self._morse_code
+        size = len(code)
+        while queues[turn]:
+            code.append(queues[turn].popleft())
+            turn = 1 - turn
+        self._morse_turn = turn
+        return len(code) - size
+
+    def _filter(self, values, final=False):
+        """Pre-filter the `values` chunk, counting the dropped and merged
+        items.
+        """
+        dropped = self._prefilter.dropped
+        merged = self._prefilter.merged
+        # The unit is the current one, as learned so far.
+        values = self._prefilter.feed(values, unit=self.unit, final=final)
+        self._stats.count("prefilter_dropped",
+                          self._prefilter.dropped - dropped)
+        self._stats.count("prefilter_merged",
+                          self._prefilter.merged - merged)
+        return values
+
+    def _iter_signed(self, values):
+        """Lazily yield native floats out of the `values` array."""
+        start = 0
+        while start < len(values):
+            chunk = self.BATCH_CHUNK if self.unit else self.LEARN_CHUNK
+            values_chunk = values[start:start + chunk]
+            start += chunk
+            if self._prefilter:
+                # The still open run is held back for the next values.
+                values_chunk = self._filter(values_chunk)
+            for value in values_chunk.tolist():
+                yield value
+
+    def _iter_pending(self):
+        """Lazily yield the open run held back by the pre-filter."""
+        for value in self._filter([], final=True).tolist():
+            yield value
+
+    def _put_pending(self, **kwargs):
+        # Queues the release of the open run, behind the values fed so far.
+        if self._prefilter and not self.closed:
+            super(MorseTranslator, self).put(Batch(self._iter_pending()),
+                                             **kwargs)
+
+    def put(self, item, **kwargs):
+        # Anything but more signed durations ends the pre-filtered run.
+        self._put_pending(**kwargs)
+        super(MorseTranslator, self).put(item, **kwargs)
+
+    def wait(self, timeout=None):
+        self._put_pending()
+        return super(MorseTranslator, self).wait(timeout=timeout)
+
+    def process(self, items):
+        if self._prefilter:
+            items = itertools.chain(self._iter_pending(), items)
+        return super(MorseTranslator, self).process(items)
+
+    def process_signed(self, values):
+        """Process several signed durations right away and return their
+        results (see `process`).
+        """
+        return super(MorseTranslator, self).process(
+            self._iter_signed(np.array(values, dtype=float)))
+
+    def put_signed(self, values, **kwargs):
+        """Add several timed signals as signed durations (positive for
+        signals and negative for silences) to the processing queue.
+
+        Any sequence of numbers is accepted, like `array.array("d")` or
+        numpy arrays; they are copied once into a compact buffer, so the
+        source (a memory-mapped recording for example) can be released
+        right after.
+        """
+        values = np.array(values, dtype=float)
+        super(MorseTranslator, self).put(Batch(self._iter_signed(values)),
+                                         **kwargs)
+
+    def put_arrays(self, states, durations, **kwargs):
+        """Add the arrays of states and durations of several timed signals
+        (as obtained from `libmorse.get_mor_arrays`) to the processing queue.
+        """
+        self.put_signed(utils.to_signed(states, durations), **kwargs)
+
+    def _get_runs(self, states, timestamps):
+        """Returns the signed durations of the runs completed by the new
+        edges, which start the next runs.
+        """
+        states = np.asarray(states, dtype=bool).ravel()
+        timestamps = np.asarray(timestamps).ravel()
+        if states.size != timestamps.size:
+            raise exceptions.TranslatorMorseError(
+                "edges states and timestamps differ in size")
+        if not states.size:
+            return np.empty(0)
+        # Integer clocks keep their precision while differentiated.
+        dtype = np.int64 if timestamps.dtype.kind in "iu" else float
+        timestamps = timestamps.astype(dtype)
+
+        if self._edge is None:
+            # Nothing is known before the very first edge.
+            self._edge = (states[0], timestamps[0])
+        last_state, last_time = self._edge
+        run_states = np.concatenate(([last_state], states[:-1]))
+        durations = np.diff(np.concatenate(([last_time], timestamps)))
+        if self.clock_wrap:
+            durations %= self.clock_wrap
+        elif (durations < 0).any():
+            raise exceptions.TranslatorMorseError(
+                "edge timestamps going backwards")
+        self._edge = (states[-1], timestamps[-1])
+
+        values = utils.to_signed(run_states, durations * self.clock_scale)
+        # Repeated edges (or the very first one) make empty runs.
+        return values[durations > 0]
+
+    def put_edges(self, states, timestamps, **kwargs):
+        """Add the key-line edges given by the arrays of new `states` and
+        their `timestamps` (monotonic clock readings, as captured) to the
+        processing queue.
+
+        Every edge completes the run started by the previous one, so the
+        last run stays open until the next edge or tick.
+        """
+        values = self._get_runs(states, timestamps)
+        if values.size:
+            self.put_signed(values, **kwargs)
+
+    def put_edge(self, state, timestamp, **kwargs):
+        """Add a single key-line edge to the processing queue."""
+        self.put_edges([state], [timestamp], **kwargs)
+
+    def tick(self, now, **kwargs):
+        """Deliver the open run up to the current time `now` (a reading of
+        the edges clock), like the final silence after the last key-up.
+
+        The line keeps its state, so what comes next is merged with it.
+        """
+        if self._edge is not None:
+            self.put_edges([self._edge[0]], [now], **kwargs)
+
     @property
     def medium_gap_ratio(self):
         conf_ratios = self.config["silences"]["ratios"]
@@ -611,6 +1011,75 @@ def get_translator_results(translator, force_wait=False):
     return renew, all_results
 
 
+def get_ending(translator):
+    """Returns the final silence items which let `translator` emit the last
+    letter (none if not enough signals were fed for learning a unit).
+    """
+    unit = translator.unit
+    if not unit:
+        return []
+    return utils.humanize_mor_code(
+        [], unit=unit, ratio=translator.medium_gap_ratio, split=True
+    )
+
+
+def put_ending(translator):
+    """Put the final silence which lets `translator` emit the last letter.
+
+    Returns False if not enough signals were fed for learning a unit.
+    """
+    ending = get_ending(translator)
+    for item in ending:
+        translator.put(item)
+    return bool(ending)
+
+
+def translate_signed(values, **kwargs):
+    """Translate an entire message of signed durations at once and return
+    the list of results.
+    """
+    translator = MorseTranslator(**kwargs)
+    try:
+        translator.put_signed(values)
+        translator.wait()
+        if not put_ending(translator):
+            translator.log.warning("Not enough fed signals.")
+        _, results = get_translator_results(translator, force_wait=True)
+    finally:
+        translator.close()
+    return results
+
+
+def stream_morse(items, *args, **kwargs):
+    """Translate the `items` as they come (like from a live capture),
+    yielding the lists of results as soon as they are produced.
+
+    When `items` are exhausted, the final silence is added too, so the last
+    letter gets emitted as well.
+    """
+    enable_renewal = kwargs.pop("enable_renewal", settings.ENABLE_RENEWAL)
+    translator = MorseTranslator(*args, **kwargs)
+    try:
+        for item in items:
+            translator.put(item)
+            translator.wait()
+            renew, results = get_translator_results(translator)
+            if results:
+                yield results
+            if enable_renewal and renew:
+                last_item = translator.last_item
+                translator.close()
+                translator = MorseTranslator(*args, **kwargs)
+                translator.last_item = last_item
+
+        put_ending(translator)
+        _, results = get_translator_results(translator, force_wait=True)
+        if results:
+            yield results
+    finally:
+        translator.close()
+
+
 def translate_morse(*args, **kwargs):
     """Translator helper function that handles sessions and corrects
     signals.
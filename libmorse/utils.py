@@ -1,32 +1,151 @@
 """Various frequently used common utilities."""
 
 
+import atexit
+import importlib
+import itertools
 import json
 import logging
+import math
 import os
+import re
+import threading
+import timeit
+
+import six
+from six.moves import queue
 
 from libmorse import exceptions, settings
 
 
+class LazyModule(object):
+
+    """Stand-in for a heavy module, imported on the first attribute
+    access only.
+    """
+
+    def __init__(self, name):
+        self._lazy_name = name
+        self._lazy_module = None
+
+    def __getattr__(self, attr):
+        if self._lazy_module is None:
+            self._lazy_module = importlib.import_module(self._lazy_name)
+        return getattr(self._lazy_module, attr)
+
+
+np = LazyModule("numpy")
+
+
 RES_TEXT = "text"
 RES_JSON = "json"
 
+# Comments found in the MOR code.
+MOR_COMMENT = re.compile(r"#[^\n]*")
+# How many lines are parsed at once while iterating MOR code.
+MOR_CHUNK = 65536
+
+# High resolution timer used for measurements.
+timer = timeit.default_timer
+
+LOG_TEMPLATE = "%(levelname)s - %(name)s - %(asctime)s - %(message)s"
+
+_log_lock = threading.RLock()
+_log_handler = None    # shared by all the loggers, created once
+
+
+class QueueHandler(logging.Handler):
+
+    """Hand the log records over to a queue, without waiting for them to
+    be written.
+    """
+
+    def __init__(self, records):
+        super(QueueHandler, self).__init__()
+        self.records = records
+
+    def emit(self, record):
+        try:
+            # Render the message now, as its arguments may change meanwhile.
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(
+                    record.exc_info)
+                record.exc_info = None
+            self.records.put_nowait(record)
+        except Exception:
+            self.handleError(record)
+
+
+class QueueListener(object):
+
+    """Write the queued log records through `handler` within a background
+    thread.
+    """
+
+    STOP_SENTINEL = None
+
+    def __init__(self, records, handler):
+        self.records = records
+        self.handler = handler
+        self._thread = None
+
+    def _monitor(self):
+        while True:
+            record = self.records.get()
+            if record is self.STOP_SENTINEL:
+                break
+            self.handler.handle(record)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._monitor)
+        self._thread.setDaemon(True)
+        self._thread.start()
+
+    def stop(self):
+        """Write all the pending records and stop the thread."""
+        if self._thread:
+            self.records.put(self.STOP_SENTINEL)
+            self._thread.join()
+            self._thread = None
+        self.handler.flush()
+
+
+def get_log_handler():
+    """Returns the handler shared by all the loggers, created only once.
+
+    With `settings.LOGQUEUE`, the records are written asynchronously.
+    """
+    global _log_handler
+
+    with _log_lock:
+        if not _log_handler:
+            if settings.LOGFILE:
+                handler = logging.FileHandler(settings.LOGFILE)
+            else:
+                handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(LOG_TEMPLATE))
+            if settings.LOGQUEUE:
+                records = queue.Queue()
+                listener = QueueListener(records, handler)
+                listener.start()
+                # Don't lose the pending records when exiting.
+                atexit.register(listener.stop)
+                handler = QueueHandler(records)
+            _log_handler = handler
+        return _log_handler
+
 
 def get_logger(name, use_logging=settings.LOGGING, debug=settings.DEBUG):
     """Obtain a logger object given a name."""
     log = logging.getLogger(name)
-    if settings.LOGFILE:
-        handler = logging.FileHandler(settings.LOGFILE)
-    else:
-        handler = logging.StreamHandler()
-    template = "%(levelname)s - %(name)s - %(asctime)s - %(message)s"
-    formatter = logging.Formatter(template)
-    handler.setFormatter(formatter)
-    if not log.handlers:
-        log.addHandler(handler)
-        level = logging.DEBUG if debug else logging.INFO
-        level = level if use_logging else logging.CRITICAL
-        log.setLevel(level)
+    with _log_lock:
+        if not log.handlers:
+            log.addHandler(get_log_handler())
+            level = logging.DEBUG if debug else logging.INFO
+            level = level if use_logging else logging.CRITICAL
+            log.setLevel(level)
     return log
 
 
@@ -52,27 +171,117 @@ def get_resource(name, resource_type=RES_TEXT):
         "invalid resource type {!r}".format(resource_type))
 
 
+def _get_columns(data):
+    """Returns the count of columns on every line of `data`."""
+    if isinstance(data, six.text_type):
+        data = data.encode("utf-8")
+    chars = np.frombuffer(data, dtype=np.uint8)
+    # Columns start with a printable character following a blank one.
+    blank = chars <= ord(" ")
+    starts = ~blank
+    starts[1:] &= blank[:-1]
+    lines = np.cumsum(chars == ord("\n"))
+    return np.bincount(lines[starts])
+
+
+def parse_mor_code(data):
+    """Parse MOR code `data` into arrays of states and durations."""
+    # Get rid of comments, check that every non-empty line has exactly two
+    # columns, then let the whole text be split at once.
+    if "#" in data:
+        data = MOR_COMMENT.sub("", data)
+    columns = _get_columns(data)
+    if ((columns != 0) & (columns != 2)).any():
+        raise exceptions.ProcessMorseError(
+            "invalid MOR code (expecting state and duration on every line)")
+    try:
+        values = np.array(data.split(), dtype=float).reshape(-1, 2)
+    except ValueError as exc:
+        raise exceptions.ProcessMorseError(
+            "invalid MOR code ({})".format(exc))
+    # Now get the status and time length of the quanta.
+    states, durations = values[:, 0], values[:, 1].copy()
+    if not ((states == 0) | (states == 1)).all():
+        raise exceptions.ProcessMorseError(
+            "invalid MOR code (states other than 0 and 1)")
+    return states.astype(bool), durations
+
+
+def _read_mor_data(name):
+    return (get_resource(name) if isinstance(name, str)
+            else name.read())
+
+
+def get_mor_arrays(name):
+    """Get MOR code given `name` as arrays of states and durations."""
+    return parse_mor_code(_read_mor_data(name))
+
+
+def iter_mor_arrays(stream, chunk=MOR_CHUNK):
+    """Iterate arrays of states and durations out of a MOR code `stream`,
+    parsing at most `chunk` lines at once.
+    """
+    while True:
+        lines = list(itertools.islice(stream, chunk))
+        if not lines:
+            break
+        states, durations = parse_mor_code("".join(lines))
+        if states.size:
+            yield states, durations
+
+
+def iter_mor_code(stream):
+    """Yield (state, duration) items out of a MOR code `stream` as soon as
+    each line is available, without reading ahead.
+    """
+    for line in iter(stream.readline, ""):
+        states, durations = parse_mor_code(line)
+        for item in zip(states.tolist(), durations.tolist()):
+            yield item
+
+
+def write_mor_code(stream, states, durations, precision=3):
+    """Write arrays of states and durations as MOR code into `stream`."""
+    data = np.column_stack((states, durations))
+    np.savetxt(stream, data, fmt=("%d", "%.{}f".format(precision)))
+
+
+def is_signal(value):
+    """Returns True if the signed duration `value` is a signal."""
+    # The sign bit decides, so even silences of 0 length (-0.0) are kept.
+    return value > 0 or (value == 0 and math.copysign(1.0, value) > 0)
+
+
+def signed(item):
+    """Pack a (state, duration) item into a signed duration."""
+    duration = float(item[1])
+    return duration if item[0] else -duration
+
+
+def unsigned(value):
+    """Unpack a signed duration into a (state, duration) item."""
+    return is_signal(value), abs(value)
+
+
+def to_signed(states, durations):
+    """Pack states and durations into signed durations, where the positive
+    ones are signals and the negative ones are silences.
+    """
+    durations = np.asarray(durations)
+    return np.where(states, durations, np.negative(durations))
+
+
+def from_signed(values):
+    """Unpack signed durations into arrays of states and durations."""
+    values = np.asarray(values)
+    # The sign bit is used, so even silences of 0 length (-0.0) are kept.
+    return ~np.signbit(values), np.abs(values)
+
+
 def get_mor_code(name):
     """Get MOR code given `data`."""
-    data = (get_resource(name) if isinstance(name, str)
-            else name.read()).strip()
-    if not data:
-        return []
-
-    mor_code = []
-    for line in data.splitlines():
-        # Remove extra spaces and get rig of comments.
-        line = line.strip()
-        idx = line.find("#")
-        if idx != -1:
-            line = line[:idx].strip()
-        if not line:
-            continue
-        # Now get the status and time length of the quanta.
-        chunks = line.split()
-        state, duration = bool(int(chunks[0])), float(chunks[1])
-        mor_code.append((state, duration))
-    return mor_code
+    states, durations = get_mor_arrays(name)
+    return list(zip(states.tolist(), durations.tolist()))
 
 
 def humanize_mor_code(morse_code, unit=settings.UNIT, ratio=8.0,
@@ -0,0 +1,202 @@
+import io
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+
+import mock
+import numpy as np
+
+import libmorse
+from libmorse import audio
+from libmorse.bench import compare
+
+
+class TestAudio(unittest.TestCase):
+
+    RATE = 8000
+
+    def setUp(self):
+        self.values = libmorse.to_signed(
+            *libmorse.get_mor_arrays("basic.mor"))
+        self.samples = compare._render_tone(self.values, self.RATE)
+
+    def _detect(self, chunk, **kwargs):
+        detector = audio.ToneDetector(self.RATE, **kwargs)
+        arrays = [detector.feed(self.samples[start:start + chunk])
+                  for start in range(0, self.samples.size, chunk)]
+        arrays.append(detector.flush())
+        return np.concatenate(arrays)
+
+    def test_detect(self):
+        values = self._detect(4096)
+        self.assertEqual(self.values.size, values.size)
+        self.assertTrue(np.array_equal(self.values > 0, values > 0))
+        self.assertLessEqual(np.abs(self.values - values).max(), 10)
+
+    def test_chunk_boundaries(self):
+        expected = self._detect(self.samples.size)
+        for chunk in (333, 4096):
+            self.assertTrue(np.array_equal(expected, self._detect(chunk)))
+
+    def test_chunk_boundaries_leading_tone(self):
+        # No leading silence: the first chunks are made of tone alone.
+        self.values = self.values[1:]
+        self.assertGreater(self.values[0], 0)
+        self.samples = compare._render_tone(self.values, self.RATE)
+        expected = self._detect(self.samples.size)
+        self.assertEqual(self.values.size, expected.size)
+        self.assertTrue(np.array_equal(self.values > 0, expected > 0))
+        for chunk in (333, 4096):
+            self.assertTrue(np.array_equal(expected, self._detect(chunk)))
+
+    def test_tone_only(self):
+        # Never a silence, decided at flush.
+        self.values = np.array([900.0])
+        self.samples = compare._render_tone(self.values, self.RATE)
+        for chunk in (333, self.samples.size):
+            values = self._detect(chunk)
+            self.assertEqual(1, values.size)
+            self.assertAlmostEqual(900.0, values[0], delta=10)
+
+    def test_digital_silence(self):
+        # A long leading silence isn't held back, whatever its length.
+        detector = audio.ToneDetector(self.RATE)
+        for _ in range(100):
+            detector.feed(np.zeros(4096, dtype=np.float32))
+            self.assertEqual(0, detector._held.size)
+        values = np.concatenate((
+            detector.feed(self.samples), detector.flush()))
+        self.assertEqual(self.values.size, values.size)
+        self.assertTrue(np.array_equal(self.values > 0, values > 0))
+
+    def test_held_limit(self):
+        # A tone never followed by a silence is held back up to a limit.
+        self.values = np.array([9000.0])
+        self.samples = compare._render_tone(self.values, self.RATE)
+        with mock.patch.object(audio, "MAX_HELD", 100):
+            detector = audio.ToneDetector(self.RATE)
+            for start in range(0, self.samples.size, 333):
+                detector.feed(self.samples[start:start + 333])
+                self.assertLessEqual(detector._held.size, 100)
+            values = detector.flush()
+        self.assertEqual(1, values.size)
+        self.assertAlmostEqual(9000.0, values[0], delta=10)
+
+    def test_rms(self):
+        self.samples = compare._render_tone(self.values, self.RATE,
+                                            noise=0.01)
+        values = self._detect(4096, frequency=None)
+        self.assertTrue(np.array_equal(self.values > 0, values > 0))
+
+    def test_from_buffer(self):
+        data = np.array([0, 255, 128], dtype="u1").tobytes()
+        samples = audio.from_buffer(data, sample_width=1)
+        self.assertTrue(np.allclose([-1, 0.9921875, 0], samples))
+        data = np.array([16384, -16384, 0, 0], dtype="<i2").tobytes()
+        samples = audio.from_buffer(data, sample_width=2, channels=2)
+        self.assertTrue(np.allclose([0, 0], samples))
+        with self.assertRaises(libmorse.ProcessMorseError):
+            audio.from_buffer(b"", sample_width=3)
+
+    def test_wave(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "basic.wav")
+            stream = wave.open(path, "wb")
+            stream.setnchannels(1)
+            stream.setsampwidth(2)
+            stream.setframerate(self.RATE)
+            stream.writeframes((self.samples * 32767).astype("<i2").tobytes())
+            stream.close()
+            values = audio.wave_to_signed(path)
+        finally:
+            shutil.rmtree(tmpdir)
+        results = libmorse.translate_signed(values, use_logging=False)
+        self.assertEqual("MORSE CODE", "".join(results).strip())
+
+    def test_to_buffer(self):
+        for width in (1, 2, 4):
+            samples = np.array([-1, -0.5, 0, 0.5, 0.99], dtype=np.float32)
+            data = audio.to_buffer(samples, sample_width=width)
+            self.assertTrue(np.allclose(
+                samples, audio.from_buffer(data, sample_width=width),
+                atol=0.01))
+        with self.assertRaises(libmorse.ProcessMorseError):
+            audio.to_buffer([0], sample_width=3)
+
+
+class TestRenderer(unittest.TestCase):
+
+    RATE = 8000
+
+    def setUp(self):
+        self.values = libmorse.to_signed(
+            *libmorse.get_mor_arrays("basic.mor"))
+
+    def test_render(self):
+        samples = audio.ToneRenderer(self.RATE).render(self.values)
+        self.assertEqual(
+            int(round(np.abs(self.values).sum() * self.RATE / 1000.0)),
+            samples.size)
+        self.assertLessEqual(np.abs(samples).max(), 0.5)
+        # Ramps start and end every signal smoothly.
+        self.assertLess(abs(samples[0]), 0.01)
+        self.assertLess(abs(samples[-1]), 0.01)
+
+    def test_chunks(self):
+        expected = audio.ToneRenderer(self.RATE).render(self.values)
+        renderer = audio.ToneRenderer(self.RATE)
+        samples = np.concatenate(list(renderer.iter_render(self.values,
+                                                           chunk=7)))
+        self.assertTrue(np.allclose(expected, samples, atol=1e-5))
+
+    def test_short_signal_ramps(self):
+        # A short signal doesn't shorten the ramps of the others.
+        values = [300.0, -300.0, 1.0, -300.0, 300.0]
+        expected = audio.ToneRenderer(self.RATE).render(values)
+        for chunk in (1, 2, 3):
+            renderer = audio.ToneRenderer(self.RATE)
+            samples = np.concatenate(list(renderer.iter_render(values,
+                                                               chunk=chunk)))
+            self.assertTrue(np.allclose(expected, samples, atol=1e-5))
+        ramp = audio.ToneRenderer(self.RATE).ramp
+        self.assertEqual(40, ramp)
+        renderer = audio.ToneRenderer(self.RATE)
+        renderer._get_tone = lambda start, end: np.ones(end - start)
+        shape = renderer.render(values)
+        # Full ramps (up and down) on the long signals.
+        rise = 0.5 - 0.5 * np.cos(np.pi * (np.arange(ramp) + 0.5) / ramp)
+        self.assertTrue(np.allclose(rise, shape[:ramp]))
+        self.assertTrue(np.allclose(rise[::-1], shape[2400 - ramp:2400]))
+        self.assertTrue(np.allclose(rise, shape[-2400:-2400 + ramp]))
+
+    def test_detect(self):
+        detector = audio.ToneDetector(self.RATE)
+        samples = audio.ToneRenderer(self.RATE).render(self.values)
+        values = np.concatenate((detector.feed(samples), detector.flush()))
+        self.assertEqual(self.values.size, values.size)
+        self.assertTrue(np.array_equal(self.values > 0, values > 0))
+        self.assertLessEqual(np.abs(self.values - values).max(), 15)
+
+    def test_write_wave(self):
+        stream = io.BytesIO()
+        frames = audio.write_wave(self.values, stream, sample_rate=16000,
+                                  frequency=700)
+        stream.seek(0)
+        reader = wave.open(stream, "rb")
+        self.assertEqual((1, 2, 16000, frames),
+                         (reader.getnchannels(), reader.getsampwidth(),
+                          reader.getframerate(), reader.getnframes()))
+        reader.close()
+
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "basic.wav")
+            audio.write_wave(self.values, path, sample_rate=44100)
+            values = audio.wave_to_signed(path)
+        finally:
+            shutil.rmtree(tmpdir)
+        results = libmorse.translate_signed(values, use_logging=False)
+        self.assertEqual("MORSE CODE", "".join(results).strip())
@@ -0,0 +1,81 @@
+import threading
+import unittest
+
+import six
+
+import libmorse
+from libmorse import autotune, translator
+
+
+class TestAutotune(unittest.TestCase):
+
+    def setUp(self):
+        corpus = autotune.get_corpus(scale=0)
+        self.corpus = [entry for entry in corpus
+                       if entry["name"] == "basic.mor"]
+
+    def test_edit_distance(self):
+        self.assertEqual(3, autotune.edit_distance("kitten", "sitting"))
+        self.assertEqual(3, autotune.edit_distance("", "abc"))
+        self.assertEqual(3, autotune.edit_distance("abc", ""))
+        self.assertEqual(0, autotune.edit_distance("MORSE", "MORSE"))
+        self.assertEqual(1, autotune.edit_distance("MORSE COE",
+                                                   "MORSE CODE"))
+
+    def test_candidates(self):
+        candidates = autotune.get_candidates(samples=10, seed=1)
+        self.assertEqual(10, len(candidates))
+        defaults = {key: translator.PARAMS[key] for key in autotune.SPACE}
+        self.assertEqual(defaults, dict(candidates[0]))
+        combis = set(tuple(params.values()) for params in candidates)
+        self.assertEqual(10, len(combis))
+
+    def test_pareto_front(self):
+        results = [
+            {"name": "fast", "items_per_sec": 10, "first_char_ms": 5,
+             "cer": 0.5},
+            {"name": "accurate", "items_per_sec": 1, "first_char_ms": 5,
+             "cer": 0.0},
+            {"name": "dominated", "items_per_sec": 1, "first_char_ms": 6,
+             "cer": 0.5},
+        ]
+        front = autotune.pareto_front(results)
+        self.assertEqual(["accurate", "fast"],
+                         [result["name"] for result in front])
+
+    def test_evaluate(self):
+        params = autotune.get_candidates(samples=1)[0]
+        metrics = autotune.evaluate(params, self.corpus)
+        self.assertEqual(0, metrics["cer"])
+        self.assertEqual(0, metrics["failed"])
+        self.assertGreater(metrics["items_per_sec"], 0)
+        # The first character comes out after some keying, not all of it.
+        total = abs(self.corpus[0]["values"]).sum()
+        self.assertTrue(0 < metrics["first_char_ms"] < total)
+
+    def test_evaluate_timeout(self):
+        params = autotune.get_candidates(samples=1)[0]
+        threads = threading.active_count()
+        metrics = autotune.evaluate(params, self.corpus, timeout=0)
+        self.assertEqual(1, metrics["failed"])
+        # Nothing is left running behind.
+        self.assertEqual(threads, threading.active_count())
+
+    def test_profile(self):
+        profile = autotune.autotune(corpus=self.corpus, samples=2,
+                                    processes=1)
+        self.assertEqual(2, profile["candidates"])
+        self.assertTrue(profile["front"])
+
+        stream = six.StringIO()
+        autotune.save_profile(profile, stream)
+        stream.seek(0)
+        params = autotune.load_params(stream)
+        self.assertEqual(set(autotune.SPACE), set(params))
+        results = libmorse.translate_signed(self.corpus[0]["values"],
+                                            use_logging=False, **params)
+        self.assertEqual("MORSE CODE", "".join(results).strip())
+
+        stream = six.StringIO('{"version": 0}')
+        with self.assertRaises(libmorse.ProcessMorseError):
+            autotune.load_params(stream)
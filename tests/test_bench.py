@@ -0,0 +1,122 @@
+import unittest
+
+import six
+
+from libmorse import bench, exceptions
+
+
+class TestBench(unittest.TestCase):
+
+    def test_run_benchmarks(self):
+        stages = ["morse_converter", "mor_parsing"]
+        report = bench.run_benchmarks(stages=stages, scale=2, isolate=False)
+        results = report["results"]
+        self.assertEqual(len(stages) * 2, len(results))
+        for result in results:
+            self.assertIn(result["stage"], stages)
+            self.assertGreater(result["items"], 0)
+            self.assertGreater(result["items_per_sec"], 0)
+            self.assertLessEqual(result["latency_p50"],
+                                 result["latency_p99"])
+
+    def test_unknown_stage(self):
+        with self.assertRaises(exceptions.ProcessMorseError):
+            bench.run_benchmarks(stages=["unknown"])
+
+
+class TestConcurrency(unittest.TestCase):
+
+    def test_run_scaling(self):
+        results = bench.run_scaling(counts=(1, 3), producers=2, items=30)
+        self.assertEqual([1, 3], [res["translators"] for res in results])
+        for res in results:
+            self.assertEqual(res["translators"] * 30, res["items"])
+            self.assertGreaterEqual(res["threads"], res["translators"])
+            self.assertLessEqual(res["latency_p50"], res["latency_p99"])
+
+
+class TestRegression(unittest.TestCase):
+
+    @staticmethod
+    def _get_baseline(**metrics):
+        case = {"items_per_sec": 100.0, "latency_p50": 0.001,
+                "latency_p99": 0.002, "cer": 0.0}
+        case.update(metrics)
+        return {"label": None, "cases": {"decode/all": case}}
+
+    def test_run_baseline(self):
+        baseline = bench.run_baseline(wpms=(20,), noises=(0.0,), scale=1,
+                                      corpus=False, repeat=1, label="rev")
+        self.assertEqual(["decode/synthetic-20wpm-0.0noise", "decode/all",
+                          "encode/synthetic-20wpm-0.0noise", "encode/all"],
+                         list(baseline["cases"]))
+        for name, case in baseline["cases"].items():
+            self.assertLess(case["cer"], 0.1)
+            if name.endswith("/all"):
+                # Timed over enough work to be steady.
+                self.assertGreaterEqual(case["seconds"],
+                                        bench.regression.MIN_SECONDS)
+                self.assertGreater(case["items_per_sec"], 0)
+            else:
+                self.assertNotIn("items_per_sec", case)
+
+        stream = six.StringIO()
+        bench.save_baseline(baseline, stream)
+        stream.seek(0)
+        loaded = bench.load_baseline(stream)
+        self.assertEqual("rev", loaded["label"])
+        self.assertEqual([], bench.compare_baselines(loaded, baseline))
+
+        stream = six.StringIO('{"version": 0}')
+        with self.assertRaises(exceptions.ProcessMorseError):
+            bench.load_baseline(stream)
+
+    def test_compare_baselines(self):
+        baseline = self._get_baseline()
+        # Small slowdowns and improvements pass.
+        current = self._get_baseline(items_per_sec=97.0, latency_p50=0.0005)
+        self.assertEqual([], bench.compare_baselines(baseline, current))
+
+        current = self._get_baseline(items_per_sec=50.0, cer=0.1)
+        regressions = bench.compare_baselines(baseline, current)
+        self.assertEqual(["cer", "items_per_sec"],
+                         sorted(reg["metric"] for reg in regressions))
+        changes = {reg["metric"]: reg["change"] for reg in regressions}
+        self.assertAlmostEqual(0.5, changes["items_per_sec"])
+        self.assertAlmostEqual(0.1, changes["cer"])
+
+        regressions = bench.compare_baselines(
+            baseline, current, thresholds={"items_per_sec": 0.6, "cer": 0.2})
+        self.assertEqual([], regressions)
+
+    def test_missing_cases(self):
+        baseline = self._get_baseline()
+        current = {"label": None, "cases": {"encode/all":
+                                            baseline["cases"]["decode/all"]}}
+        regressions = bench.compare_baselines(baseline, current)
+        self.assertEqual([{"case": "decode/all", "missing": "current"},
+                          {"case": "encode/all", "missing": "baseline"}],
+                         regressions)
+
+    def test_noise_floors(self):
+        # Tripled microsecond latencies are still within the timer noise.
+        baseline = self._get_baseline(latency_p50=1e-6, latency_p99=5e-6)
+        current = self._get_baseline(latency_p50=3e-6, latency_p99=15e-6)
+        self.assertEqual([], bench.compare_baselines(baseline, current))
+
+        current = self._get_baseline(latency_p50=1e-3, latency_p99=15e-6)
+        regressions = bench.compare_baselines(baseline, current)
+        self.assertEqual(["latency_p50"],
+                         [reg["metric"] for reg in regressions])
+
+    def test_self_compare(self):
+        # Two runs of the same tree don't tell any regression, within the
+        # timing noise of a busy test host.
+        kwargs = {"wpms": (12, 30), "noises": (0.0,), "scale": 1,
+                  "corpus": False, "repeat": 2}
+        baseline = bench.run_baseline(**kwargs)
+        current = bench.run_baseline(**kwargs)
+        thresholds = {"items_per_sec": 0.5, "latency_p50": 1.0,
+                      "latency_p99": 1.0}
+        self.assertEqual([], bench.compare_baselines(
+            baseline, current, thresholds=thresholds))
@@ -0,0 +1,26 @@
+import unittest
+
+import libmorse
+
+
+class TestMorseConverter(unittest.TestCase):
+
+    CODE = "-- --- .-. ... . / -.-. --- -.. ."
+
+    def setUp(self):
+        self.converter = libmorse.MorseConverter(silence_errors=False)
+
+    def test_decode_text(self):
+        self.assertEqual("MORSE CODE", self.converter.decode_text(self.CODE))
+        # Same result as the streaming approach.
+        symbols = []
+        for word in self.CODE.split(libmorse.MEDIUM_GAP):
+            symbols.extend(list(word) + [libmorse.MEDIUM_GAP])
+        self.assertEqual("MORSE CODE",
+                         self.converter.add(symbols).strip())
+
+    def test_decode_text_invalid(self):
+        with self.assertRaises(libmorse.ConverterMorseError):
+            self.converter.decode_text("-- ..--")
+        self.converter._silence_errors = True
+        self.assertEqual("M", self.converter.decode_text("-- ..--"))
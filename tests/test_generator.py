@@ -0,0 +1,41 @@
+import unittest
+
+import numpy as np
+import six
+
+import libmorse
+from libmorse import generator
+
+
+class TestSignalGenerator(unittest.TestCase):
+
+    def test_timings(self):
+        gen = generator.SignalGenerator()
+        values = gen.generate("MORSE CODE")
+        expected = [libmorse.utils.signed(item)
+                    for item in libmorse.get_mor_code("basic.mor")[1:-1]]
+        self.assertEqual(expected, values.tolist())
+
+    def test_generate_again(self):
+        gen = generator.SignalGenerator()
+        self.assertEqual([300.0], gen.generate("E").tolist())
+        # No gap carried over from the previous text.
+        self.assertEqual([300.0], gen.generate("E").tolist())
+
+    def test_seed(self):
+        params = {"wpm": 25, "jitter": 0.1, "drift": 0.2, "noise": 0.1,
+                  "fractions": 0.1, "pauses": 0.5, "seed": 7}
+        text = generator.random_text(50, seed=7)
+        values = generator.SignalGenerator(**params).generate(text)
+        np.testing.assert_array_equal(
+            values, generator.SignalGenerator(**params).generate(text))
+        # Noise and fractions add extra items.
+        plain = generator.SignalGenerator(wpm=25).generate(text)
+        self.assertGreater(values.size, plain.size)
+
+    def test_write_mor(self):
+        stream = six.StringIO()
+        generator.SignalGenerator(seed=1, jitter=0.1).write_mor("SOS", stream)
+        stream.seek(0)
+        states, durations = libmorse.get_mor_arrays(stream)
+        self.assertEqual([True, False] * 8 + [True], states.tolist())
@@ -1,6 +1,12 @@
+import logging
 import unittest
 
+import six
+from six.moves import queue
+
 import libmorse
+from libmorse import utils
+from libmorse.bench import compare
 
 
 class TestMorse(unittest.TestCase):
@@ -8,3 +14,65 @@ class TestMorse(unittest.TestCase):
     def test_basic_length(self):
         mor_code = libmorse.get_mor_code("basic.mor")
         self.assertEqual(47, len(mor_code))
+
+    def test_mor_arrays(self):
+        states, durations = libmorse.get_mor_arrays("basic.mor")
+        self.assertEqual(libmorse.get_mor_code("basic.mor"),
+                         list(zip(states.tolist(), durations.tolist())))
+
+    def test_iter_mor_arrays(self):
+        data = libmorse.utils.get_resource("basic.mor")
+        chunks = list(libmorse.iter_mor_arrays(six.StringIO(data), chunk=10))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(47, sum(len(states) for states, _ in chunks))
+
+    def test_iter_mor_code(self):
+        data = libmorse.utils.get_resource("basic.mor")
+        items = list(libmorse.iter_mor_code(six.StringIO(data)))
+        self.assertEqual(libmorse.get_mor_code("basic.mor"), items)
+
+    def test_invalid_mor_code(self):
+        for data in ("1 300\n0", "1 300 # ok\n0 x", "1 300 5\n0 300 7",
+                     "1 300\n0\n300 0", "5 300\n0 300"):
+            with self.assertRaises(libmorse.ProcessMorseError):
+                libmorse.parse_mor_code(data)
+
+
+class TestLogging(unittest.TestCase):
+
+    def test_cached_handler(self):
+        handler = utils.get_log_handler()
+        for name in ("first", "second"):
+            log = libmorse.get_logger(name)
+            libmorse.get_logger(name)
+            self.assertEqual([handler], log.handlers)
+
+    def test_queue_listener(self):
+        stream = six.StringIO()
+        records = queue.Queue()
+        listener = utils.QueueListener(records,
+                                       logging.StreamHandler(stream))
+        listener.start()
+        log = logging.getLogger("queued")
+        log.propagate = False
+        log.addHandler(utils.QueueHandler(records))
+        log.warning("Empty clusters (%d/%d).", 1, 2)
+        listener.stop()
+        self.assertEqual("Empty clusters (1/2).\n", stream.getvalue())
+
+    def test_sessions(self):
+        report = compare.bench_sessions(count=200, samples=4)
+        self.assertEqual(4, len(report["fds"]))
+        if report["fds"][0] is not None:
+            self.assertEqual(1, len(set(report["fds"])))
+
+
+class TestImport(unittest.TestCase):
+
+    def test_lazy_dependencies(self):
+        report = compare.bench_import_time(repeat=1)
+        self.assertEqual([], report["heavy_modules"])
+
+    def test_lazy_module(self):
+        module = utils.LazyModule("fractions")
+        self.assertEqual(0.5, float(module.Fraction(1, 2)))
@@ -0,0 +1,130 @@
+import threading
+import unittest
+
+import libmorse
+from libmorse import generator, pipeline
+
+
+class TestPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.values = libmorse.to_signed(
+            *libmorse.get_mor_arrays("basic.mor"))
+
+    def test_decode(self):
+        with pipeline.Pipeline(pipeline.MorseStage(use_logging=False)) \
+                as chain:
+            text = "".join(chain.translate(self.values))
+        self.assertEqual("MORSE CODE", text.strip())
+
+    def test_loopback(self):
+        text = generator.random_text(10, seed=0)
+        # Same text as the threaded translators give.
+        values = libmorse.AlphabetTranslator.get_timings(
+            libmorse.AlphabetConverter(use_logging=False).add(list(text)),
+            libmorse.AlphabetTranslator(use_logging=False)._ratios,
+            libmorse.UNIT)
+        expected = "".join(libmorse.translate_signed(values,
+                                                     use_logging=False))
+        tap = pipeline.TapStage()
+        with pipeline.Pipeline(pipeline.AlphabetStage(use_logging=False),
+                               tap,
+                               pipeline.MorseStage(use_logging=False)) \
+                as chain:
+            results = list(chain.run(text[start:start + 4]
+                                     for start in range(0, len(text), 4)))
+        self.assertGreater(len(results), 1)
+        self.assertEqual(expected, "".join("".join(chunk)
+                                           for chunk in results))
+        counters = tap.stats()["counters"]
+        self.assertEqual(len(values), counters["items"])
+
+    def test_retime(self):
+        values = libmorse.to_signed(
+            *libmorse.get_mor_arrays("basic_noise.mor"))
+        stages = (pipeline.MorseStage(use_logging=False),
+                  pipeline.AlphabetStage(use_logging=False))
+        with pipeline.Pipeline(*stages) as chain:
+            clean = chain.translate(values)
+        # Only the standard ratios of the unit are left.
+        self.assertEqual({300.0, 900.0, 2100.0}, set(map(abs, clean)))
+        results = libmorse.translate_signed(clean, use_logging=False)
+        self.assertEqual("MORSE CODE", "".join(results).strip())
+
+    def test_prefilter(self):
+        decoder = pipeline.MorseStage(use_logging=False)
+        unit = lambda: decoder.translator.unit
+        with pipeline.Pipeline(pipeline.PreFilterStage(unit=unit),
+                               decoder) as chain:
+            text = "".join(chain.translate(self.values))
+        self.assertEqual("MORSE CODE", text.strip())
+
+    def test_handoff(self):
+        def batches():
+            for start in range(0, self.values.size, 5):
+                yield self.values[start:start + 5]
+        with pipeline.Pipeline(pipeline.MorseStage(use_logging=False)) \
+                as chain:
+            text = "".join("".join(results) for results in
+                           pipeline.iter_handoff(chain, batches()))
+        self.assertEqual("MORSE CODE", text.strip())
+
+    def test_handoff_error(self):
+        def batches():
+            yield self.values[:5]
+            raise libmorse.ProcessMorseError("capture failed")
+        with pipeline.Pipeline(pipeline.MorseStage(use_logging=False)) \
+                as chain:
+            with self.assertRaises(libmorse.ProcessMorseError):
+                list(pipeline.iter_handoff(chain, batches()))
+
+    def _assert_returns(self, func, timeout=10):
+        # Runs `func` aside, failing instead of hanging if it deadlocks.
+        errors = []
+
+        def target():
+            try:
+                func()
+            except Exception as exc:
+                errors.append(exc)
+
+        thread = threading.Thread(target=target)
+        thread.setDaemon(True)
+        thread.start()
+        thread.join(timeout)
+        self.assertFalse(thread.is_alive(), "handoff deadlocked")
+        return errors
+
+    def test_handoff_stage_error(self):
+        def fail(items):
+            raise libmorse.ProcessMorseError("stage failed")
+
+        def run():
+            # The producer has more batches than the queue holds.
+            batches = ([1.0] for _ in range(1000))
+            with pipeline.Pipeline(pipeline.TapStage(callback=fail)) \
+                    as chain:
+                list(pipeline.iter_handoff(chain, batches, maxsize=4))
+
+        errors = self._assert_returns(run)
+        self.assertEqual(1, len(errors))
+        self.assertIsInstance(errors[0], libmorse.ProcessMorseError)
+
+    def test_handoff_early_close(self):
+        produced = []
+
+        def batches():
+            for index in range(1000):
+                produced.append(index)
+                yield [1.0]
+
+        def run():
+            with pipeline.Pipeline(pipeline.TapStage()) as chain:
+                results = pipeline.iter_handoff(chain, batches(),
+                                                maxsize=4)
+                next(results)
+                results.close()
+
+        self.assertEqual([], self._assert_returns(run))
+        # The producer stopped instead of going through all the batches.
+        self.assertLess(len(produced), 1000)
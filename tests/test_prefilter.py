@@ -0,0 +1,103 @@
+import unittest
+
+import numpy as np
+
+import libmorse
+from libmorse import generator, prefilter
+
+
+class TestPreFilter(unittest.TestCase):
+
+    VALUES = [300.0, 600.0, -5.0, 300.0, -300.0, -0.0, -600.0, 900.0]
+
+    def test_feed(self):
+        pre = prefilter.PreFilter()
+        runs = pre.feed(self.VALUES, unit=300.0)
+        self.assertEqual([1200.0, -900.0], runs.tolist())
+        self.assertEqual([900.0], pre.flush().tolist())
+        # The -5 and -0 noise is dropped, then 3 items are merged into the
+        # runs.
+        self.assertEqual(2, pre.dropped)
+        self.assertEqual(3, pre.merged)
+
+    def test_keep_last(self):
+        pre = prefilter.PreFilter(keep_last=True)
+        runs = pre.feed(self.VALUES, final=True)
+        self.assertEqual([300.0, 600.0, -5.0, 300.0, -300.0, -600.0, 900.0],
+                         runs.tolist())
+
+    def test_chunks(self):
+        for keep_last in (False, True):
+            expected = prefilter.PreFilter(keep_last=keep_last).feed(
+                self.VALUES, final=True)
+            pre = prefilter.PreFilter(keep_last=keep_last)
+            runs = [pre.feed(self.VALUES[idx:idx + 3])
+                    for idx in range(0, len(self.VALUES), 3)]
+            runs.append(pre.flush())
+            self.assertEqual(expected.tolist(),
+                             np.concatenate(runs).tolist())
+
+    def _translate(self, name, chunk=None, **kwargs):
+        translator = libmorse.MorseTranslator(**kwargs)
+        if chunk:
+            translator.BATCH_CHUNK = chunk
+        if isinstance(name, str):
+            mor_code = libmorse.humanize_mor_code(
+                libmorse.get_mor_code(name))
+            values = [libmorse.utils.signed(item) for item in mor_code]
+        else:
+            values = name
+        if kwargs.get("prefilter"):
+            translator.put_signed(values)
+        else:
+            for value in values:
+                translator.put(value)
+        _, results = libmorse.get_translator_results(
+            translator, force_wait=True)
+        translator.close()
+        return "".join(results).strip()
+
+    def test_same_translation(self):
+        for name in ("basic_noise.mor", "isolated_noise.mor",
+                     "signal_fractions.mor"):
+            expected = self._translate(name)
+            self.assertTrue(expected)
+            self.assertEqual(expected, self._translate(name, prefilter=True),
+                             name)
+
+    def test_same_translation_chunks(self):
+        # Noisy input spanning several chunks, whose boundaries cut through
+        # the runs.
+        gen = generator.SignalGenerator(wpm=20, jitter=0.05, noise=0.02,
+                                        fractions=0.02, seed=3)
+        values = gen.generate(generator.random_text(40, seed=3)).tolist()
+        values.append(-10000.0)
+        self.assertGreater(len(values), 1000)
+        expected = self._translate(values)
+        self.assertTrue(expected)
+        self.assertEqual(expected,
+                         self._translate(values, prefilter=True, chunk=250))
+
+        # The noise is dropped as soon as the unit is learned, within the
+        # very first chunk too.
+        translator = libmorse.MorseTranslator(prefilter=True,
+                                              use_logging=False)
+        translator.put_signed(values)
+        translator.wait()
+        self.assertGreater(
+            translator.stats()["counters"]["prefilter_dropped"], 0)
+        translator.close()
+
+    def test_chunk_boundaries(self):
+        translator = libmorse.MorseTranslator(prefilter=True, threaded=False,
+                                              use_logging=False)
+        translator.BATCH_CHUNK = translator.LEARN_CHUNK = 2
+        translator.process_signed([300.0, 300.0, 300.0, -300.0])
+        translator.process_signed([-300.0, 300.0])
+        # The runs are carried over the chunks and the calls, each ending up
+        # as its merged head and its last item, while the still open one is
+        # released by any other processing.
+        self.assertEqual(4, translator.stats()["counters"]["items"])
+        translator.process([])
+        self.assertEqual(5, translator.stats()["counters"]["items"])
+        translator.close()
@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import six
+
+import libmorse
+from libmorse import profiling
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    @staticmethod
+    def _decode():
+        translator = libmorse.MorseTranslator(use_logging=False)
+        translator.put_arrays(*libmorse.get_mor_arrays("basic.mor"))
+        translator.wait()
+        translator.close()
+
+    def test_worker_thread(self):
+        with profiling.Profiler() as profiler:
+            self._decode()
+        self.assertGreaterEqual(profiler.threads, 2)
+        functions = [func[2] for func in profiler.get_stats().stats]
+        # Called by the translator's worker thread only.
+        self.assertIn("_process", functions)
+        self.assertIn("_decode", functions)
+
+    def test_profile(self):
+        path = os.path.join(self.tmpdir, "decode.prof")
+        stream = six.StringIO()
+        with profiling.profile(path=path, malloc_stream=stream, limit=5):
+            self._decode()
+        self.assertTrue(os.path.isfile(path))
+        lines = stream.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("Top 5"))
+        self.assertLessEqual(len(lines), 6)
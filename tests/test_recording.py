@@ -0,0 +1,78 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import mock
+import numpy as np
+import six
+
+import libmorse
+
+
+class TestRecording(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "basic.morb")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_convert(self):
+        data = libmorse.utils.get_resource("basic.mor")
+        count = libmorse.mor_to_recording(six.StringIO(data), self.path)
+        self.assertEqual(47, count)
+        with libmorse.RecordingReader(self.path) as reader:
+            states, durations = reader.get_arrays()
+            self.assertEqual(47, reader.count)
+        expected = libmorse.get_mor_arrays("basic.mor")
+        np.testing.assert_array_equal(expected[0], states)
+        np.testing.assert_array_equal(expected[1], durations)
+
+        stream = six.StringIO()
+        libmorse.recording_to_mor(self.path, stream)
+        stream.seek(0)
+        self.assertEqual(libmorse.get_mor_code("basic.mor"),
+                         libmorse.get_mor_code(stream))
+
+    def test_append(self):
+        with libmorse.RecordingWriter(self.path, unit=300.0) as writer:
+            writer.write((True, 300.0))
+            writer.flush()
+            with libmorse.RecordingReader(self.path) as reader:
+                self.assertEqual(1, reader.count)
+            writer.write_arrays([False, True], [0.0, 900.0])
+        with libmorse.RecordingWriter(self.path, append=True) as writer:
+            writer.write((False, 2100.0))
+        with libmorse.RecordingReader(self.path) as reader:
+            self.assertEqual(300.0, reader.unit)
+            self.assertEqual([300.0, -0.0, 900.0, -2100.0],
+                             reader.values.tolist())
+            states, _ = reader.get_arrays()
+            self.assertEqual([True, False, True, False], states.tolist())
+
+    def test_invalid(self):
+        with open(self.path, "wb") as stream:
+            stream.write(b"1 300\n0 300\n1 900\n")
+        with self.assertRaises(libmorse.ProcessMorseError):
+            libmorse.RecordingReader(self.path)
+        for data in (b"", b"MORB"):
+            with open(self.path, "wb") as stream:
+                stream.write(data)
+            with self.assertRaises(libmorse.ProcessMorseError):
+                libmorse.RecordingReader(self.path)
+
+        # Appending to an invalid recording doesn't leak its file.
+        streams = []
+
+        def tracked_open(*args):
+            streams.append(six.moves.builtins.open(*args))
+            return streams[-1]
+
+        with mock.patch("libmorse.recording.open", tracked_open,
+                        create=True):
+            with self.assertRaises(libmorse.ProcessMorseError):
+                libmorse.RecordingWriter(self.path, append=True)
+        self.assertEqual(1, len(streams))
+        self.assertTrue(streams[0].closed)
@@ -0,0 +1,47 @@
+import unittest
+
+import mock
+
+import libmorse
+from libmorse import replay
+
+
+class TestReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.values = [libmorse.utils.signed(item)
+                       for item in libmorse.get_mor_code("basic.mor")]
+
+    def _check(self, report):
+        self.assertEqual("MORSE CODE", report["text"].strip())
+        delays = [char["delay"] for char in report["chars"]]
+        self.assertTrue(all(delay >= 0 for delay in delays))
+        self.assertEqual(len(delays),
+                         sum(report["latency"]["histogram"]["counts"]))
+        self.assertEqual(report["chars"][0]["time"],
+                         report["time_to_first_char"])
+
+    def test_replay(self):
+        report = replay.replay(self.values, speed=50)
+        self._check(report)
+        # Real-time: first character emitted after its quanta ended.
+        ends = sum(abs(value) for value in self.values[:24]) / 1000.0 / 50
+        self.assertGreater(report["time_to_first_char"], ends)
+
+    def test_replay_coroutine(self):
+        self._check(replay.replay(self.values, speed=None, coroutine=True))
+
+    def test_replay_coroutine_results(self):
+        # Every item gets processed right when put, so all the characters
+        # are handed back by the coroutine itself.
+        put = libmorse.MorseTranslator.put
+
+        def put_wait(trans, item, **kwargs):
+            put(trans, item, **kwargs)
+            trans.wait()
+
+        with mock.patch.object(libmorse.MorseTranslator, "put", put_wait):
+            report = replay.replay(self.values, speed=None, coroutine=True)
+        self._check(report)
+        lasts = [char["last"] for char in report["chars"]]
+        self.assertEqual(sorted(lasts), lasts)
@@ -0,0 +1,39 @@
+import unittest
+
+import numpy as np
+
+import libmorse
+from libmorse import runlength
+from libmorse.bench import compare
+
+
+class TestRunLength(unittest.TestCase):
+
+    RATE = 1000
+
+    def setUp(self):
+        states, durations = libmorse.get_mor_arrays("basic.mor")
+        self.values = libmorse.to_signed(states, durations)
+        self.bits = np.repeat(states, durations.astype(int))
+
+    def test_from_samples(self):
+        values = runlength.from_samples(self.bits, self.RATE)
+        self.assertTrue(np.array_equal(self.values, values))
+        self.assertEqual(compare._encode_loop(self.bits.tolist(), 1.0),
+                         values.tolist())
+
+    def test_chunks(self):
+        encoder = runlength.RunLengthEncoder(self.RATE)
+        arrays = [encoder.feed(self.bits[start:start + 333].astype(int))
+                  for start in range(0, self.bits.size, 333)]
+        arrays.append(encoder.flush())
+        self.assertTrue(np.array_equal(self.values, np.concatenate(arrays)))
+
+    def test_packed(self):
+        bits = np.array([1, 1, 0, 0, 0, 1, 0, 1, 1, 1], dtype=bool)
+        values = runlength.from_samples(np.packbits(bits), 100, packed=True,
+                                        count=bits.size)
+        self.assertEqual([20.0, -30.0, 10.0, -10.0, 30.0], values.tolist())
+
+    def test_empty(self):
+        self.assertEqual(0, runlength.from_samples([], self.RATE).size)
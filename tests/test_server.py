@@ -0,0 +1,114 @@
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+import libmorse
+from libmorse import server
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        if server.UnixServer:
+            address = os.path.join(self.tmpdir, "test.sock")
+        else:
+            address = "localhost:0"
+        self.server = server.create_server(address, use_logging=False)
+        if not server.UnixServer:
+            address = "{}:{}".format(*self.server.server_address)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.setDaemon(True)
+        thread.start()
+        self.client = server.Client(address)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_parse_address(self):
+        self.assertEqual((socket.AF_INET, ("localhost", 8725)),
+                         server.parse_address("8725"))
+        self.assertEqual((socket.AF_INET, ("0.0.0.0", 80)),
+                         server.parse_address("0.0.0.0:80"))
+        self.assertEqual((socket.AF_UNIX, "/tmp/libmorse.sock"),
+                         server.parse_address("/tmp/libmorse.sock"))
+
+    def test_encode_decode(self):
+        self.assertEqual("pong", self.client.request("ping"))
+        morse = self.client.encode("morse code", morse=True)
+        self.assertEqual("MORSE CODE", self.client.decode(morse=morse))
+        signals = self.client.encode("sos")
+        self.assertEqual([1, 300.0], signals[0])
+
+        values = libmorse.to_signed(*libmorse.get_mor_arrays("basic.mor"))
+        text = self.client.decode(signals=values)
+        self.assertEqual("MORSE CODE", text.strip())
+
+    def test_session(self):
+        values = libmorse.to_signed(
+            *libmorse.get_mor_arrays("basic.mor")).tolist()
+        session = self.client.request("open")
+        texts = []
+        for start in range(0, len(values), 10):
+            texts.append(self.client.request(
+                "put", session=session, signals=values[start:start + 10]))
+        texts.append(self.client.request("close", session=session))
+        self.assertEqual("MORSE CODE", "".join(texts).strip())
+        # Incremental results.
+        self.assertTrue(any(texts[:-1]))
+
+    def test_errors(self):
+        for op, kwargs in [("unknown", {}), ("put", {"session": 1}),
+                           ("decode", {})]:
+            with self.assertRaises(libmorse.ServerMorseError):
+                self.client.request(op, **kwargs)
+        # Fields of the wrong types.
+        session = self.client.request("open")
+        for op, kwargs in [("encode", {"text": 5}),
+                           ("encode", {"text": ["a"]}),
+                           ("decode", {"morse": 5}),
+                           ("decode", {"signals": 5}),
+                           ("decode", {"signals": ["x", 300.0]}),
+                           ("put", {"session": session, "signals": "x"}),
+                           ("put", {"session": session,
+                                    "signals": [[1, 300.0]]}),
+                           ("put", {"session": [], "signals": []})]:
+            with self.assertRaises(libmorse.ServerMorseError):
+                self.client.request(op, **kwargs)
+        self.assertEqual("", self.client.request("close", session=session))
+        # Valid JSON, but not an object.
+        for message in ([], "x", 1, None):
+            server.send_message(self.client._sock, message)
+            response = server.recv_message(self.client._sock)
+            self.assertIn("error", response)
+        # The connection is still usable.
+        self.assertEqual("pong", self.client.request("ping"))
+
+    @unittest.skipIf(not server.UnixServer, "Unix sockets not supported")
+    def test_socket_path(self):
+        # A live server isn't taken over.
+        with self.assertRaises(libmorse.ServerMorseError):
+            server.create_server(self.server.server_address)
+        self.assertEqual("pong", self.client.request("ping"))
+
+        # Neither is a regular file.
+        path = os.path.join(self.tmpdir, "file")
+        with open(path, "w") as stream:
+            stream.write("data")
+        with self.assertRaises(libmorse.ServerMorseError):
+            server.create_server(path)
+        self.assertTrue(os.path.isfile(path))
+
+        # While the socket left by a server gone away is replaced.
+        path = os.path.join(self.tmpdir, "stale.sock")
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(path)
+        sock.close()
+        stale = server.create_server(path, use_logging=False)
+        stale.server_close()
@@ -0,0 +1,103 @@
+import json
+import threading
+import unittest
+
+import six
+
+import libmorse
+from libmorse import stats
+
+
+class TestStats(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = stats.Registry()
+
+    def test_snapshot(self):
+        values = stats.Stats("test", self.registry)
+        values.count("items")
+        values.count("items", 2)
+        values.maximum("queue", 5)
+        values.maximum("queue", 3)
+        values.add_time("stage", libmorse.utils.timer())
+        snapshot = values.snapshot()
+        self.assertEqual({"items": 3}, snapshot["counters"])
+        self.assertEqual({"queue": 5}, snapshot["gauges"])
+        self.assertEqual(1, snapshot["timers"]["stage"]["calls"])
+
+    def test_registry(self):
+        first, second = [stats.Stats("test", self.registry)
+                         for _ in range(2)]
+        first.count("items", 2)
+        second.count("items", 3)
+        second.retire()
+        del second
+        third = stats.Stats("test", self.registry)
+        third.count("items")
+        snapshot = self.registry.snapshot()
+        self.assertEqual({"items": 6}, snapshot["test"]["counters"])
+
+    def test_concurrent_snapshots(self):
+        values = stats.Stats("test", self.registry)
+        done = threading.Event()
+
+        def update():
+            # New keys keep growing the dictionaries being snapshotted.
+            for index in range(20000):
+                values.count("items-{}".format(index))
+                values.maximum("gauge-{}".format(index), index)
+                values.add_time("stage-{}".format(index),
+                                libmorse.utils.timer())
+            done.set()
+
+        worker = threading.Thread(target=update)
+        worker.start()
+        while not done.is_set():
+            values.snapshot()
+            self.registry.snapshot()
+        worker.join()
+        snapshot = self.registry.snapshot()["test"]
+        self.assertEqual(20000, len(snapshot["counters"]))
+        self.assertEqual(20000, len(snapshot["timers"]))
+
+    def test_trace(self):
+        values = stats.Stats("test", self.registry)
+        values.add_time("stage", libmorse.utils.timer())
+        self.registry.start_trace()
+        values.add_time("stage", libmorse.utils.timer())
+        self.registry.stop_trace()
+        stream = six.StringIO()
+        self.registry.export_trace(stream)
+        events = json.loads(stream.getvalue())["traceEvents"]
+        self.assertEqual(1, len(events))
+        self.assertEqual("stage", events[0]["name"])
+        self.assertEqual("X", events[0]["ph"])
+
+
+class TestTranslatorStats(unittest.TestCase):
+
+    def test_morse_translator(self):
+        translator = libmorse.MorseTranslator(use_logging=False)
+        translator.put_arrays(*libmorse.get_mor_arrays("basic.mor"))
+        translator.wait()
+        snapshot = translator.stats()
+        translator.close()
+        counters = snapshot["counters"]
+        self.assertEqual(1, counters["batches"])
+        self.assertGreater(counters["items"], counters["results"])
+        self.assertEqual(counters["analyses"],
+                         snapshot["timers"]["analyse"]["calls"])
+        self.assertEqual(counters["symbols"],
+                         snapshot["converter"]["counters"]["symbols"])
+
+    def test_registry(self):
+        translator = libmorse.AlphabetTranslator(use_logging=False)
+        for char in "SOS":
+            translator.put(char)
+        translator.wait()
+        translator.close()
+        snapshot = libmorse.STATS_REGISTRY.snapshot()
+        self.assertGreaterEqual(
+            snapshot["AlphabetTranslator"]["counters"]["items"], 3)
+        self.assertGreaterEqual(
+            snapshot["AlphabetConverter"]["counters"]["symbols"], 3)
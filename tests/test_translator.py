@@ -1,3 +1,4 @@
+import array
 import itertools
 import random
 import time
@@ -5,6 +6,7 @@ import unittest
 
 import mock
 import numpy as np
+import six
 
 import libmorse
 from libmorse import settings
@@ -138,6 +140,83 @@ class TestMorseTranslator(unittest.TestCase, TestMorseMixin):
         self._test_alphamorse("basic_noise.mor", test_alphabet=True,
                               humanize=True)
 
+    def test_basic_arrays(self):
+        states, durations = libmorse.get_mor_arrays("basic.mor")
+        self.translator.put_arrays(states, durations)
+        mor_code = libmorse.humanize_mor_code([])
+        self._test_alphamorse("basic.mor", morse_code=mor_code)
+
+    def test_basic_signed(self):
+        values = libmorse.to_signed(*libmorse.get_mor_arrays("basic.mor"))
+        self.translator.put_signed(array.array("d", values.tolist()))
+        mor_code = libmorse.humanize_mor_code([])
+        self._test_alphamorse("basic.mor", morse_code=mor_code)
+
+    def _get_edges(self, start=0, scale=1):
+        # Every state starts at its timestamp (the first one at `start`).
+        states, durations = libmorse.get_mor_arrays("basic.mor")
+        starts = np.concatenate(([0], np.cumsum(durations)))
+        timestamps = start + (starts * scale).astype(np.int64)
+        return states, timestamps[:-1], timestamps[-1]
+
+    def _get_text(self):
+        _, results = libmorse.get_translator_results(self.translator,
+                                                     force_wait=True)
+        return "".join(results).strip()
+
+    def test_edges(self):
+        states, timestamps, end = self._get_edges(start=5000, scale=1000)
+        self.translator.close()
+        self.translator = libmorse.MorseTranslator(debug=DEBUG,
+                                                   clock_scale=0.001)
+        # Repeated edges are merged.
+        self.translator.put_edges(np.repeat(states, 2),
+                                  np.repeat(timestamps, 2))
+        self.translator.put_edge(False, end)
+        self.translator.tick(end + 20 * int(settings.UNIT) * 1000)
+        self.assertEqual("MORSE CODE", self._get_text())
+
+    def test_edges_wrap(self):
+        wrap = 2 ** 32
+        states, timestamps, end = self._get_edges(start=wrap - 10 ** 6,
+                                                  scale=1000)
+        self.translator.close()
+        self.translator = libmorse.MorseTranslator(
+            debug=DEBUG, clock_wrap=wrap, clock_scale=0.001)
+        # Feed a 32 bits microseconds counter, edge by edge.
+        for state, timestamp in zip(states, timestamps % wrap):
+            self.translator.put_edge(state, np.uint32(timestamp))
+        self.translator.put_edge(False, end % wrap)
+        self.translator.tick((end + 20 * int(settings.UNIT) * 1000) % wrap)
+        self.assertEqual("MORSE CODE", self._get_text())
+
+    def test_edges_backwards(self):
+        with self.assertRaises(libmorse.TranslatorMorseError):
+            self.translator.put_edges([True, False], [100, 50])
+        with self.assertRaises(libmorse.TranslatorMorseError):
+            self.translator.put_edges([True], [1, 2])
+
+    def test_provenance(self):
+        self.translator.close()
+        self.translator = libmorse.MorseTranslator(debug=DEBUG,
+                                                   provenance=True)
+        mor_code = libmorse.humanize_mor_code(
+            libmorse.get_mor_code("basic.mor"))
+        self._send_mor_code(mor_code)
+        _, stamps = libmorse.get_translator_results(self.translator)
+        self.assertEqual("MORSE CODE",
+                         "".join(stamp.result for stamp in stamps).strip())
+        source = (-1, -1)
+        for stamp in stamps:
+            # Contiguous source items (shared by the results produced at
+            # once), with ingest before emit.
+            if (stamp.first, stamp.last) != source:
+                self.assertEqual(source[1] + 1, stamp.first)
+            self.assertLessEqual(stamp.first, stamp.last)
+            self.assertLess(stamp.last, len(mor_code))
+            self.assertLessEqual(stamp.ingest, stamp.emit)
+            source = stamp.first, stamp.last
+
     def _test_no_silence_morse(self, message, remove_idx, expected=None,
                                humanize=False):
         """Strip the beginning and ending silence."""
@@ -199,6 +278,67 @@ class TestMorseTranslator(unittest.TestCase, TestMorseMixin):
                 self.assertEqual(sig_dim, labels_list.count(idx),
                                  "iteration #{}".format(crt + 1))
 
+    def test_stable_kmeans_same_lengths(self):
+        with self.assertRaises(libmorse.TranslatorMorseError):
+            self.translator._stable_kmeans([settings.UNIT] * 10, 2)
+
+    def test_signal_classes(self):
+        ratios = {"intra": 1.0, "inter": 3.0, "word": 7.0}
+        classes = self.translator._get_signal_classes(
+            [1.0, 6.9, 1.9, 2.1, 4.9, 5.1], ratios)
+        self.assertEqual(["intra", "word", "intra", "inter", "inter",
+                          "word"], classes)
+
+    def test_combine_morse(self):
+        self.translator._morse_signals.extend(".-.")
+        self.translator._morse_silences.append(" ")
+        self.assertEqual(3, self.translator._combine_morse())
+        self.assertEqual([".", " ", "-"], self.translator._morse_code)
+        # The silence turn is waited for, keeping the signal left.
+        self.assertEqual(0, self.translator._combine_morse())
+        self.translator._morse_silences.extend(["", " "])
+        self.assertEqual(3, self.translator._combine_morse())
+        self.assertEqual([".", " ", "-", "", ".", " "],
+                         self.translator._morse_code)
+
+    def test_list_items(self):
+        mor_code = libmorse.humanize_mor_code(
+            libmorse.get_mor_code("basic.mor"))
+        self._test_alphamorse("basic.mor", morse_code=[
+            list(item) for item in mor_code])
+
+    def test_unthreaded(self):
+        self.translator.close()
+        self.translator = libmorse.MorseTranslator(debug=DEBUG,
+                                                   threaded=False)
+        values = libmorse.to_signed(*libmorse.get_mor_arrays("basic.mor"))
+        results = self.translator.process_signed(values)
+        results.extend(self.translator.process(
+            libmorse.get_ending(self.translator)))
+        self.assertEqual("MORSE CODE", "".join(results).strip())
+        # Put items are processed right away too.
+        self.translator.put_signed(values)
+        self.assertIsNone(self.translator._queue_processor)
+
+        threaded = libmorse.MorseTranslator(debug=DEBUG)
+        with self.assertRaises(libmorse.TranslatorMorseError):
+            threaded.process(values)
+        threaded.close()
+
+    def test_params(self):
+        self.translator.close()
+        self.translator = libmorse.MorseTranslator(
+            debug=DEBUG, sig_range=[5, 24], noise_ratio=0.2)
+        self.assertEqual((5, 24), self.translator.params["sig_range"])
+        self.assertEqual(24, self.translator._signals.maxlen)
+        self.assertEqual(5, self.translator.config["signals"]["min_length"])
+        self.assertEqual(0.2, self.translator.noise_ratio)
+        # Defaults for the others, without touching the class ones.
+        self.assertEqual(settings.SIL_RANGE,
+                         self.translator.params["sil_range"])
+        self.assertEqual(settings.SIG_RANGE[1],
+                         libmorse.MorseTranslator.SIG_MAXLEN)
+
     def test_stable_kmeans_2_clusters(self):
         self._test_stable_kmeans(2)
 
@@ -206,6 +346,25 @@ class TestMorseTranslator(unittest.TestCase, TestMorseMixin):
         self._test_stable_kmeans(3)
 
 
+class TestAlphabetTranslator(unittest.TestCase):
+
+    def _translate(self, text, **kwargs):
+        translator = libmorse.AlphabetTranslator(debug=DEBUG, **kwargs)
+        for char in text:
+            translator.put(char)
+        _, results = libmorse.get_translator_results(
+            translator, force_wait=True)
+        translator.close()
+        return results
+
+    def test_compact(self):
+        items = self._translate("MORSE CODE")
+        values = self._translate("MORSE CODE", compact=True)
+        self.assertEqual(libmorse.get_mor_code("basic.mor")[1:-1], items)
+        self.assertEqual(items, [libmorse.utils.unsigned(value)
+                                 for value in values])
+
+
 class TestTranslateMorse(unittest.TestCase, TestMorseMixin):
 
     # Sleep at each signal (as they would take while captured).
@@ -342,3 +501,19 @@ class TestTranslateMorse(unittest.TestCase, TestMorseMixin):
         expected = " ".join(["MORSE CODE"] * times)
 
         self._test_morse(morse_code, expected)
+
+
+class TestStreamMorse(unittest.TestCase):
+
+    def test_basic(self):
+        data = libmorse.utils.get_resource("basic.mor")
+        items = libmorse.iter_mor_code(six.StringIO(data))
+        chunks = list(libmorse.stream_morse(items, use_logging=False))
+        self.assertGreater(len(chunks), 1)
+        text = "".join("".join(results) for results in chunks)
+        self.assertEqual("MORSE CODE", text.strip())
+
+    def test_translate_signed(self):
+        values = libmorse.to_signed(*libmorse.get_mor_arrays("basic.mor"))
+        results = libmorse.translate_signed(values, use_logging=False)
+        self.assertEqual("MORSE CODE", "".join(results).strip())